@@ -0,0 +1 @@
+"""Benchmarks for the Bulgarian Utility Outage Checker integration."""
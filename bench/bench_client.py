@@ -0,0 +1,95 @@
+"""Shared pooled client vs. one client per fetch, against the stand-in server.
+
+Run with ``pytest bench/bench_client.py`` (needs
+pytest-homeassistant-custom-component). Prints connections opened and
+p50/p99 fetch latency for each way of fetching.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+# pylint: disable=wrong-import-position
+from custom_components.bulgarian_utility_outage_checker.client import (  # noqa: E402
+    OutageHttpClient,
+)
+from custom_components.bulgarian_utility_outage_checker.const import (  # noqa: E402
+    HTTP_LIMIT_PER_HOST,
+    PROVIDER_ENERGOHOLD,
+)
+from custom_components.bulgarian_utility_outage_checker.providers import (  # noqa: E402
+    get_provider,
+)
+
+from .harness import FIRST_IDENTIFIER, percentile  # noqa: E402
+from .standin import Faults, StandinServer  # noqa: E402
+
+ENTRIES = 200
+CYCLES = 3
+
+
+async def _fetch_all(url: str, shared: bool) -> list[float]:
+    """Fetch every identifier ``CYCLES`` times and return the latencies.
+
+    With ``shared`` one client serves every fetch, as in the integration.
+    Otherwise each fetch opens and closes its own client, as every poll
+    did before the shared client.
+    """
+    provider = get_provider(PROVIDER_ENERGOHOLD)
+    slots = asyncio.Semaphore(provider.capabilities.max_concurrency)
+    shared_client = OutageHttpClient(base_url=url)
+    latencies: list[float] = []
+
+    async def _fetch(identifier: str) -> None:
+        async with slots:
+            client = shared_client if shared else OutageHttpClient(base_url=url)
+            started = time.perf_counter()
+            try:
+                await client.async_fetch(provider, identifier)
+            finally:
+                latencies.append(time.perf_counter() - started)
+                if not shared:
+                    await client.async_close()
+
+    try:
+        for _ in range(CYCLES):
+            await asyncio.gather(
+                *(_fetch(str(FIRST_IDENTIFIER + index)) for index in range(ENTRIES))
+            )
+    finally:
+        await shared_client.async_close()
+    return latencies
+
+
+async def test_shared_client(
+    socket_enabled: None, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """The shared client reuses connections and fetches faster."""
+    server = StandinServer(Faults(latency=0.005))
+    url = await server.start()
+    results = {}
+    try:
+        for title, shared in (("client per fetch", False), ("shared client", True)):
+            server.reset_counters()
+            latencies = await _fetch_all(url, shared)
+            results[title] = (server.connections, latencies)
+    finally:
+        await server.stop()
+
+    with capsys.disabled():
+        print(f"\n{ENTRIES} identifiers, {CYCLES} cycles")
+        print(f"{'':>18} {'connections':>12} {'p50 ms':>8} {'p99 ms':>8}")
+        for title, (connections, latencies) in results.items():
+            print(
+                f"{title:>18} {connections:>12}"
+                f" {percentile(latencies, 50) * 1000:>8.2f}"
+                f" {percentile(latencies, 99) * 1000:>8.2f}"
+            )
+
+    per_fetch_connections, _ = results["client per fetch"]
+    shared_connections, _ = results["shared client"]
+    assert shared_connections <= HTTP_LIMIT_PER_HOST < per_fetch_connections
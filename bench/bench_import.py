@@ -0,0 +1,96 @@
+"""Integration import time and setup time for 1 and 500 entries.
+
+Run with ``pytest bench/bench_import.py`` (needs
+pytest-homeassistant-custom-component). The import is measured in a fresh
+interpreter with ``-X importtime``; the parser libraries must not be part
+of it.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+import subprocess
+import sys
+import time
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+# pylint: disable=wrong-import-position
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.bulgarian_utility_outage_checker.const import (  # noqa: E402
+    DOMAIN,
+)
+
+from .harness import LoadHarness  # noqa: E402
+from .standin import StandinServer  # noqa: E402
+
+ROOT = Path(__file__).parent.parent
+PACKAGE = f"custom_components.{DOMAIN}"
+
+# Imported by the parser engines on first use, on the parse executor
+DEFERRED_IMPORTS = ("lxml", "bs4")
+
+
+def _import_times(module: str) -> dict[str, tuple[int, int]]:
+    """Return (self, cumulative) microseconds per module imported by ``module``."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def test_import_time(capsys: pytest.CaptureFixture[str]) -> None:
+    """Importing the integration does not import the parser libraries."""
+    times = _import_times(PACKAGE)
+    own = {name: value for name, value in times.items() if name.startswith(PACKAGE)}
+    slowest = sorted(own.items(), key=lambda item: item[1][0], reverse=True)[:5]
+
+    with capsys.disabled():
+        print(f"\nimport {PACKAGE}: {times[PACKAGE][1] / 1000:.1f} ms cumulative")
+        print(
+            f"integration modules only: "
+            f"{sum(self_us for self_us, _ in own.values()) / 1000:.1f} ms"
+        )
+        for name, (self_us, _) in slowest:
+            print(f"{self_us / 1000:>8.2f} ms  {name}")
+
+    imported = {name.split(".")[0] for name in times}
+    assert not imported.intersection(DEFERRED_IMPORTS)
+
+
+@pytest.mark.parametrize("entries", [1, 500])
+async def test_setup_time(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    socket_enabled: None,
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    entries: int,
+) -> None:
+    """Domain setup runs once; entry setup grows with entries only."""
+    async with LoadHarness(hass, StandinServer(), tmp_path) as harness:
+        started = time.perf_counter()
+        await harness.async_setup_integration()
+        domain_setup = time.perf_counter() - started
+        entry_setup = await harness.async_setup_entries(harness.add_entries(entries))
+        services = len(hass.services.async_services().get(DOMAIN, {}))
+
+    with capsys.disabled():
+        print(
+            f"\n{entries} entries: domain setup {domain_setup * 1000:.1f} ms,"
+            f" entry setup {entry_setup / entries * 1000:.2f} ms per entry,"
+            f" {services} services"
+        )
+    assert len(harness.entries) == entries
@@ -0,0 +1,72 @@
+"""Load tests: 10, 100 and 1000 entries against the stand-in server.
+
+Run with ``pytest bench/bench_load.py`` (needs
+pytest-homeassistant-custom-component). Each run prints throughput,
+event-loop lag, parse executor saturation and memory per entry.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+# pylint: disable=wrong-import-position
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from .harness import LoadHarness, LoadReport  # noqa: E402
+from .standin import Faults, StandinServer  # noqa: E402
+
+CYCLES = 3
+
+
+def _print_report(
+    capsys: pytest.CaptureFixture[str], title: str, report: LoadReport
+) -> None:
+    with capsys.disabled():
+        print(f"\n{title}\n{LoadReport.HEADER}\n{report.as_row()}")
+
+
+@pytest.mark.parametrize("entries", [10, 100, 1000])
+async def test_load(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    socket_enabled: None,
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    entries: int,
+) -> None:
+    """Every entry is fetched once per cycle under realistic latency."""
+    server = StandinServer(Faults(latency=0.02, jitter=0.03))
+    async with LoadHarness(hass, server, tmp_path) as harness:
+        report = await harness.async_measure(entries, CYCLES)
+
+    _print_report(capsys, f"{entries} entries, {CYCLES} cycles", report)
+    assert report.requests == entries * CYCLES
+    assert report.errors == 0
+
+
+@pytest.mark.parametrize(
+    ("title", "faults"),
+    [
+        ("slow upstream", Faults(latency=0.5, jitter=0.5)),
+        ("10% server errors", Faults(error_rate=0.1)),
+        ("256 KiB pages", Faults(pad_bytes=256 * 1024)),
+    ],
+)
+async def test_load_with_faults(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    socket_enabled: None,
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    title: str,
+    faults: Faults,
+) -> None:
+    """Injected faults slow the run down without breaking it."""
+    async with LoadHarness(hass, StandinServer(faults), tmp_path) as harness:
+        report = await harness.async_measure(100, CYCLES)
+
+    _print_report(capsys, f"100 entries, {title}", report)
+    assert report.requests > 0
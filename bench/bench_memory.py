@@ -0,0 +1,80 @@
+"""Traced memory per identifier with 1000 identifiers loaded.
+
+Run with ``pytest bench/bench_memory.py`` (needs
+pytest-homeassistant-custom-component). One hub entry holds every
+identifier; memory is traced from setup through the first refresh, so it
+covers slices, results, snapshots, entities and their states.
+"""
+from __future__ import annotations
+
+import gc
+import json.decoder
+from pathlib import Path
+import tracemalloc
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+# pylint: disable=wrong-import-position
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.bulgarian_utility_outage_checker.const import (  # noqa: E402
+    DOMAIN,
+)
+
+from .harness import LoadHarness  # noqa: E402
+from .standin import StandinServer  # noqa: E402
+
+IDENTIFIERS = 1000
+# Bytes per identifier the integration's own modules may allocate
+OWN_BUDGET = 16 * 1024
+
+# The test fixtures keep every store write as decoded JSON, which a real
+# install writes to disk instead
+NOT_RESIDENT = [tracemalloc.Filter(False, json.decoder.__file__)]
+
+
+async def test_memory_per_identifier(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    socket_enabled: None,
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Report traced bytes per identifier and where they were allocated."""
+    async with LoadHarness(hass, StandinServer(), tmp_path) as harness:
+        await harness.async_setup_integration()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            await harness.async_setup_entries([harness.add_hub_entry(IDENTIFIERS)])
+            await harness.async_run_cycles(1)
+            gc.collect()
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+        (coordinator,) = harness.coordinators()
+        loaded = sum(
+            slice_.snapshot is not None for slice_ in coordinator.slices.values()
+        )
+
+    stats = after.filter_traces(NOT_RESIDENT).compare_to(
+        before.filter_traces(NOT_RESIDENT), "filename"
+    )
+    total = sum(stat.size_diff for stat in stats)
+    own = sum(
+        stat.size_diff for stat in stats if DOMAIN in stat.traceback[0].filename
+    )
+    with capsys.disabled():
+        print(
+            f"\n{IDENTIFIERS} identifiers: {total / IDENTIFIERS:.0f} bytes"
+            f" per identifier, {own / IDENTIFIERS:.0f} allocated by the"
+            " integration's modules; largest sources:"
+        )
+        for stat in stats[:8]:
+            filename = stat.traceback[0].filename
+            print(f"{stat.size_diff / IDENTIFIERS:>10.0f}  {filename}")
+
+    assert loaded == IDENTIFIERS
+    assert own / IDENTIFIERS < OWN_BUDGET
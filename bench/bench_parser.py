@@ -0,0 +1,96 @@
+"""Parser benchmarks over the saved provider pages.
+
+Run with ``pytest bench/bench_parser.py`` (needs ``pytest-benchmark``).
+The ``provider`` groups time every registered provider on its own pages.
+"""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.bulgarian_utility_outage_checker.const import (
+    PARSER_ENGINE_LXML,
+    PARSER_ENGINE_SOUP,
+    PROVIDER_ENERGOHOLD,
+    STREAM_CHUNK_SIZE,
+)
+from custom_components.bulgarian_utility_outage_checker.parser import (
+    OutagePageFeed,
+    parse_outage_html,
+)
+from custom_components.bulgarian_utility_outage_checker.providers import (
+    PROVIDER_REGISTRY,
+)
+from tests.common import (
+    fixture_names,
+    load_fixture,
+    load_fixture_bytes,
+    provider_pages,
+)
+
+pytest.importorskip("pytest_benchmark")
+pytest.importorskip("lxml")
+pytest.importorskip("bs4")
+
+IDENTIFIER = "300012345678"
+
+
+def _chunks(body: bytes) -> list[bytes]:
+    """Split a page into download-sized chunks."""
+    return [
+        body[offset : offset + STREAM_CHUNK_SIZE]
+        for offset in range(0, len(body), STREAM_CHUNK_SIZE)
+    ]
+
+
+@pytest.mark.parametrize("name", fixture_names(PROVIDER_ENERGOHOLD))
+@pytest.mark.parametrize("engine", [PARSER_ENGINE_LXML, PARSER_ENGINE_SOUP])
+def test_parse(benchmark, engine: str, name: str) -> None:
+    """Parse a whole page with each engine."""
+    benchmark.group = f"parse {name}"
+    html = load_fixture(PROVIDER_ENERGOHOLD, name)
+
+    benchmark(parse_outage_html, html, IDENTIFIER, engine)
+
+
+@pytest.mark.parametrize("name", fixture_names(PROVIDER_ENERGOHOLD))
+def test_feed(benchmark, name: str) -> None:
+    """Parse a page fed in download-sized chunks."""
+    benchmark.group = f"parse {name}"
+    chunks = _chunks(load_fixture_bytes(PROVIDER_ENERGOHOLD, name))
+
+    def _feed() -> None:
+        feed = OutagePageFeed(IDENTIFIER)
+        for chunk in chunks:
+            feed.feed(chunk)
+        feed.close()
+
+    benchmark(_feed)
+
+
+@pytest.mark.parametrize(("key", "name"), provider_pages(PROVIDER_REGISTRY))
+def test_provider_parse(benchmark, key: str, name: str) -> None:
+    """Parse a page the way the pipeline does, through its provider."""
+    benchmark.group = f"provider {key}"
+    provider = PROVIDER_REGISTRY[key]
+    html = load_fixture(key, name)
+
+    benchmark(provider.parse, html, IDENTIFIER)
+
+
+@pytest.mark.parametrize(("key", "name"), provider_pages(PROVIDER_REGISTRY))
+def test_provider_feed(benchmark, key: str, name: str) -> None:
+    """Parse a page through the provider's feed parser, chunk by chunk."""
+    benchmark.group = f"provider {key}"
+    provider = PROVIDER_REGISTRY[key]
+    if not provider.capabilities.supports_streaming_parse:
+        pytest.skip(f"{key} does not parse streams")
+    chunks = _chunks(load_fixture_bytes(key, name))
+
+    def _feed() -> None:
+        feed = provider.create_feed_parser(IDENTIFIER, "utf-8")
+        for chunk in chunks:
+            if feed.feed(chunk):
+                break
+        feed.close()
+
+    benchmark(_feed)
@@ -0,0 +1,102 @@
+"""Startup time with and without the persisted outage state.
+
+Run with ``pytest bench/bench_startup.py`` (needs
+pytest-homeassistant-custom-component). A cold boot fetches every entry
+during setup; a warm boot restores the cached results from ``.storage`` and
+leaves the refresh to the scheduler.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+# pylint: disable=wrong-import-position
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.bulgarian_utility_outage_checker.const import (  # noqa: E402
+    PROVIDER_ENERGOHOLD,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
+from custom_components.bulgarian_utility_outage_checker.models import (  # noqa: E402
+    encode_result,
+)
+from custom_components.bulgarian_utility_outage_checker.providers import (  # noqa: E402
+    get_provider,
+)
+from tests.common import load_fixture  # noqa: E402
+
+from .harness import FIRST_IDENTIFIER, LoadHarness  # noqa: E402
+from .standin import Faults, StandinServer  # noqa: E402
+
+ENTRIES = 200
+
+
+def _cached_state(server: StandinServer, count: int) -> dict[str, Any]:
+    """Return stored state for the first ``count`` identifiers of a run."""
+    provider = get_provider(PROVIDER_ENERGOHOLD)
+    identifiers = [str(FIRST_IDENTIFIER + index) for index in range(count)]
+    return {
+        "version": STORAGE_VERSION,
+        "minor_version": 1,
+        "key": STORAGE_KEY,
+        "data": {
+            "identifiers": {
+                identifier: encode_result(
+                    provider.parse(
+                        load_fixture(
+                            PROVIDER_ENERGOHOLD, server.scenario_for(identifier)
+                        ),
+                        identifier,
+                    )
+                )
+                for identifier in identifiers
+            }
+        },
+    }
+
+
+@pytest.mark.parametrize("warm", [False, True], ids=["cold", "warm"])
+async def test_startup(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    socket_enabled: None,
+    tmp_path: Path,
+    hass_storage: dict[str, Any],
+    capsys: pytest.CaptureFixture[str],
+    warm: bool,
+) -> None:
+    """A warm boot sets entries up without waiting for upstream."""
+    # Slow enough that a cold boot is bound by upstream round trips
+    server = StandinServer(Faults(latency=0.2, jitter=0.1))
+    if warm:
+        # One more for the warm-up entry
+        hass_storage[STORAGE_KEY] = _cached_state(server, ENTRIES + 1)
+
+    async with LoadHarness(hass, server, tmp_path) as harness:
+        await harness.async_setup_integration()
+        server.reset_counters()
+        setup_time = await harness.async_setup_entries(harness.add_entries(ENTRIES))
+        requests = server.requests
+        stale = sum(
+            slice_.stale
+            for coordinator in harness.coordinators()
+            for slice_ in coordinator.slices.values()
+        )
+
+    with capsys.disabled():
+        print(
+            f"\n{'warm' if warm else 'cold'} boot, {ENTRIES} entries:"
+            f" setup {setup_time:.2f} s, {requests} upstream requests,"
+            f" {stale} stale"
+        )
+    if warm:
+        assert requests == 0
+        assert stale == ENTRIES
+    else:
+        assert requests == ENTRIES
+        assert stale == 0
@@ -0,0 +1,72 @@
+"""State writes and ``state_changed`` events per refresh cycle.
+
+Run with ``pytest bench/bench_state_writes.py`` (needs
+pytest-homeassistant-custom-component). Every identifier gets the same page
+on each poll, so only the check-time sensors should write state.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+# pylint: disable=wrong-import-position
+from homeassistant.const import EVENT_STATE_CHANGED  # noqa: E402
+from homeassistant.core import Event, HomeAssistant, callback  # noqa: E402
+from homeassistant.helpers.entity import Entity  # noqa: E402
+
+from .harness import LoadHarness  # noqa: E402
+from .standin import StandinServer  # noqa: E402
+
+ENTRIES = 200
+CYCLES = 3
+
+# Entities that publish check times and so change on every poll
+CHECK_TIME_ENTITIES = {"LastCheckSensor", "NextCheckSensor"}
+
+
+async def test_state_writes_per_cycle(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    socket_enabled: None,
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Unchanged pages cause no writes on the status entities."""
+    writes: Counter[str] = Counter()
+    events: Counter[str] = Counter()
+    write_ha_state = Entity.async_write_ha_state
+
+    def _count_write(entity: Entity) -> None:
+        writes[type(entity).__name__] += 1
+        write_ha_state(entity)
+
+    @callback
+    def _count_event(event: Event) -> None:
+        events[event.data["entity_id"].split(".")[0]] += 1
+
+    async with LoadHarness(hass, StandinServer(), tmp_path) as harness:
+        await harness.async_setup_integration()
+        await harness.async_setup_entries(harness.add_entries(ENTRIES))
+        entities = len(hass.states.async_all())
+
+        unsubscribe = hass.bus.async_listen(EVENT_STATE_CHANGED, _count_event)
+        try:
+            with patch.object(Entity, "async_write_ha_state", _count_write):
+                await harness.async_run_cycles(CYCLES)
+        finally:
+            unsubscribe()
+
+    with capsys.disabled():
+        print(f"\n{ENTRIES} entries, {entities} entities, per cycle:")
+        for name, count in sorted(writes.items()):
+            print(f"{name:>28} {count / CYCLES:>8.1f} writes")
+        for domain, count in sorted(events.items()):
+            print(f"{domain:>28} {count / CYCLES:>8.1f} state_changed")
+
+    assert set(writes) <= CHECK_TIME_ENTITIES
+    assert sum(events.values()) <= sum(writes.values())
@@ -0,0 +1,9 @@
+"""Shared benchmark setup.
+
+Benchmarks are not collected by a plain ``pytest`` run; pass their paths,
+e.g. ``pytest bench/bench_parser.py``.
+"""
+from __future__ import annotations
+
+# Registers the integration packages when Home Assistant is not installed
+from tests import conftest  # noqa: F401  pylint: disable=unused-import
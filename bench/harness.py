@@ -0,0 +1,322 @@
+"""Load-test harness: many config entries polling the stand-in server.
+
+Runs inside the ``hass`` fixture of pytest-homeassistant-custom-component.
+The shared HTTP client is seeded with the stand-in server's URL before the
+integration loads, so every coordinator polls 127.0.0.1. The stand-in
+server shares the event loop with Home Assistant; its own cost is part of
+the measured loop lag, so compare runs with each other rather than with a
+production install.
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from pathlib import Path
+import statistics
+import time
+import tracemalloc
+from typing import Any
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.bulgarian_utility_outage_checker.client import (
+    OutageHttpClient,
+)
+from custom_components.bulgarian_utility_outage_checker.const import (
+    CONF_CHECK_INTERVAL,
+    CONF_IDENTIFIER,
+    CONF_IDENTIFIERS,
+    CONF_PROVIDER,
+    DATA_CLIENT,
+    DEFAULT_CHECK_INTERVAL,
+    DOMAIN,
+    PROVIDER_ENERGOHOLD,
+)
+from custom_components.bulgarian_utility_outage_checker.coordinator import (
+    BulgarianUtilityOutageCoordinator,
+)
+from custom_components.bulgarian_utility_outage_checker.scheduler import (
+    OutageFetchScheduler,
+    RateLimiter,
+    async_get_scheduler,
+    async_release_scheduler,
+)
+
+from .standin import StandinServer
+
+# First identifier of a run; ERM West client numbers have 12 digits
+FIRST_IDENTIFIER = 300000000000
+
+
+def percentile(samples: list[float], percent: float) -> float:
+    """Return a percentile of the samples (0 without samples)."""
+    if len(samples) < 2:
+        return samples[0] if samples else 0.0
+    cut_points = statistics.quantiles(samples, n=100, method="inclusive")
+    return cut_points[int(percent) - 1]
+
+
+class LoopLagMonitor:
+    """Measure how late the event loop wakes a task that sleeps briefly.
+
+    Each wake-up also samples the parse executor's queue depth, which
+    shows how long parse jobs wait for a worker.
+    """
+
+    def __init__(
+        self, scheduler: OutageFetchScheduler, interval: float = 0.01
+    ) -> None:
+        """Initialize the monitor."""
+        self._executor = scheduler.parse_executor
+        self._interval = interval
+        self._task: asyncio.Task[None] | None = None
+        self.lags: list[float] = []
+        self.queue_depths: list[int] = []
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def async_stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self._interval)
+            self.lags.append(loop.time() - started - self._interval)
+            self.queue_depths.append(self._executor.queue_depth)
+
+
+@dataclass
+class LoadReport:
+    """Result of one load run."""
+
+    entries: int
+    cycles: int
+    requests: int
+    errors: int
+    setup_time: float
+    duration: float
+    loop_lag_p99: float
+    loop_lag_max: float
+    parse_jobs: int
+    queue_depth_mean: float
+    queue_depth_max: int
+    memory_per_entry: float
+
+    HEADER = (
+        f"{'entries':>8} {'req/s':>9} {'setup s':>8} {'lag p99 ms':>11}"
+        f" {'lag max ms':>11} {'queue avg':>10} {'queue max':>10}"
+        f" {'KiB/entry':>10} {'errors':>7}"
+    )
+
+    @property
+    def throughput(self) -> float:
+        """Return upstream requests per second over the measured cycles."""
+        return self.requests / self.duration if self.duration else 0.0
+
+    def as_row(self) -> str:
+        """Return the report as one row under ``HEADER``."""
+        return (
+            f"{self.entries:>8} {self.throughput:>9.1f} {self.setup_time:>8.2f}"
+            f" {self.loop_lag_p99 * 1000:>11.2f} {self.loop_lag_max * 1000:>11.2f}"
+            f" {self.queue_depth_mean:>10.2f} {self.queue_depth_max:>10}"
+            f" {self.memory_per_entry / 1024:>10.1f} {self.errors:>7}"
+        )
+
+
+class LoadHarness:
+    """Config entries of the integration polling a stand-in server.
+
+    Use as an async context manager. The real site's request budget is
+    lifted to ``concurrency`` parallel requests and ``requests_per_second``,
+    so the run measures the integration rather than the politeness limits.
+    ``config_dir`` (e.g. pytest's ``tmp_path``) replaces the test config
+    directory, which has no ``.storage`` for the history database.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        server: StandinServer,
+        config_dir: Path,
+        concurrency: int = 64,
+        requests_per_second: float = 10_000,
+    ) -> None:
+        """Initialize the harness."""
+        self.hass = hass
+        self.server = server
+        self._config_dir = config_dir
+        self._concurrency = concurrency
+        self._requests_per_second = requests_per_second
+        self._next_identifier = FIRST_IDENTIFIER
+        self.scheduler: OutageFetchScheduler | None = None
+        self.entries: list[MockConfigEntry] = []
+
+    async def __aenter__(self) -> LoadHarness:
+        """Start the server and seed the integration's shared objects."""
+        self._config_dir.joinpath(".storage").mkdir(parents=True, exist_ok=True)
+        self.hass.config.config_dir = str(self._config_dir)
+        url = await self.server.start()
+        self.hass.data.setdefault(DOMAIN, {})[DATA_CLIENT] = OutageHttpClient(
+            base_url=url
+        )
+        # Held for the whole run, so the scheduler and its budgets survive
+        # unloading entries
+        self.scheduler = async_get_scheduler(self.hass)
+        # pylint: disable-next=protected-access
+        self.scheduler._budgets[PROVIDER_ENERGOHOLD] = (
+            asyncio.Semaphore(self._concurrency),
+            RateLimiter(self._requests_per_second),
+        )
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Unload every entry and stop the server."""
+        executor = self.scheduler.parse_executor
+        await asyncio.gather(
+            *(
+                self.hass.config_entries.async_unload(entry.entry_id)
+                for entry in self.hass.config_entries.async_entries(DOMAIN)
+            )
+        )
+        await async_release_scheduler(self.hass)
+        # Join the parse workers, so no threads outlive the test
+        await self.hass.async_add_executor_job(executor.shutdown, True)
+        await self.server.stop()
+        await self.hass.async_block_till_done()
+
+    def _take_identifiers(self, count: int) -> list[str]:
+        """Return the next ``count`` identifiers of the run."""
+        first = self._next_identifier
+        self._next_identifier += count
+        return [str(identifier) for identifier in range(first, first + count)]
+
+    def add_entries(self, count: int) -> list[MockConfigEntry]:
+        """Add ``count`` single-identifier entries without setting them up."""
+        entries = []
+        for identifier in self._take_identifiers(count):
+            entry = MockConfigEntry(
+                domain=DOMAIN,
+                title=identifier,
+                unique_id=f"bulgarian_outage_{PROVIDER_ENERGOHOLD}_{identifier}",
+                data={
+                    CONF_PROVIDER: PROVIDER_ENERGOHOLD,
+                    CONF_IDENTIFIER: identifier,
+                    CONF_CHECK_INTERVAL: DEFAULT_CHECK_INTERVAL,
+                },
+            )
+            entry.add_to_hass(self.hass)
+            entries.append(entry)
+        return entries
+
+    def add_hub_entry(self, count: int) -> MockConfigEntry:
+        """Add one hub entry with ``count`` identifiers without setting it up."""
+        name = f"load {self._next_identifier}"
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            title=name,
+            unique_id=f"bulgarian_outage_{PROVIDER_ENERGOHOLD}_hub_{name}",
+            data={
+                CONF_PROVIDER: PROVIDER_ENERGOHOLD,
+                CONF_NAME: name,
+                CONF_IDENTIFIERS: self._take_identifiers(count),
+                CONF_CHECK_INTERVAL: DEFAULT_CHECK_INTERVAL,
+            },
+        )
+        entry.add_to_hass(self.hass)
+        return entry
+
+    async def async_setup_integration(self) -> None:
+        """Load the integration with one warm-up entry.
+
+        Platform and parser imports happen here, so they are not counted
+        against the measured entries.
+        """
+        self.add_entries(1)
+        assert await async_setup_component(self.hass, DOMAIN, {})
+        await self.hass.async_block_till_done()
+
+    async def async_setup_entries(self, entries: list[MockConfigEntry]) -> float:
+        """Set up added entries concurrently and return the seconds it took.
+
+        Entries whose first refresh fails are left to Home Assistant's setup
+        retry and are not measured.
+        """
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(self.hass.config_entries.async_setup(entry.entry_id) for entry in entries)
+        )
+        await self.hass.async_block_till_done()
+        self.entries.extend(
+            entry for entry, loaded in zip(entries, results, strict=True) if loaded
+        )
+        return time.perf_counter() - started
+
+    def coordinators(self) -> list[BulgarianUtilityOutageCoordinator]:
+        """Return the coordinators of the measured entries."""
+        return [self.hass.data[DOMAIN][entry.entry_id] for entry in self.entries]
+
+    async def async_run_cycles(self, cycles: int) -> None:
+        """Refresh every measured identifier ``cycles`` times, due or not."""
+        coordinators = self.coordinators()
+        for _ in range(cycles):
+            for coordinator in coordinators:
+                for slice_ in coordinator.slices.values():
+                    slice_.next_refresh = None
+            await asyncio.gather(
+                *(coordinator.async_refresh() for coordinator in coordinators)
+            )
+        await self.hass.async_block_till_done()
+
+    async def async_measure(self, count: int, cycles: int = 3) -> LoadReport:
+        """Set up ``count`` entries, run ``cycles`` full cycles and report."""
+        if DOMAIN not in self.hass.config.components:
+            await self.async_setup_integration()
+
+        tracemalloc.start()
+        try:
+            setup_time = await self.async_setup_entries(self.add_entries(count))
+            memory = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+        executor = self.scheduler.parse_executor
+        executor.max_queue_depth = 0
+        completed = executor.completed
+        self.server.reset_counters()
+        monitor = LoopLagMonitor(self.scheduler)
+        monitor.start()
+        started = time.perf_counter()
+        try:
+            await self.async_run_cycles(cycles)
+        finally:
+            duration = time.perf_counter() - started
+            await monitor.async_stop()
+
+        return LoadReport(
+            entries=count,
+            cycles=cycles,
+            requests=self.server.requests,
+            errors=self.server.errors,
+            setup_time=setup_time,
+            duration=duration,
+            loop_lag_p99=percentile(monitor.lags, 99),
+            loop_lag_max=max(monitor.lags, default=0.0),
+            parse_jobs=executor.completed - completed,
+            queue_depth_mean=(
+                statistics.fmean(monitor.queue_depths) if monitor.queue_depths else 0.0
+            ),
+            queue_depth_max=executor.max_queue_depth,
+            memory_per_entry=memory / count,
+        )
@@ -0,0 +1,121 @@
+"""Stand-in for the ERM West ``avplan.php`` page.
+
+Serves the saved pages from ``tests/fixtures`` on 127.0.0.1, so load tests
+and benchmarks never touch the real site. Latency, server errors and page
+size can be injected.
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import random
+import zlib
+
+from aiohttp import web
+
+from custom_components.bulgarian_utility_outage_checker.const import (
+    PROVIDER_ENERGOHOLD,
+)
+from tests.common import load_fixture_bytes
+
+# Pages an identifier can get, picked by a hash of the identifier
+SCENARIOS = ("no_outage.html", "planned.html", "unplanned.html", "both.html")
+
+PATH = "/avplan.php"
+
+
+@dataclass
+class Faults:
+    """Faults injected into every response."""
+
+    latency: float = 0.0  # seconds before answering
+    jitter: float = 0.0  # up to this many extra seconds, uniformly random
+    error_rate: float = 0.0  # share of requests answered with HTTP 503
+    pad_bytes: int = 0  # filler added to every page
+
+
+class StandinServer:
+    """Answer ``GET avplan.php?submit=...&key=<identifier>`` with a saved page.
+
+    Each identifier always gets the same scenario (``scenario_for``), so a
+    run with many identifiers covers every page kind. The server counts
+    requests, errors, bytes and TCP connections; a client that reuses
+    connections opens far fewer connections than it sends requests.
+    """
+
+    def __init__(
+        self,
+        faults: Faults | None = None,
+        scenarios: tuple[str, ...] = SCENARIOS,
+        seed: int = 0,
+    ) -> None:
+        """Initialize the server."""
+        self.faults = faults or Faults()
+        self.scenarios = scenarios
+        self._pages = {
+            name: load_fixture_bytes(PROVIDER_ENERGOHOLD, name) for name in scenarios
+        }
+        self._random = random.Random(seed)
+        self._runner: web.AppRunner | None = None
+        self._peers: set[tuple[str, int]] = set()
+        self.url = ""
+        self.requests = 0
+        self.errors = 0
+        self.bytes_sent = 0
+
+    @property
+    def connections(self) -> int:
+        """Return the number of TCP connections opened by clients."""
+        return len(self._peers)
+
+    def scenario_for(self, identifier: str) -> str:
+        """Return the saved page served for an identifier."""
+        return self.scenarios[zlib.crc32(identifier.encode()) % len(self.scenarios)]
+
+    def page_for(self, identifier: str) -> bytes:
+        """Return the body served for an identifier."""
+        page = self._pages[self.scenario_for(identifier)]
+        if pad := self.faults.pad_bytes:
+            page = page.replace(b"</body>", b"<!--" + b"x" * pad + b"--></body>")
+        return page
+
+    async def start(self) -> str:
+        """Start listening on a free local port and return the page URL."""
+        app = web.Application()
+        app.router.add_get(PATH, self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}{PATH}"
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def reset_counters(self) -> None:
+        """Zero the request, error, byte and connection counters."""
+        self._peers.clear()
+        self.requests = self.errors = self.bytes_sent = 0
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        """Answer one page request."""
+        self.requests += 1
+        if request.transport is not None:
+            self._peers.add(request.transport.get_extra_info("peername")[:2])
+
+        faults = self.faults
+        delay = faults.latency + self._random.uniform(0, faults.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if faults.error_rate and self._random.random() < faults.error_rate:
+            self.errors += 1
+            return web.Response(status=503)
+
+        body = self.page_for(request.query.get("key", ""))
+        self.bytes_sent += len(body)
+        return web.Response(body=body, content_type="text/html", charset="utf-8")
@@ -5,66 +5,108 @@ import logging
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.helpers import config_validation as cv
-import voluptuous as vol
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
-from .coordinator import BulgarianUtilityOutageCoordinator
+from .const import DOMAIN, STATIC_URL_PATH
+from .coordinator import BulgarianUtilityOutageCoordinator, entry_identifiers
+from .scheduler import async_get_scheduler, async_release_scheduler
+from .services import async_setup_services
+from .store import async_get_state_store
+from .websocket_api import async_setup_websocket_api
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.BINARY_SENSOR]
 
-SERVICE_CHECK_NOW = "check_now"
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
-SERVICE_CHECK_NOW_SCHEMA = vol.Schema(
-    {
-        vol.Required("entity_id"): cv.entity_ids,
-    }
-)
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # noqa: ARG001
+    """Set up the domain-wide services, websocket commands and card path.
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up Bulgarian Utility Outage Checker from a config entry."""
+    Runs once per Home Assistant start, however many entries are configured.
+    """
     hass.data.setdefault(DOMAIN, {})
+    await _async_register_static_path(hass)
+    async_setup_services(hass)
+    async_setup_websocket_api(hass)
+    return True
+
 
-    # Register www folder for static files (Lovelace card)
-    hass.http.register_static_path(
-        f"/local/community/{DOMAIN}",
-        hass.config.path(f"custom_components/{DOMAIN}/www"),
-        cache_headers=False,
+async def _async_register_static_path(hass: HomeAssistant) -> None:
+    """Serve the www folder (Lovelace card)."""
+    path = hass.config.path(f"custom_components/{DOMAIN}/www")
+    try:
+        from homeassistant.components.http import (  # pylint: disable=import-outside-toplevel
+            StaticPathConfig,
+        )
+    except ImportError:
+        # Home Assistant before 2024.6
+        hass.http.register_static_path(STATIC_URL_PATH, path, cache_headers=False)
+        return
+    await hass.http.async_register_static_paths(
+        [StaticPathConfig(STATIC_URL_PATH, path, cache_headers=False)]
     )
 
-    coordinator = BulgarianUtilityOutageCoordinator(hass, entry)
-    
-    # Perform first refresh
-    _LOGGER.info("Performing first refresh for %s", entry.data.get("identifier"))
-    await coordinator.async_config_entry_first_refresh()
-    _LOGGER.info(
-        "First refresh complete for %s. Next update in %d minutes",
-        entry.data.get("identifier"),
-        coordinator.check_interval,
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up Bulgarian Utility Outage Checker from a config entry."""
+    state_store = await async_get_state_store(hass)
+    scheduler = async_get_scheduler(hass)
+    coordinator = BulgarianUtilityOutageCoordinator(
+        hass, entry, scheduler, state_store
     )
 
+    if coordinator.async_restore_cached_state():
+        # Entities start from the cached result; the scheduler refreshes it
+        _LOGGER.info(
+            "Restored cached state for %s, refresh scheduled at %s",
+            entry.title,
+            coordinator.next_refresh,
+        )
+    elif coordinator.is_hub:
+        # Fetching hundreds of identifiers within the request budget takes
+        # minutes; let the scheduler pick up the uncached ones instead of
+        # blocking setup
+        _LOGGER.info(
+            "Identifiers of %s without cached state are refreshed by the scheduler",
+            entry.title,
+        )
+    else:
+        # Perform first refresh of the identifiers without a cached result
+        _LOGGER.info("Performing first refresh for %s", entry.title)
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            await async_release_scheduler(hass)
+            raise
+        _LOGGER.info(
+            "First refresh complete for %s. Next update in %d minutes",
+            entry.title,
+            coordinator.check_interval,
+        )
+
     hass.data[DOMAIN][entry.entry_id] = coordinator
+    scheduler.async_add_coordinator(coordinator)
+    if coordinator.is_hub:
+        _async_remove_stale_devices(hass, coordinator)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    # Register update listener for options changes
-    entry.async_on_unload(entry.add_update_listener(update_listener))
+    # Hourly outage minutes and counts as recorder long-term statistics.
+    # Imported here so the recorder (and SQLAlchemy) is not loaded on
+    # installs without it.
+    if "recorder" in hass.config.components:
+        from .long_term_stats import (  # pylint: disable=import-outside-toplevel
+            async_setup_statistics,
+        )
 
-    async def async_check_now(call: ServiceCall) -> None:  # noqa: ARG001
-        """Handle the check_now service call."""
-        await coordinator.async_request_refresh()
+        entry.async_on_unload(async_setup_statistics(hass, coordinator))
 
-    # Register service
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_CHECK_NOW,
-        async_check_now,
-        schema=SERVICE_CHECK_NOW_SCHEMA,
-    )
+    # Register update listener for options changes
+    entry.async_on_unload(entry.add_update_listener(update_listener))
 
     return True
 
@@ -72,15 +114,65 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator.scheduler.async_remove_coordinator(coordinator)
+        for identifier in coordinator.identifiers:
+            coordinator.outage_index.async_remove_identifier(identifier)
+        _async_prune_state_store(hass, coordinator)
+        await async_release_scheduler(hass)
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Drop the cached state of a removed entry."""
+    state_store = await async_get_state_store(hass)
+    for identifier in entry_identifiers(entry):
+        state_store.async_remove(identifier)
+
+
+@callback
+def _async_prune_state_store(
+    hass: HomeAssistant, coordinator: BulgarianUtilityOutageCoordinator
+) -> None:
+    """Drop the cached state of identifiers removed from the entry.
+
+    An options change reloads the entry, so while it unloads the entry
+    already lists its new identifiers. Identifiers still listed by another
+    entry keep their cached state.
+    """
+    listed = {
+        identifier
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        for identifier in entry_identifiers(entry)
+    }
+    for identifier in coordinator.identifiers:
+        if identifier not in listed:
+            coordinator.state_store.async_remove(identifier)
+
+
+@callback
+def _async_remove_stale_devices(
+    hass: HomeAssistant, coordinator: BulgarianUtilityOutageCoordinator
+) -> None:
+    """Remove hub devices (and their entities) of identifiers no longer listed."""
+    dev_reg = dr.async_get(hass)
+    entry = coordinator.entry
+    current = {
+        (DOMAIN, coordinator.device_key(identifier))
+        for identifier in coordinator.identifiers
+    }
+    for device in dr.async_entries_for_config_entry(dev_reg, entry.entry_id):
+        if not device.identifiers & current:
+            dev_reg.async_update_device(
+                device.id, remove_config_entry_id=entry.entry_id
+            )
+
+
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options update."""
     _LOGGER.info(
         "Options updated for %s, reloading entry to apply new settings",
-        entry.data.get("identifier"),
+        entry.title,
     )
     await hass.config_entries.async_reload(entry.entry_id)
@@ -9,23 +9,19 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import (
-    ATTR_DETAILS,
-    ATTR_LAST_CHECK,
-    ATTR_OUTAGE_TYPE,
-    CONF_IDENTIFIER,
-    DOMAIN,
-    OUTAGE_TYPE_NONE,
-)
+from .const import ATTR_OUTAGE_COUNT, ATTR_OUTAGE_TYPE, ATTR_STALE, DOMAIN
 from .coordinator import BulgarianUtilityOutageCoordinator
+from .entity import OutageEntity
 
 _LOGGER = logging.getLogger(__name__)
 
+# The full outage payload lives on the status sensor; the binary sensor
+# only carries what automations need next to its on/off state.
+BINARY_SENSOR_ATTRIBUTES = (ATTR_OUTAGE_TYPE, ATTR_OUTAGE_COUNT, ATTR_STALE)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -36,74 +32,44 @@ async def async_setup_entry(
     coordinator: BulgarianUtilityOutageCoordinator = hass.data[DOMAIN][entry.entry_id]
 
     async_add_entities(
-        [
-            UtilityOutageBinarySensor(coordinator, entry),
-        ],
-        True,
+        UtilityOutageBinarySensor(coordinator, identifier)
+        for identifier in coordinator.identifiers
     )
 
 
-class UtilityOutageBinarySensor(
-    CoordinatorEntity[BulgarianUtilityOutageCoordinator], BinarySensorEntity
-):
+class UtilityOutageBinarySensor(OutageEntity, BinarySensorEntity):
     """Binary sensor for utility outage detection."""
 
-    _attr_has_entity_name = True
     _attr_device_class = BinarySensorDeviceClass.PROBLEM
 
     def __init__(
         self,
         coordinator: BulgarianUtilityOutageCoordinator,
-        entry: ConfigEntry,
+        identifier: str,
     ) -> None:
         """Initialize the binary sensor."""
-        super().__init__(coordinator)
-        self._identifier = entry.data[CONF_IDENTIFIER]
-        self._attr_unique_id = f"{entry.entry_id}_outage"
+        super().__init__(coordinator, identifier, "outage")
         self._attr_name = "Статус"
-        
-        # Device info for grouping entities
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, entry.entry_id)},
-            name=f"Bulgarian Utility Outage Checker - {self._identifier}",
-            manufacturer="ERM West",
-            model="Outage Checker",
-        )
 
-    @property
-    def is_on(self) -> bool:
-        """Return true if the binary sensor is on."""
-        if self.coordinator.data:
-            return self.coordinator.data.get("has_outage", False)
-        return False
+    @callback
+    def _update_attrs(self) -> None:
+        """Recompute the state, icon and attributes from the slice's snapshot."""
+        super()._update_attrs()
+        snapshot = self.slice.snapshot
+        self._attr_is_on = snapshot is not None and snapshot.has_outage
+        self._attr_icon = "mdi:alert-circle" if self._attr_is_on else "mdi:check-circle"
+        attributes = self.slice.outage_attributes
+        self._attr_extra_state_attributes = {
+            key: attributes[key] for key in BINARY_SENSOR_ATTRIBUTES if key in attributes
+        }
+
+    def _state_value(self) -> Any:
+        """Return the on/off value."""
+        return self.is_on
 
     @property
     def state(self) -> str:
         """Return the state of the binary sensor."""
-        if self.is_on:
+        if self._attr_is_on:
             return "Има авария"
         return "ОК"
-
-    @property
-    def icon(self) -> str:
-        """Return the icon to use in the frontend."""
-        if self.is_on:
-            return "mdi:alert-circle"
-        return "mdi:check-circle"
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return the state attributes."""
-        if not self.coordinator.data:
-            return {}
-
-        return {
-            ATTR_OUTAGE_TYPE: self.coordinator.data.get("outage_type", OUTAGE_TYPE_NONE),
-            ATTR_LAST_CHECK: self.coordinator.data.get("last_check"),
-            ATTR_DETAILS: self.coordinator.data.get("details", []),
-        }
-
-    @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        return self.coordinator.last_update_success
@@ -0,0 +1,116 @@
+"""Circuit breaker for upstream hosts."""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+from homeassistant.exceptions import HomeAssistantError
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(HomeAssistantError):
+    """Raised instead of sending a request to a host that is down."""
+
+    def __init__(self, host: str, retry_in: float) -> None:
+        """Initialize the error."""
+        super().__init__(f"{host} is unavailable, retrying in {retry_in:.0f} seconds")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Stop calling a host after repeated failures.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    requests fail immediately. Once ``reset_timeout`` has passed a single
+    probe request is let through (half-open): success closes the circuit,
+    failure opens it again with the timeout doubled up to
+    ``max_reset_timeout``. Only the caller decides what counts as a
+    failure: outcomes that say nothing about the host (cancellation, a
+    page that fails to parse) are recorded as neither.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        failure_threshold: int,
+        reset_timeout: float,
+        max_reset_timeout: float,
+    ) -> None:
+        """Initialize the breaker."""
+        self.host = host
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.rejected = 0
+        self._failure_threshold = failure_threshold
+        self._base_reset_timeout = reset_timeout
+        self._reset_timeout = reset_timeout
+        self._max_reset_timeout = max_reset_timeout
+        self._opened_at = 0.0
+
+    def before_request(self) -> None:
+        """Raise ``CircuitOpenError`` unless a request may be sent now."""
+        if self.state == STATE_CLOSED:
+            return
+        if self.state == STATE_OPEN:
+            waited = time.monotonic() - self._opened_at
+            if waited >= self._reset_timeout:
+                _LOGGER.debug("Sending a probe request to %s", self.host)
+                self.state = STATE_HALF_OPEN
+                return
+            retry_in = self._reset_timeout - waited
+        else:
+            # A probe is already in flight
+            retry_in = self._reset_timeout
+        self.rejected += 1
+        raise CircuitOpenError(self.host, retry_in)
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        if self.state != STATE_CLOSED:
+            _LOGGER.info("%s is reachable again", self.host)
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self._reset_timeout = self._base_reset_timeout
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening the circuit if needed."""
+        self.failures += 1
+        if self.state == STATE_HALF_OPEN:
+            self._reset_timeout = min(self._reset_timeout * 2, self._max_reset_timeout)
+        elif self.state == STATE_OPEN or self.failures < self._failure_threshold:
+            return
+        else:
+            _LOGGER.warning(
+                "%s failed %d times in a row, pausing requests for %.0f seconds",
+                self.host,
+                self.failures,
+                self._reset_timeout,
+            )
+        self.state = STATE_OPEN
+        self._opened_at = time.monotonic()
+
+    def cancel_probe(self) -> None:
+        """Forget a request whose outcome says nothing about the host.
+
+        A probe that was cancelled, or failed on our side, leaves the
+        circuit open with the next request allowed to probe right away.
+        """
+        if self.state == STATE_HALF_OPEN:
+            self.state = STATE_OPEN
+            self._opened_at = time.monotonic() - self._reset_timeout
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a diagnostics-friendly snapshot."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "reset_timeout": self._reset_timeout,
+        }
@@ -0,0 +1,271 @@
+"""Shared HTTP client for Bulgarian Utility Outage Checker."""
+from __future__ import annotations
+
+import codecs
+from dataclasses import dataclass
+import hashlib
+import logging
+import re
+import time
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import (
+    DATA_CLIENT,
+    DNS_CACHE_TTL,
+    DOMAIN,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_LIMIT_PER_HOST,
+    HTTP_TIMEOUT,
+    MAX_BODY_SIZE,
+    STREAM_CHUNK_SIZE,
+    USER_AGENT,
+)
+from .stats import STAGE_DOWNLOAD, create_trace_config
+
+if TYPE_CHECKING:
+    from .executor import StreamingParse
+    from .providers import OutageProvider
+
+_LOGGER = logging.getLogger(__name__)
+
+_META_CHARSET_RE = re.compile(
+    rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.IGNORECASE
+)
+
+
+class BodyTooLargeError(HomeAssistantError):
+    """Raised when a page is larger than ``MAX_BODY_SIZE``."""
+
+
+@dataclass(slots=True)
+class FetchResult:
+    """Body (or streamed parse result) and cache validators of one response.
+
+    A buffered fetch carries the decoded ``body``. A streamed fetch carries
+    the parsed ``data`` and the time spent parsing instead (set by the
+    scheduler once the parse completes). ``fingerprint`` is a hash of the
+    raw body and is None only for 304 Not Modified.
+    """
+
+    body: str | None
+    etag: str | None = None
+    last_modified: str | None = None
+    size: int = 0
+    fingerprint: str | None = None
+    data: dict[str, Any] | None = None
+    queue_wait: float = 0.0
+    parse_time: float = 0.0
+
+    @property
+    def not_modified(self) -> bool:
+        """Return True if the server answered 304 Not Modified."""
+        return self.fingerprint is None
+
+
+class OutageHttpClient:
+    """Integration-wide HTTP client with a pooled keep-alive connector.
+
+    One instance is shared by every coordinator while at least one config
+    entry is loaded, so repeated polls reuse open TCP/TLS connections
+    instead of opening a new session per request.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession | None = None,
+        base_url: str | None = None,
+    ) -> None:
+        """Initialize the client.
+
+        Pass an existing ``session`` and/or a ``base_url`` that replaces every
+        provider URL to point the integration at a local stand-in server
+        (for tests and benchmarks).
+        """
+        self.base_url = base_url
+        self._session = session
+        self._owns_session = session is None
+        self.users = 0
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Return the underlying session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=HTTP_LIMIT_PER_HOST,
+                keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+                use_dns_cache=True,
+                ttl_dns_cache=DNS_CACHE_TTL,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"User-Agent": USER_AGENT},
+                timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT),
+                trace_configs=[create_trace_config()],
+            )
+            self._owns_session = True
+        return self._session
+
+    async def async_fetch(
+        self,
+        provider: OutageProvider,
+        identifier: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        timings: SimpleNamespace | None = None,
+        stream: StreamingParse | None = None,
+    ) -> FetchResult:
+        """Fetch the raw outage page for an identifier.
+
+        If the provider supports it, cache validators from a previous
+        response are sent as a conditional GET. A 304 answer yields a result
+        without a body. Stage timings are written to ``timings`` if given.
+
+        The body is read in chunks and bodies over ``MAX_BODY_SIZE`` raise
+        ``BodyTooLargeError``. With a ``stream`` the chunks are queued for
+        parsing as they arrive, without waiting for the parser, and the
+        result carries no body.
+        """
+        headers = {}
+        if provider.capabilities.supports_conditional_get:
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        async with self.session.get(
+            self.base_url or provider.url,
+            params=provider.request_params(identifier),
+            headers=headers,
+            trace_request_ctx=timings,
+        ) as response:
+            if response.status == 304:
+                return FetchResult(None, etag, last_modified)
+            if response.status != 200:
+                raise aiohttp.ClientResponseError(
+                    response.request_info,
+                    response.history,
+                    status=response.status,
+                    message=f"HTTP error {response.status}",
+                )
+            if (response.content_length or 0) > MAX_BODY_SIZE:
+                raise BodyTooLargeError(
+                    f"Page for {identifier} is {response.content_length} bytes,"
+                    f" over the {MAX_BODY_SIZE} byte limit"
+                )
+            started = time.monotonic()
+            charset = _charset_name(response.charset)
+            encoding: str | None = charset or "utf-8"
+            digest = hashlib.blake2b(digest_size=16)
+            chunks: list[bytes] = []
+            size = 0
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                size += len(chunk)
+                if size > MAX_BODY_SIZE:
+                    raise BodyTooLargeError(
+                        f"Page for {identifier} exceeds the {MAX_BODY_SIZE} byte limit"
+                    )
+                # Past an early exit the rest is still read (and hashed), so
+                # the connection can be reused
+                digest.update(chunk)
+                if stream is None:
+                    chunks.append(chunk)
+                    continue
+                if size == len(chunk):
+                    encoding = _feed_encoding(charset, chunk)
+                stream.feed(chunk, encoding)
+
+            result = FetchResult(
+                None,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+                size,
+                digest.hexdigest(),
+            )
+            if stream is None:
+                body = b"".join(chunks)
+                result.body = body.decode(
+                    _body_encoding(charset, body[:STREAM_CHUNK_SIZE]), errors="replace"
+                )
+            else:
+                stream.finish(encoding)
+            if timings is not None:
+                setattr(timings, STAGE_DOWNLOAD, time.monotonic() - started)
+            return result
+
+    async def async_close(self) -> None:
+        """Close the session if this client created it."""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+        self._session = None
+
+
+def _charset_name(charset: str | None) -> str | None:
+    """Return the codec name of a charset, or None if Python lacks it."""
+    if not charset:
+        return None
+    try:
+        return codecs.lookup(charset).name
+    except LookupError:
+        return None
+
+
+def _declared_charset(head: bytes) -> str | None:
+    """Return the charset a page declares in a ``<meta>`` tag."""
+    if (match := _META_CHARSET_RE.search(head)) is None:
+        return None
+    return _charset_name(match.group(1).decode("ascii"))
+
+
+def _body_encoding(charset: str | None, head: bytes) -> str:
+    """Return the encoding of a buffered body.
+
+    The Content-Type charset wins, then a ``<meta>`` declaration near the
+    start of the page. Otherwise UTF-8, like aiohttp's default fallback.
+    """
+    return charset or _declared_charset(head) or "utf-8"
+
+
+def _feed_encoding(charset: str | None, head: bytes) -> str | None:
+    """Return the encoding to create a feed parser with.
+
+    None when only the page itself declares a charset: lxml then reads it
+    from the ``<meta>`` tag. Pages that declare nothing are UTF-8, as in
+    the buffered path.
+    """
+    if charset:
+        return charset
+    return None if _declared_charset(head) else "utf-8"
+
+
+def async_get_client(hass: HomeAssistant) -> OutageHttpClient:
+    """Return the shared client, creating it for the first user.
+
+    A client already stored in ``hass.data`` (e.g. one injected by a test
+    harness) is reused as-is.
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    client: OutageHttpClient | None = domain_data.get(DATA_CLIENT)
+    if client is None:
+        client = domain_data[DATA_CLIENT] = OutageHttpClient()
+    client.users += 1
+    return client
+
+
+async def async_release_client(hass: HomeAssistant) -> None:
+    """Release one reference and close the client when the last user leaves."""
+    domain_data = hass.data.get(DOMAIN, {})
+    client: OutageHttpClient | None = domain_data.get(DATA_CLIENT)
+    if client is None:
+        return
+
+    client.users -= 1
+    if client.users <= 0:
+        _LOGGER.debug("Last entry unloaded, closing shared HTTP client")
+        domain_data.pop(DATA_CLIENT)
+        await client.async_close()
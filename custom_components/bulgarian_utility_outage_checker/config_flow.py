@@ -7,15 +7,23 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant import config_entries
+from homeassistant.const import CONF_NAME
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.selector import TextSelector, TextSelectorConfig
 
 from .const import (
+    CONF_ADAPTIVE_POLLING,
     CONF_CHECK_INTERVAL,
     CONF_IDENTIFIER,
+    CONF_IDENTIFIERS,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
     CONF_PROVIDER,
     DEFAULT_CHECK_INTERVAL,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
     DOMAIN,
     PROVIDER_ENERGOHOLD,
     PROVIDERS,
@@ -38,6 +46,34 @@ STEP_IDENTIFIER_DATA_SCHEMA = vol.Schema(
     }
 )
 
+IDENTIFIERS_SELECTOR = TextSelector(TextSelectorConfig(multiline=True))
+
+STEP_HUB_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_NAME): cv.string,
+        vol.Required(CONF_IDENTIFIERS): IDENTIFIERS_SELECTOR,
+        vol.Optional(CONF_CHECK_INTERVAL, default=DEFAULT_CHECK_INTERVAL): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=1440)
+        ),
+    }
+)
+
+
+def parse_identifiers(text: str) -> list[str]:
+    """Parse pasted identifiers, one per line, dropping duplicates.
+
+    CSV exports separated by ``;`` or tabs are accepted: the first column
+    is used. Commas are kept because addresses contain them. Empty lines
+    and lines starting with ``#`` are skipped.
+    """
+    identifiers: dict[str, None] = {}
+    for line in text.splitlines():
+        for separator in ("\t", ";"):
+            line = line.split(separator, 1)[0]
+        if (identifier := line.strip().strip('"')) and not identifier.startswith("#"):
+            identifiers[identifier] = None
+    return list(identifiers)
+
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Bulgarian Utility Outage Checker."""
@@ -54,13 +90,21 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle the provider selection step."""
         if user_input is not None:
             self._provider = user_input[CONF_PROVIDER]
-            return await self.async_step_identifier()
+            return await self.async_step_mode()
 
         return self.async_show_form(
             step_id="user",
             data_schema=STEP_PROVIDER_DATA_SCHEMA,
         )
 
+    async def async_step_mode(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Let the user pick a single identifier or a hub."""
+        return self.async_show_menu(
+            step_id="mode", menu_options=["identifier", "hub"]
+        )
+
     async def async_step_identifier(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -96,6 +140,42 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    async def async_step_hub(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle a hub entry holding many identifiers."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            identifiers = parse_identifiers(user_input[CONF_IDENTIFIERS])
+            if not identifiers:
+                errors[CONF_IDENTIFIERS] = "no_identifiers"
+            else:
+                name = user_input[CONF_NAME]
+                await self.async_set_unique_id(
+                    f"bulgarian_outage_{self._provider}_hub_{name}"
+                )
+                self._abort_if_unique_id_configured()
+
+                provider_name = PROVIDERS[self._provider]
+                return self.async_create_entry(
+                    title=f"{provider_name} - {name}",
+                    data={
+                        CONF_PROVIDER: self._provider,
+                        CONF_NAME: name,
+                        CONF_IDENTIFIERS: identifiers,
+                        CONF_CHECK_INTERVAL: user_input.get(
+                            CONF_CHECK_INTERVAL, DEFAULT_CHECK_INTERVAL
+                        ),
+                    },
+                )
+
+        return self.async_show_form(
+            step_id="hub",
+            data_schema=STEP_HUB_DATA_SCHEMA,
+            errors=errors,
+        )
+
     @staticmethod
     @callback
     def async_get_options_flow(
@@ -116,22 +196,61 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Manage the options."""
+        errors: dict[str, str] = {}
+
+        is_hub = CONF_IDENTIFIERS in self.config_entry.data
+
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            if is_hub:
+                user_input[CONF_IDENTIFIERS] = parse_identifiers(
+                    user_input[CONF_IDENTIFIERS]
+                )
+            if user_input.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL) > user_input.get(
+                CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL
+            ):
+                errors["base"] = "min_above_max"
+            elif is_hub and not user_input[CONF_IDENTIFIERS]:
+                errors[CONF_IDENTIFIERS] = "no_identifiers"
+            else:
+                return self.async_create_entry(title="", data=user_input)
 
+        options = self.config_entry.options
+        schema: dict[Any, Any] = {}
+        if is_hub:
+            # Paste the full list (or a CSV export) to add or remove identifiers
+            current = options.get(
+                CONF_IDENTIFIERS, self.config_entry.data[CONF_IDENTIFIERS]
+            )
+            schema[
+                vol.Required(CONF_IDENTIFIERS, default="\n".join(current))
+            ] = IDENTIFIERS_SELECTOR
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema(
                 {
+                    **schema,
                     vol.Optional(
                         CONF_CHECK_INTERVAL,
-                        default=self.config_entry.options.get(
+                        default=options.get(
                             CONF_CHECK_INTERVAL,
                             self.config_entry.data.get(
                                 CONF_CHECK_INTERVAL, DEFAULT_CHECK_INTERVAL
                             ),
                         ),
                     ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1440)),
+                    vol.Optional(
+                        CONF_ADAPTIVE_POLLING,
+                        default=options.get(CONF_ADAPTIVE_POLLING, False),
+                    ): cv.boolean,
+                    vol.Optional(
+                        CONF_MIN_INTERVAL,
+                        default=options.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1440)),
+                    vol.Optional(
+                        CONF_MAX_INTERVAL,
+                        default=options.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1440)),
                 }
             ),
+            errors=errors,
         )
@@ -3,10 +3,17 @@ from datetime import timedelta
 
 DOMAIN = "bulgarian_utility_outage_checker"
 
+# URL path serving the www folder (Lovelace card)
+STATIC_URL_PATH = f"/local/community/{DOMAIN}"
+
 # Configuration
 CONF_PROVIDER = "provider"
 CONF_IDENTIFIER = "identifier"
+CONF_IDENTIFIERS = "identifiers"  # hub entries
 CONF_CHECK_INTERVAL = "check_interval"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_MIN_INTERVAL = "min_interval"
+CONF_MAX_INTERVAL = "max_interval"
 
 # Providers
 PROVIDER_ENERGOHOLD = "energohold"
@@ -16,6 +23,8 @@ PROVIDERS = {
 
 # Defaults
 DEFAULT_CHECK_INTERVAL = 60  # minutes
+DEFAULT_MIN_INTERVAL = 5  # minutes
+DEFAULT_MAX_INTERVAL = 240  # minutes
 DEFAULT_NAME = "Bulgarian Utility Outage Checker"
 
 # Update interval
@@ -24,13 +33,108 @@ UPDATE_INTERVAL = timedelta(minutes=DEFAULT_CHECK_INTERVAL)
 # ERM West website
 ERM_WEST_URL = "https://info.ermzapad.bg/webint/vok/avplan.php"
 
+# Times on the upstream pages are local Bulgarian time
+UPSTREAM_TIMEZONE = "Europe/Sofia"
+
+# HTTP client
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+HTTP_TIMEOUT = 20  # seconds
+HTTP_LIMIT_PER_HOST = 8
+HTTP_KEEPALIVE_TIMEOUT = 60  # seconds
+DNS_CACHE_TTL = 300  # seconds
+MAX_BODY_SIZE = 2 * 1024 * 1024  # bytes; larger pages are rejected
+STREAM_CHUNK_SIZE = 64 * 1024  # bytes read (and parsed) at a time
+
+# Fetch scheduler
+SCHEDULER_TICK = timedelta(seconds=30)
+FETCH_TIMEOUT = 30  # seconds, per request once it has a slot
+
+# Circuit breaker per upstream host
+BREAKER_FAILURE_THRESHOLD = 5  # consecutive failures before requests stop
+BREAKER_RESET_TIMEOUT = 60  # seconds before the first probe request
+BREAKER_MAX_RESET_TIMEOUT = 900  # seconds, cap for the doubling timeout
+
+# Parse executor
+PARSE_WORKERS = 2
+PARSE_MAX_QUEUE = 32  # jobs queued beyond the workers before callers wait
+PARSE_USE_PROCESSES = False  # parse in worker processes instead of threads
+# Parse pages chunk by chunk while they download (thread mode only). Only
+# used for pages with no earlier fingerprint, whose parse cannot be skipped
+PARSE_STREAMING = True
+
+# HTML parser engines
+PARSER_ENGINE_LXML = "lxml"
+PARSER_ENGINE_SOUP = "soup"
+PARSER_ENGINE = PARSER_ENGINE_LXML
+
+# Adaptive polling
+ADAPTIVE_FAST_POLLS = 3  # polls at the minimum interval after a transition
+ADAPTIVE_BACKOFF_FACTOR = 2
+ADAPTIVE_JITTER = 0.2  # +/- fraction applied to failure backoff
+
+# Services
+SERVICE_CHECK_NOW = "check_now"
+SERVICE_GET_OUTAGES = "get_outages"
+SERVICE_FIND_OUTAGES = "find_outages"
+SERVICE_GET_HISTORY = "get_history"
+SERVICE_PROFILE = "profile"
+CHECK_NOW_MIN_GAP = 30  # seconds between fetches of the same identifier
+
+# Bus events, fired once per outage transition
+EVENT_OUTAGE_STARTED = f"{DOMAIN}_outage_started"
+EVENT_OUTAGE_UPDATED = f"{DOMAIN}_outage_updated"
+EVENT_OUTAGE_RESOLVED = f"{DOMAIN}_outage_resolved"
+EVENT_OUTAGE_SCHEDULED = f"{DOMAIN}_outage_scheduled"
+
+# Persistent state cache
+STORAGE_KEY = f"{DOMAIN}.state"
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 30  # seconds
+STARTUP_REFRESH_JITTER = 120  # seconds
+
+# Outage history (SQLite file under .storage)
+HISTORY_DB_FILE = f"{DOMAIN}_history.db"
+HISTORY_PERIODS_LIMIT = 500  # default max periods per get_history call
+STATISTICS_IMPORT_MINUTE = 10  # minute past each hour to import long-term statistics
+
+# Instrumentation
+STATS_WINDOW = 500  # samples kept per rolling histogram
+PROFILE_MAX_CYCLES = 10  # refresh cycles per profile service call
+PROFILE_TIMEOUT = 60  # default minutes to wait for the profiled refreshes
+PROFILE_MAX_TIMEOUT = 24 * 60  # max minutes to wait for the profiled refreshes
+PROFILE_TOP_FUNCTIONS = 25  # default functions in the profile response
+
+# Keys in hass.data[DOMAIN] that are shared by all config entries
+DATA_CLIENT = "client"
+DATA_SCHEDULER = "scheduler"
+DATA_STORE = "store"
+DATA_INDEX = "index"
+DATA_STATS = "stats"
+DATA_HISTORY = "history"
+DATA_PROFILER = "profiler"
+
 # Attributes
 ATTR_IDENTIFIER = "identifier"
 ATTR_OUTAGE_TYPE = "outage_type"
 ATTR_HAS_OUTAGE = "has_outage"
 ATTR_DETAILS = "details"
+ATTR_OUTAGE_COUNT = "outage_count"
+ATTR_NEXT_OUTAGE_START = "next_outage_start"
 ATTR_LAST_CHECK = "last_check"
 ATTR_TIMESTAMP = "timestamp"
+ATTR_DATA_AGE = "data_age"
+ATTR_STALE = "stale"
+
+# Outage summaries published in the status sensor's ``details`` attribute;
+# ``outage_count`` has the total, ``get_outages`` the full records
+MAX_DETAILS_ATTRIBUTE = 10
+
+# Attributes not written to the recorder: bulky or changing on every poll
+STATUS_UNRECORDED_ATTRIBUTES = frozenset({ATTR_DETAILS})
+LAST_CHECK_UNRECORDED_ATTRIBUTES = frozenset(
+    {ATTR_TIMESTAMP, ATTR_DATA_AGE, "fingerprint_hits", "fingerprint_misses"}
+)
+NEXT_CHECK_UNRECORDED_ATTRIBUTES = frozenset({"current_interval_minutes"})
 
 # Outage types
 OUTAGE_TYPE_PLANNED = "Планирана авария"
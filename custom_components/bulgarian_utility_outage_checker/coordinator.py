@@ -4,37 +4,77 @@ from __future__ import annotations
 import asyncio
 from datetime import datetime, timedelta
 import logging
-
-import aiohttp
-import async_timeout
-from bs4 import BeautifulSoup
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+import homeassistant.util.dt as dt_util
 
 from .const import (
+    CONF_ADAPTIVE_POLLING,
     CONF_CHECK_INTERVAL,
     CONF_IDENTIFIER,
+    CONF_IDENTIFIERS,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_PROVIDER,
+    DATA_HISTORY,
     DEFAULT_CHECK_INTERVAL,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
     DOMAIN,
-    ERM_WEST_URL,
-    OUTAGE_TYPE_BOTH,
-    OUTAGE_TYPE_NONE,
-    OUTAGE_TYPE_PLANNED,
-    OUTAGE_TYPE_UNPLANNED,
+    PROVIDER_ENERGOHOLD,
 )
+from .history import OutageHistory, async_get_history
+from .index import async_get_outage_index
+from .providers import get_provider
+from .scheduler import OutageFetchScheduler
+from .slices import IdentifierSlice
+from .stats import PipelineStats, async_get_domain_stats
+from .store import OutageStateStore
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class BulgarianUtilityOutageCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching Bulgarian utility outage data."""
+def entry_identifiers(entry: ConfigEntry) -> list[str]:
+    """Return the identifiers of a config entry.
+
+    Hub entries keep a list (options override data, so the options flow
+    can replace it); single entries hold one identifier.
+    """
+    if CONF_IDENTIFIERS in entry.data:
+        return list(entry.options.get(CONF_IDENTIFIERS, entry.data[CONF_IDENTIFIERS]))
+    return [entry.data[CONF_IDENTIFIER]]
+
+
+class BulgarianUtilityOutageCoordinator(DataUpdateCoordinator[dict[str, dict[str, Any]]]):
+    """Class to manage fetching Bulgarian utility outage data.
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+    One coordinator serves a whole config entry. Every identifier of the
+    entry is an ``IdentifierSlice`` with its own schedule; a refresh only
+    fetches the slices that are due. ``data`` maps identifiers to their
+    latest parsed result.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        scheduler: OutageFetchScheduler,
+        state_store: OutageStateStore,
+    ) -> None:
         """Initialize."""
-        self.identifier = entry.data[CONF_IDENTIFIER]
+        self.is_hub = CONF_IDENTIFIERS in entry.data
+        self.provider = get_provider(
+            entry.data.get(CONF_PROVIDER, PROVIDER_ENERGOHOLD)
+        )
         self.entry = entry
+        self.scheduler = scheduler
+        self.state_store = state_store
+        self.outage_index = async_get_outage_index(hass)
+        async_get_history(hass)
+        self.stats = PipelineStats(async_get_domain_stats(hass))
         
         # Get check interval from options or data
         check_interval = entry.options.get(
@@ -43,19 +83,35 @@ class BulgarianUtilityOutageCoordinator(DataUpdateCoordinator):
         )
         
         self._check_interval = check_interval
-        update_interval = timedelta(minutes=check_interval)
+        self.update_period = timedelta(minutes=check_interval)
+
+        # Adaptive polling: poll faster around outages, back off when quiet
+        self.adaptive = entry.options.get(CONF_ADAPTIVE_POLLING, False)
+        self.min_interval = timedelta(
+            minutes=entry.options.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL)
+        )
+        self.max_interval = timedelta(
+            minutes=entry.options.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL)
+        )
+
+        self.slices: dict[str, IdentifierSlice] = {
+            identifier: IdentifierSlice(self, identifier)
+            for identifier in entry_identifiers(entry)
+        }
         
         _LOGGER.info(
-            "Initializing coordinator for %s with update interval of %d minutes",
-            self.identifier,
+            "Initializing coordinator for %s (%d identifiers) with update interval of %d minutes",
+            entry.title,
+            len(self.slices),
             check_interval,
         )
 
         super().__init__(
             hass,
             _LOGGER,
-            name=f"{DOMAIN}_{self.identifier}",
-            update_interval=update_interval,
+            name=f"{DOMAIN}_{entry.entry_id}",
+            # Refreshes are driven by the domain-level scheduler
+            update_interval=None,
         )
     
     @property
@@ -63,121 +119,94 @@ class BulgarianUtilityOutageCoordinator(DataUpdateCoordinator):
         """Return the check interval in minutes."""
         return self._check_interval
 
-    async def _async_update_data(self) -> dict:
-        """Fetch data from ERM West website."""
-        _LOGGER.debug(
-            "Starting data update for %s (interval: %d min)",
-            self.identifier,
-            self._check_interval,
-        )
-        try:
-            async with async_timeout.timeout(30):
-                data = await self._fetch_outage_data()
-                _LOGGER.info(
-                    "Successfully updated data for %s: has_outage=%s",
-                    self.identifier,
-                    data.get("has_outage", "unknown"),
-                )
-                return data
-        except asyncio.TimeoutError as err:
-            _LOGGER.error("Timeout communicating with ERM West for %s: %s", self.identifier, err)
-            raise UpdateFailed(f"Timeout communicating with ERM West: {err}") from err
-        except Exception as err:
-            _LOGGER.error("Error communicating with ERM West for %s: %s", self.identifier, err)
-            raise UpdateFailed(f"Error communicating with ERM West: {err}") from err
-
-    async def _fetch_outage_data(self) -> dict:
-        """Fetch and parse outage data."""
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        }
-        
-        params = {
-            "submit": "Търсене",
-            "key": self.identifier,
-        }
+    @property
+    def history(self) -> OutageHistory | None:
+        """Return the outage history, None once it was closed on stop."""
+        return self.hass.data[DOMAIN].get(DATA_HISTORY)
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                ERM_WEST_URL, 
-                params=params, 
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=20)
-            ) as response:
-                if response.status != 200:
-                    raise UpdateFailed(f"HTTP error {response.status}")
-                
-                html = await response.text()
-                return await self.hass.async_add_executor_job(
-                    self._parse_html, html
-                )
+    @property
+    def identifiers(self) -> list[str]:
+        """Return the identifiers served by this coordinator."""
+        return list(self.slices)
 
-    def _parse_html(self, html: str) -> dict:
-        """Parse HTML response."""
-        soup = BeautifulSoup(html, "lxml")
-        
-        # По подразбиране предполагаме, че има проблем
-        result = {
-            "identifier": self.identifier,
-            "timestamp": datetime.now().isoformat(),
-            "has_outage": True,
-            "outage_type": OUTAGE_TYPE_UNPLANNED,
-            "details": [],
-            "last_check": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    @property
+    def next_refresh(self) -> datetime | None:
+        """Return when the next identifier is due, None if one is due now."""
+        times = [slice_.next_refresh for slice_ in self.slices.values()]
+        if not times or None in times:
+            return None
+        return min(times)
+
+    def unique_id(self, identifier: str, key: str) -> str:
+        """Return the unique id of an entity of an identifier.
+
+        Single entries keep their original ``<entry_id>_<key>`` ids.
+        """
+        if self.is_hub:
+            return f"{self.entry.entry_id}_{identifier}_{key}"
+        return f"{self.entry.entry_id}_{key}"
+
+    def device_key(self, identifier: str) -> str:
+        """Return the device registry key of an identifier."""
+        if self.is_hub:
+            return f"{self.entry.entry_id}_{identifier}"
+        return self.entry.entry_id
+
+    def slice_for_unique_id(self, unique_id: str) -> IdentifierSlice | None:
+        """Return the slice an entity unique id belongs to."""
+        if not self.is_hub:
+            return next(iter(self.slices.values()), None)
+        # Identifiers may contain underscores: prefer the longest match
+        matches = [
+            slice_
+            for identifier, slice_ in self.slices.items()
+            if unique_id.startswith(f"{self.entry.entry_id}_{identifier}_")
+        ]
+        return max(matches, key=lambda slice_: len(slice_.identifier), default=None)
+
+    @callback
+    def async_restore_cached_state(self) -> bool:
+        """Publish the persisted results, marked stale, without fetching.
+
+        Returns True only if every identifier was restored. Identifiers
+        without a cached result stay due for the first refresh.
+        """
+        restored = [slice_.restore_cached_state() for slice_ in self.slices.values()]
+        if any(restored):
+            self.async_set_updated_data(self._slice_data())
+        return all(restored)
+
+    def is_due(self, now: datetime) -> bool:
+        """Return True if the scheduler should refresh this coordinator."""
+        return any(slice_.is_due(now) for slice_ in self.slices.values())
+
+    async def async_refresh_identifier(self, identifier: str) -> None:
+        """Refresh one identifier now."""
+        if (slice_ := self.slices.get(identifier)) is None:
+            return
+        slice_.next_refresh = None
+        await self.async_refresh()
+
+    def _slice_data(self) -> dict[str, dict[str, Any]]:
+        """Return the current data of every slice that has some."""
+        return {
+            identifier: slice_.data
+            for identifier, slice_ in self.slices.items()
+            if slice_.data is not None
         }
 
-        # Проверка за съобщение "няма регистрирано прекъсване"
-        no_outage_messages = soup.find_all(
-            string=lambda text: text and (
-                "няма регистрирано" in text.lower() or
-                "няма планирано" in text.lower() or
-                "няма непланирано" in text.lower() or
-                "не са регистрирани" in text.lower()
-            )
-        )
-        
-        if no_outage_messages:
-            # Ако има съобщение "няма регистрирано", значи всичко е ОК
-            result["has_outage"] = False
-            result["outage_type"] = OUTAGE_TYPE_NONE
-        else:
-            # Ако няма такова съобщение, има авария
-            # Определяме типа на аварията
-            
-            # Проверка за непланирани аварии
-            unplanned_markers = soup.find_all(
-                string=lambda text: text and "непланиран" in text.lower()
-            )
-            
-            # Проверка за планирани аварии
-            planned_markers = soup.find_all(
-                string=lambda text: text and "планиран" in text.lower() and "непланиран" not in text.lower()
-            )
-            
-            if unplanned_markers and planned_markers:
-                result["outage_type"] = OUTAGE_TYPE_BOTH
-            elif planned_markers:
-                result["outage_type"] = OUTAGE_TYPE_PLANNED
-            else:
-                result["outage_type"] = OUTAGE_TYPE_UNPLANNED
-            
-            # Извличане на детайли за аварията
-            tables = soup.find_all("table")
-            for table in tables:
-                rows = table.find_all("tr")
-                for row in rows:
-                    cells = row.find_all(["td", "th"])
-                    if len(cells) > 0:
-                        row_text = " ".join([cell.get_text(strip=True) for cell in cells])
-                        if row_text and len(row_text) > 5:  # Игнорираме празни редове
-                            result["details"].append(row_text)
-
-        _LOGGER.debug(
-            "Fetched data for %s: has_outage=%s, type=%s, no_outage_msg=%s",
-            self.identifier,
-            result["has_outage"],
-            result["outage_type"],
-            len(no_outage_messages) > 0,
-        )
-
-        return result
+    async def _async_update_data(self) -> dict[str, dict[str, Any]]:
+        """Fetch data from the provider website for every due identifier."""
+        now = dt_util.utcnow()
+        due = [slice_ for slice_ in self.slices.values() if slice_.is_due(now)]
+        if due:
+            results = await asyncio.gather(*(slice_.async_refresh() for slice_ in due))
+            if not any(results):
+                # The base class notifies listeners only on the first of
+                # several failed refreshes; entities still have to publish
+                # the growing data age and the stale flag
+                self.async_update_listeners()
+                raise UpdateFailed(
+                    f"Error communicating with {self.provider.name} for {len(due)} identifiers"
+                )
+        return self._slice_data()
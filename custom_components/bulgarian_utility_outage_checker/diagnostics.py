@@ -0,0 +1,47 @@
+"""Diagnostics support for Bulgarian Utility Outage Checker."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_IDENTIFIER, CONF_IDENTIFIERS, DOMAIN
+from .coordinator import BulgarianUtilityOutageCoordinator
+from .stats import async_get_domain_stats
+
+# Identifiers are subscriber numbers or home addresses
+TO_REDACT = {CONF_IDENTIFIER, CONF_IDENTIFIERS, "identifier", "area", "details"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: BulgarianUtilityOutageCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "coordinator": {
+            "provider": coordinator.provider.key,
+            "hub": coordinator.is_hub,
+            "last_update_success": coordinator.last_update_success,
+            "next_refresh": coordinator.next_refresh,
+            # One entry per identifier, in entry order
+            "slices": [
+                async_redact_data(slice_.as_dict(), TO_REDACT)
+                for slice_ in coordinator.slices.values()
+            ],
+        },
+        "pipeline": coordinator.stats.as_dict(),
+        "domain_pipeline": async_get_domain_stats(hass).as_dict(),
+        "parse_executor": coordinator.scheduler.parse_executor.as_dict(),
+        "circuit_breakers": {
+            host: breaker.as_dict()
+            for host, breaker in coordinator.scheduler.breakers.items()
+        },
+    }
@@ -0,0 +1,86 @@
+"""Base entity for Bulgarian Utility Outage Checker."""
+from __future__ import annotations
+
+from abc import abstractmethod
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .coordinator import BulgarianUtilityOutageCoordinator
+from .slices import IdentifierSlice
+
+
+class OutageEntity(CoordinatorEntity[BulgarianUtilityOutageCoordinator]):
+    """Entity bound to one identifier (slice) of a coordinator.
+
+    A coordinator notifies every entity on each refresh. Entities skip
+    updates that did not touch their slice. Otherwise they recompute their
+    ``_attr_*`` values once from the slice's snapshot (``_update_attrs``)
+    and only write state when their availability, value or attributes
+    actually changed, so unchanged polls cause no state writes or
+    ``state_changed`` events.
+    """
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: BulgarianUtilityOutageCoordinator,
+        identifier: str,
+        key: str,
+    ) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self._identifier = identifier
+        self.slice: IdentifierSlice = coordinator.slices[identifier]
+        self._written_version = -1
+        self._written_signature: tuple[Any, ...] | None = None
+        self._attr_unique_id = coordinator.unique_id(identifier, key)
+        # Device info for grouping entities
+        self._attr_device_info = self.slice.device_info
+        self._update_attrs()
+
+    @property
+    def available(self) -> bool:
+        """Return True if entity is available.
+
+        After failed refreshes the last good data is still served, flagged
+        through the ``stale`` attribute.
+        """
+        return self._attr_available
+
+    @callback
+    def _update_attrs(self) -> None:
+        """Recompute the ``_attr_*`` values from the slice."""
+        self._attr_available = (
+            self.slice.last_update_success or self.slice.snapshot is not None
+        )
+
+    @abstractmethod
+    def _state_value(self) -> Any:
+        """Return the entity's value (native value or on/off)."""
+
+    def _state_signature(self) -> tuple[Any, ...]:
+        """Return everything a state write would publish."""
+        return (self.available, self._state_value(), self.extra_state_attributes)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only if this entity's published state changed."""
+        if self.slice.version == self._written_version:
+            return
+        self._written_version = self.slice.version
+        self._update_attrs()
+        signature = self._state_signature()
+        if signature == self._written_signature:
+            return
+        self._written_signature = signature
+        super()._handle_coordinator_update()
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the state written when the entity is added."""
+        await super().async_added_to_hass()
+        self._update_attrs()
+        self._written_version = self.slice.version
+        self._written_signature = self._state_signature()
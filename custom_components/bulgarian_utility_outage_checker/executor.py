@@ -0,0 +1,207 @@
+"""Dedicated, bounded executor for HTML parsing."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import logging
+import multiprocessing
+import time
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from .const import DOMAIN
+from .stats import timed_call
+
+if TYPE_CHECKING:
+    from .profiling import RefreshProfiler
+    from .providers import FeedParser, OutageProvider
+
+_T = TypeVar("_T")
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ParseExecutor:
+    """Run parse jobs on a small pool owned by the integration.
+
+    Parsing stays off Home Assistant's shared executor, so a burst of
+    refreshes cannot starve other integrations. At most ``workers +
+    max_queue`` jobs are submitted at a time. Further callers wait on the
+    event loop (backpressure) instead of growing an unbounded queue.
+
+    In process mode, jobs and their arguments must be picklable
+    (module-level functions and plain data).
+    """
+
+    def __init__(
+        self, workers: int, max_queue: int, use_processes: bool = False
+    ) -> None:
+        """Initialize the executor."""
+        self.workers = workers
+        self.use_processes = use_processes
+        self._pool: Executor
+        if use_processes:
+            self._pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        else:
+            self._pool = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix=f"{DOMAIN}_parse"
+            )
+        self._slots = asyncio.Semaphore(workers + max_queue)
+        self.submitted = 0
+        self.waiting = 0
+        self.completed = 0
+        self.max_queue_depth = 0
+        # Set by the profile service for the duration of a profiling run
+        self.profiler: RefreshProfiler | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        """Return jobs not yet running: queued in the pool plus held back."""
+        return max(0, self.submitted - self.workers) + self.waiting
+
+    async def async_run(self, func: Callable[..., _T], *args: Any) -> _T:
+        """Run ``func(*args)`` on the pool, waiting for a slot if it is full."""
+        self.waiting += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        if self.profiler is not None and not self.use_processes:
+            func = self.profiler.wrap(func)
+        self.submitted += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._pool, func, *args
+            )
+        finally:
+            self.submitted -= 1
+            self.completed += 1
+            self._slots.release()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a diagnostics-friendly snapshot."""
+        return {
+            "mode": "process" if self.use_processes else "thread",
+            "workers": self.workers,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "completed": self.completed,
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the pool, by default without waiting for running jobs.
+
+        Blocking with ``wait``; run in an executor.
+        """
+        _LOGGER.debug("Shutting down parse executor")
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def _parse_chunks(
+    provider: OutageProvider,
+    identifier: str,
+    encoding: str | None,
+    parser: FeedParser | None,
+    chunks: list[bytes],
+    last: bool,
+) -> tuple[FeedParser, dict[str, Any] | None]:
+    """Feed a batch of chunks to the parser of a page.
+
+    Creates the parser for the first batch. Returns the parser and, once
+    the page is complete or the parser needs no more of it, the result.
+    """
+    if parser is None:
+        parser = provider.create_feed_parser(identifier, encoding)
+    for chunk in chunks:
+        if parser.feed(chunk):
+            return parser, parser.close()
+    return parser, parser.close() if last else None
+
+
+class StreamingParse:
+    """Parse a page on the executor while it downloads.
+
+    The download queues chunks with ``feed`` and ``finish``, which never
+    wait. ``async_parse`` runs next to it and hands everything queued so
+    far to the provider's feed parser in one executor job, so a small page
+    costs one or two jobs and a slow parse never holds up the download.
+    Once the parser reports that the rest of the page cannot change the
+    result, further chunks are dropped. Thread mode only: the parser state
+    lives in this process.
+    """
+
+    def __init__(
+        self, executor: ParseExecutor, provider: OutageProvider, identifier: str
+    ) -> None:
+        """Initialize the stream."""
+        self._executor = executor
+        self._provider = provider
+        self._identifier = identifier
+        self._encoding: str | None = None
+        self._chunks: list[bytes] = []
+        self._finished = False
+        self._aborted = False
+        self._queued = asyncio.Event()
+        self.done = False
+        self.queue_wait = 0.0
+        self.parse_time = 0.0
+
+    def feed(self, chunk: bytes, encoding: str | None) -> None:
+        """Queue the next chunk of the page.
+
+        ``encoding`` is used when the first batch creates the parser.
+        """
+        if self.done or self._aborted:
+            return
+        self._encoding = encoding
+        self._chunks.append(chunk)
+        self._queued.set()
+
+    def finish(self, encoding: str | None) -> None:
+        """Mark the page as complete."""
+        self._encoding = encoding
+        self._finished = True
+        self._queued.set()
+
+    def abort(self) -> None:
+        """Stop parsing a page that will not be completed (e.g. a 304)."""
+        if not self._finished:
+            self._aborted = True
+            self._queued.set()
+
+    async def async_parse(self) -> dict[str, Any] | None:
+        """Parse queued chunks until the page is complete.
+
+        Returns the result dict, or None if the stream was aborted.
+        """
+        parser: FeedParser | None = None
+        while True:
+            await self._queued.wait()
+            self._queued.clear()
+            if self._aborted:
+                return None
+            chunks, self._chunks = self._chunks, []
+            last = self._finished
+            if not chunks and not last:
+                continue
+            (parser, result), queue_wait, parse_time = await self._executor.async_run(
+                timed_call,
+                _parse_chunks,
+                time.monotonic(),
+                self._provider,
+                self._identifier,
+                self._encoding,
+                parser,
+                chunks,
+                last,
+            )
+            self.queue_wait += queue_wait
+            self.parse_time += parse_time
+            if result is not None:
+                self.done = True
+                return result
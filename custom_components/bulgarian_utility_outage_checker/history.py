@@ -0,0 +1,284 @@
+"""Per-identifier outage history in a local SQLite log."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import logging
+import sqlite3
+import time
+from typing import Any, TypeVar
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+import homeassistant.util.dt as dt_util
+
+from .const import DATA_HISTORY, DOMAIN, HISTORY_DB_FILE
+
+_T = TypeVar("_T")
+
+_LOGGER = logging.getLogger(__name__)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS outages (
+        identifier TEXT NOT NULL,
+        outage_type TEXT NOT NULL,
+        started INTEGER NOT NULL,
+        ended INTEGER,
+        details TEXT NOT NULL DEFAULT ''
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS outages_identifier_started ON outages (identifier, started)",
+    "CREATE INDEX IF NOT EXISTS outages_started ON outages (started)",
+    # At most one open period per identifier
+    "CREATE UNIQUE INDEX IF NOT EXISTS outages_open ON outages (identifier) WHERE ended IS NULL",
+)
+
+
+def _isoformat(timestamp: int) -> str:
+    """Return an epoch timestamp as a local ISO 8601 string."""
+    return dt_util.as_local(dt_util.utc_from_timestamp(timestamp)).isoformat()
+
+
+class OutageHistory:
+    """Log of outage periods (start, end, type, details) per identifier.
+
+    Each outage appends one row when it starts; the row is closed once by
+    setting ``ended`` when it is resolved. Times are stored as integer epoch
+    seconds. Rows are indexed by identifier and start time, so range
+    queries and monthly rollups stay fast over years of data.
+
+    SQLite is blocking, so every call runs on a single dedicated thread
+    that owns the connection.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the history."""
+        self._path = path
+        self._conn: sqlite3.Connection | None = None
+        self._closed = False
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"{DOMAIN}_history"
+        )
+
+    async def _async_run(self, func: Callable[..., _T], *args: Any) -> _T:
+        """Run a blocking call on the history thread."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, func, *args
+        )
+
+    @property
+    def closed(self) -> bool:
+        """Return True once the history thread has been stopped."""
+        return self._closed
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return the connection, creating the schema on first use."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self._path)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            with self._conn:
+                for statement in _SCHEMA:
+                    self._conn.execute(statement)
+        return self._conn
+
+    async def async_record_state(
+        self,
+        identifier: str,
+        has_outage: bool,
+        outage_type: str,
+        details: list[str],
+        at: datetime,
+    ) -> None:
+        """Record the current state, opening or closing a period if needed.
+
+        Does nothing once the history is closed; refreshes still finishing
+        while Home Assistant stops are not recorded.
+        """
+        if self._closed:
+            return
+        await self._async_run(
+            self._record_state,
+            identifier,
+            has_outage,
+            outage_type,
+            "\n".join(details),
+            int(at.timestamp()),
+        )
+
+    def _record_state(
+        self,
+        identifier: str,
+        has_outage: bool,
+        outage_type: str,
+        details: str,
+        at: int,
+    ) -> None:
+        """Open, retype or close the identifier's open period."""
+        conn = self._connection()
+        with conn:
+            row = conn.execute(
+                "SELECT rowid, outage_type FROM outages WHERE identifier = ? AND ended IS NULL",
+                (identifier,),
+            ).fetchone()
+            if row is not None and (not has_outage or row[1] != outage_type):
+                conn.execute("UPDATE outages SET ended = ? WHERE rowid = ?", (at, row[0]))
+                row = None
+            if has_outage and row is None:
+                conn.execute(
+                    "INSERT INTO outages (identifier, outage_type, started, details) VALUES (?, ?, ?, ?)",
+                    (identifier, outage_type, at, details),
+                )
+
+    async def async_periods(
+        self,
+        identifier: str | None,
+        start: datetime,
+        end: datetime,
+        limit: int,
+    ) -> list[dict[str, Any]]:
+        """Return outage periods overlapping ``[start, end]``, newest first."""
+        return await self._async_run(
+            self._periods,
+            identifier,
+            int(start.timestamp()),
+            int(end.timestamp()),
+            limit,
+        )
+
+    def _periods(
+        self, identifier: str | None, start: int, end: int, limit: int
+    ) -> list[dict[str, Any]]:
+        """Query outage periods."""
+        now = int(time.time())
+        query = (
+            "SELECT identifier, outage_type, started, ended, details FROM outages "
+            "WHERE started <= ? AND (ended IS NULL OR ended >= ?)"
+        )
+        params: list[Any] = [end, start]
+        if identifier is not None:
+            query += " AND identifier = ?"
+            params.append(identifier)
+        query += " ORDER BY started DESC LIMIT ?"
+        params.append(limit)
+
+        return [
+            {
+                "identifier": row[0],
+                "outage_type": row[1],
+                "started": _isoformat(row[2]),
+                "ended": _isoformat(row[3]) if row[3] is not None else None,
+                "duration_minutes": round(((row[3] or now) - row[2]) / 60),
+                "details": row[4].splitlines(),
+            }
+            for row in self._connection().execute(query, params)
+        ]
+
+    async def async_intervals(
+        self, identifier: str, start: datetime | None, end: datetime
+    ) -> list[tuple[int, int | None]]:
+        """Return (started, ended) epoch pairs overlapping ``[start, end)``.
+
+        Without ``start`` every period of the identifier before ``end`` is
+        returned. Open periods have ``ended`` set to ``None``.
+        """
+        return await self._async_run(
+            self._intervals,
+            identifier,
+            int(start.timestamp()) if start is not None else None,
+            int(end.timestamp()),
+        )
+
+    def _intervals(
+        self, identifier: str, start: int | None, end: int
+    ) -> list[tuple[int, int | None]]:
+        """Query raw outage intervals of one identifier."""
+        query = "SELECT started, ended FROM outages WHERE identifier = ? AND started < ?"
+        params: list[Any] = [identifier, end]
+        if start is not None:
+            query += " AND (ended IS NULL OR ended > ?)"
+            params.append(start)
+        query += " ORDER BY started"
+        return list(self._connection().execute(query, params))
+
+    async def async_monthly_rollup(
+        self, identifier: str | None, start: datetime, end: datetime
+    ) -> list[dict[str, Any]]:
+        """Return outage count and minutes per identifier, month and type."""
+        return await self._async_run(
+            self._monthly_rollup,
+            identifier,
+            int(start.timestamp()),
+            int(end.timestamp()),
+        )
+
+    def _monthly_rollup(
+        self, identifier: str | None, start: int, end: int
+    ) -> list[dict[str, Any]]:
+        """Aggregate outage periods by month of their start.
+
+        Months follow Home Assistant's time zone at its current UTC offset,
+        which is close enough for monthly totals across DST changes.
+        """
+        offset = dt_util.now().utcoffset() or timedelta(0)
+        query = (
+            "SELECT identifier, strftime('%Y-%m', started + ?, 'unixepoch') AS month, "
+            "outage_type, COUNT(*), SUM(COALESCE(ended, ?) - started) "
+            "FROM outages WHERE started BETWEEN ? AND ?"
+        )
+        params: list[Any] = [
+            int(offset.total_seconds()),
+            int(time.time()),
+            start,
+            end,
+        ]
+        if identifier is not None:
+            query += " AND identifier = ?"
+            params.append(identifier)
+        query += " GROUP BY identifier, month, outage_type ORDER BY identifier, month"
+
+        return [
+            {
+                "identifier": row[0],
+                "month": row[1],
+                "outage_type": row[2],
+                "outages": row[3],
+                "outage_minutes": round(row[4] / 60),
+            }
+            for row in self._connection().execute(query, params)
+        ]
+
+    def close(self) -> None:
+        """Close the connection and stop the history thread."""
+        if self._closed:
+            return
+        _LOGGER.debug("Closing outage history")
+        self._closed = True
+
+        def _close() -> None:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+        self._executor.submit(_close)
+        self._executor.shutdown(wait=False)
+
+
+@callback
+def async_get_history(hass: HomeAssistant) -> OutageHistory:
+    """Return the shared outage history, closing it when HA stops."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (history := domain_data.get(DATA_HISTORY)) is None:
+        history = domain_data[DATA_HISTORY] = OutageHistory(
+            hass.config.path(".storage", HISTORY_DB_FILE)
+        )
+
+        @callback
+        def _async_close(event: Event) -> None:  # noqa: ARG001
+            domain_data.pop(DATA_HISTORY, None)
+            history.close()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_close)
+    return history
@@ -0,0 +1,234 @@
+"""Domain-wide index of the outages listed for all identifiers."""
+from __future__ import annotations
+
+import bisect
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_INDEX, DOMAIN
+from .models import OutageRecord
+
+
+def locality_of(area: str) -> str:
+    """Return the normalized locality (first part of the area)."""
+    return area.split(",", 1)[0].strip().casefold()
+
+
+class OutageIndex:
+    """In-memory index of outages by identifier, id, locality and time.
+
+    Outages with a start time are kept in a list sorted by start. Because
+    the longest indexed duration is known, a window query only scans
+    starts in ``[window_start - max_duration, window_end]``. That makes
+    lookups O(log n + k) instead of a scan over every entity. Durations
+    are kept sorted as well, so the longest one is still known after it
+    is removed. Outages with a start but no end are treated as ongoing and
+    kept in their own list sorted by start. Outages without a start are
+    treated as already started: those with an end are kept sorted by end,
+    those without either are in every window.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._records: dict[str, OutageRecord] = {}
+        self._owners: dict[str, set[str]] = {}
+        self._by_identifier: dict[str, set[str]] = {}
+        self._by_locality: dict[str, set[str]] = {}
+        self._starts: list[tuple[datetime, str]] = []
+        self._durations: list[timedelta] = []
+        self._open_starts: list[tuple[datetime, str]] = []
+        self._unstarted_ends: list[tuple[datetime, str]] = []
+        self._unstarted_open: set[str] = set()
+
+    def __len__(self) -> int:
+        """Return the number of indexed outages."""
+        return len(self._records)
+
+    @callback
+    def async_update(self, identifier: str, outages: list[OutageRecord]) -> None:
+        """Replace the outages listed for an identifier."""
+        unique: dict[str, OutageRecord] = {}
+        for outage in outages:
+            # A page may list the same outage twice; the first entry wins
+            unique.setdefault(outage.outage_id, outage)
+        new_ids = set(unique)
+        old_ids = self._by_identifier.get(identifier, set())
+
+        for outage_id in old_ids - new_ids:
+            self._release(identifier, outage_id)
+        for outage in unique.values():
+            if outage.outage_id not in old_ids:
+                self._claim(identifier, outage)
+            elif self._records[outage.outage_id] != outage:
+                # Same outage with new details, e.g. an extended end time
+                self._reindex(outage)
+
+        if new_ids:
+            self._by_identifier[identifier] = new_ids
+        else:
+            self._by_identifier.pop(identifier, None)
+
+    @callback
+    def async_remove_identifier(self, identifier: str) -> None:
+        """Drop every outage listed for an identifier."""
+        self.async_update(identifier, [])
+
+    def _claim(self, identifier: str, outage: OutageRecord) -> None:
+        """Add an identifier as owner of an outage, indexing it if new."""
+        owners = self._owners.setdefault(outage.outage_id, set())
+        if identifier in owners:
+            return
+        owners.add(identifier)
+        if len(owners) > 1:
+            return
+        self._add_record(outage)
+
+    def _add_record(self, outage: OutageRecord) -> None:
+        """Add a record to the locality and time indexes."""
+        self._records[outage.outage_id] = outage
+        self._by_locality.setdefault(locality_of(outage.area), set()).add(
+            outage.outage_id
+        )
+        if outage.start is None:
+            if outage.end is None:
+                self._unstarted_open.add(outage.outage_id)
+            else:
+                bisect.insort(self._unstarted_ends, (outage.end, outage.outage_id))
+        elif outage.end is None:
+            bisect.insort(self._open_starts, (outage.start, outage.outage_id))
+        else:
+            bisect.insort(self._starts, (outage.start, outage.outage_id))
+            bisect.insort(self._durations, outage.end - outage.start)
+
+    def _remove_record(self, outage_id: str) -> None:
+        """Remove a record from the locality and time indexes."""
+        outage = self._records.pop(outage_id)
+        locality = locality_of(outage.area)
+        if bucket := self._by_locality.get(locality):
+            bucket.discard(outage_id)
+            if not bucket:
+                del self._by_locality[locality]
+        if outage.start is None:
+            if outage.end is None:
+                self._unstarted_open.discard(outage_id)
+            else:
+                _discard_sorted(self._unstarted_ends, (outage.end, outage_id))
+        elif outage.end is None:
+            _discard_sorted(self._open_starts, (outage.start, outage_id))
+        else:
+            _discard_sorted(self._starts, (outage.start, outage_id))
+            _discard_sorted(self._durations, outage.end - outage.start)
+
+    def _reindex(self, outage: OutageRecord) -> None:
+        """Replace the stored record of an outage, keeping its owners."""
+        self._remove_record(outage.outage_id)
+        self._add_record(outage)
+
+    def _release(self, identifier: str, outage_id: str) -> None:
+        """Remove an identifier as owner, dropping the outage if orphaned."""
+        owners = self._owners.get(outage_id)
+        if owners is None:
+            return
+        owners.discard(identifier)
+        if owners:
+            return
+
+        del self._owners[outage_id]
+        self._remove_record(outage_id)
+
+    @property
+    def _max_duration(self) -> timedelta:
+        """Return the longest duration of an indexed outage."""
+        return self._durations[-1] if self._durations else timedelta(0)
+
+    def _in_window(self, start: datetime | None, end: datetime | None) -> set[str]:
+        """Return ids of outages overlapping ``[start, end]``.
+
+        A missing bound leaves that side of the window open.
+        """
+        low = 0
+        if start is not None:
+            low = bisect.bisect_left(self._starts, (start - self._max_duration, ""))
+        high = len(self._starts)
+        if end is not None:
+            high = bisect.bisect_right(self._starts, (end, "\uffff"))
+        found = {
+            outage_id
+            for _, outage_id in self._starts[low:high]
+            if start is None or self._records[outage_id].end >= start
+        }
+        # Ongoing outages overlap every window that ends after they started
+        high = len(self._open_starts)
+        if end is not None:
+            high = bisect.bisect_right(self._open_starts, (end, "\uffff"))
+        found.update(outage_id for _, outage_id in self._open_starts[:high])
+        # Outages without a start have already started
+        low = 0
+        if start is not None:
+            low = bisect.bisect_left(self._unstarted_ends, (start, ""))
+        found.update(outage_id for _, outage_id in self._unstarted_ends[low:])
+        found.update(self._unstarted_open)
+        return found
+
+    def get(self, outage_id: str) -> OutageRecord | None:
+        """Return an outage by id."""
+        return self._records.get(outage_id)
+
+    def query(
+        self,
+        identifier: str | None = None,
+        locality: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return outages matching all given filters, ordered by start."""
+        candidates: set[str] | None = None
+        if identifier is not None:
+            candidates = set(self._by_identifier.get(identifier, ()))
+        if locality is not None:
+            bucket = self._by_locality.get(locality.strip().casefold(), set())
+            candidates = bucket if candidates is None else candidates & bucket
+        if start is not None or end is not None:
+            window = self._in_window(start, end)
+            candidates = window if candidates is None else candidates & window
+        if candidates is None:
+            candidates = set(self._records)
+
+        records = sorted(
+            (self._records[outage_id] for outage_id in candidates),
+            key=lambda outage: (
+                outage.start is None,
+                outage.start or datetime.min,
+                outage.outage_id,
+            ),
+        )
+        return [
+            {**outage.as_dict(), "identifiers": sorted(self._owners[outage.outage_id])}
+            for outage in records
+        ]
+
+    def affected_identifiers(self, at: datetime) -> set[str]:
+        """Return identifiers with an outage in progress at ``at``."""
+        return {
+            identifier
+            for outage_id in self._in_window(at, at)
+            for identifier in self._owners[outage_id]
+        }
+
+
+def _discard_sorted(items: list[Any], item: Any) -> None:
+    """Remove ``item`` from a sorted list if present."""
+    position = bisect.bisect_left(items, item)
+    if position < len(items) and items[position] == item:
+        del items[position]
+
+
+@callback
+def async_get_outage_index(hass: HomeAssistant) -> OutageIndex:
+    """Return the shared outage index."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (index := domain_data.get(DATA_INDEX)) is None:
+        index = domain_data[DATA_INDEX] = OutageIndex()
+    return index
@@ -0,0 +1,179 @@
+"""Hourly outage statistics imported into the recorder."""
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import datetime
+import logging
+import sqlite3
+import time
+from typing import TYPE_CHECKING
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.const import UnitOfTime
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.util import slugify
+import homeassistant.util.dt as dt_util
+
+from .const import DOMAIN, STATISTICS_IMPORT_MINUTE
+
+if TYPE_CHECKING:
+    from .coordinator import BulgarianUtilityOutageCoordinator
+    from .history import OutageHistory
+
+_LOGGER = logging.getLogger(__name__)
+
+STATISTIC_OUTAGE_MINUTES = "outage_minutes"
+STATISTIC_OUTAGE_COUNT = "outage_count"
+
+_HOUR = 3600
+
+
+def statistic_id(identifier: str, kind: str) -> str:
+    """Return the external statistic id of an identifier."""
+    return f"{DOMAIN}:{kind}_{slugify(identifier)}"
+
+
+def _hourly_buckets(
+    intervals: list[tuple[int, int | None]], start: int, end: int
+) -> tuple[dict[int, float], dict[int, int]]:
+    """Split outage intervals into outage minutes and starts per hour."""
+    minutes: dict[int, float] = defaultdict(float)
+    counts: dict[int, int] = defaultdict(int)
+    for started, ended in intervals:
+        if start <= started < end:
+            counts[started - started % _HOUR] += 1
+        low = max(started, start)
+        high = min(ended if ended is not None else end, end)
+        hour = low - low % _HOUR
+        while hour < high:
+            minutes[hour] += (min(high, hour + _HOUR) - max(low, hour)) / 60
+            hour += _HOUR
+    return minutes, counts
+
+
+def _last_statistic(
+    hass: HomeAssistant, statistic: str
+) -> tuple[float | None, float]:
+    """Return the start and sum of the newest row of a statistic."""
+    last = get_last_statistics(hass, 1, statistic, True, {"sum"})
+    if not (rows := last.get(statistic)):
+        return None, 0.0
+    return rows[0]["start"], rows[0]["sum"] or 0.0
+
+
+async def async_import_statistics(
+    hass: HomeAssistant, history: OutageHistory, identifier: str
+) -> None:
+    """Import outage minutes and counts for every complete hour not yet stored.
+
+    The source is the outage history log. On the first run the whole
+    history is backfilled; afterwards each run adds the hours since the
+    last imported row, so only a handful of rows are written per hour.
+    """
+    minutes_id = statistic_id(identifier, STATISTIC_OUTAGE_MINUTES)
+    count_id = statistic_id(identifier, STATISTIC_OUTAGE_COUNT)
+    end = int(time.time()) // _HOUR * _HOUR
+
+    recorder = get_instance(hass)
+    last_start, minutes_sum = await recorder.async_add_executor_job(
+        _last_statistic, hass, minutes_id
+    )
+    _, count_sum = await recorder.async_add_executor_job(
+        _last_statistic, hass, count_id
+    )
+
+    since: datetime | None = None
+    if last_start is not None:
+        since = dt_util.utc_from_timestamp(last_start + _HOUR)
+    # The history thread stops with Home Assistant, possibly while the
+    # recorder jobs above were awaited
+    if history.closed:
+        return
+    try:
+        intervals = await history.async_intervals(
+            identifier, since, dt_util.utc_from_timestamp(end)
+        )
+    except sqlite3.Error as err:
+        _LOGGER.warning("Could not read outage history for %s: %s", identifier, err)
+        return
+
+    if last_start is not None:
+        start = int(last_start) + _HOUR
+    elif intervals:
+        start = intervals[0][0] - intervals[0][0] % _HOUR
+    else:
+        return
+    if start >= end:
+        return
+
+    minutes, counts = _hourly_buckets(intervals, start, end)
+    minute_rows: list[StatisticData] = []
+    count_rows: list[StatisticData] = []
+    for hour in range(start, end, _HOUR):
+        hour_start = dt_util.utc_from_timestamp(hour)
+        hour_minutes = round(minutes.get(hour, 0.0), 2)
+        hour_count = counts.get(hour, 0)
+        minutes_sum += hour_minutes
+        count_sum += hour_count
+        minute_rows.append(
+            StatisticData(start=hour_start, state=hour_minutes, sum=minutes_sum)
+        )
+        count_rows.append(
+            StatisticData(start=hour_start, state=hour_count, sum=count_sum)
+        )
+
+    _LOGGER.debug("Importing %d hourly outage statistics for %s", len(minute_rows), identifier)
+    async_add_external_statistics(
+        hass,
+        StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            name=f"{identifier} outage minutes",
+            source=DOMAIN,
+            statistic_id=minutes_id,
+            unit_of_measurement=UnitOfTime.MINUTES,
+        ),
+        minute_rows,
+    )
+    async_add_external_statistics(
+        hass,
+        StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            name=f"{identifier} outages",
+            source=DOMAIN,
+            statistic_id=count_id,
+            unit_of_measurement=None,
+        ),
+        count_rows,
+    )
+
+
+@callback
+def async_setup_statistics(
+    hass: HomeAssistant, coordinator: BulgarianUtilityOutageCoordinator
+) -> CALLBACK_TYPE:
+    """Import statistics now and shortly after every hour.
+
+    Returns the unsubscribe callback. Requires a loaded recorder.
+    """
+
+    @callback
+    def _async_import(now: datetime | None = None) -> None:  # noqa: ARG001
+        if (history := coordinator.history) is None:
+            return
+        for identifier in coordinator.identifiers:
+            hass.async_create_task(
+                async_import_statistics(hass, history, identifier)
+            )
+
+    _async_import()
+    return async_track_time_change(
+        hass, _async_import, minute=STATISTICS_IMPORT_MINUTE, second=0
+    )
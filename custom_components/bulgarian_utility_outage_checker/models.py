@@ -0,0 +1,261 @@
+"""Data models for Bulgarian Utility Outage Checker."""
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from datetime import datetime
+import hashlib
+import re
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from .const import (
+    ATTR_DETAILS,
+    ATTR_HAS_OUTAGE,
+    ATTR_IDENTIFIER,
+    ATTR_NEXT_OUTAGE_START,
+    ATTR_OUTAGE_COUNT,
+    ATTR_OUTAGE_TYPE,
+    ATTR_STALE,
+    MAX_DETAILS_ATTRIBUTE,
+    OUTAGE_TYPE_BOTH,
+    OUTAGE_TYPE_NONE,
+    OUTAGE_TYPE_PLANNED,
+    OUTAGE_TYPE_UNKNOWN,
+    OUTAGE_TYPE_UNPLANNED,
+    UPSTREAM_TIMEZONE,
+)
+
+_TZ = ZoneInfo(UPSTREAM_TIMEZONE)
+
+# Outage types restored from storage are mapped back to the constants, so
+# every record and result shares one string object per type
+_OUTAGE_TYPES = {
+    outage_type: outage_type
+    for outage_type in (
+        OUTAGE_TYPE_PLANNED,
+        OUTAGE_TYPE_UNPLANNED,
+        OUTAGE_TYPE_BOTH,
+        OUTAGE_TYPE_NONE,
+        OUTAGE_TYPE_UNKNOWN,
+    )
+}
+
+# 12.10.2026 09:00, 12.10.2026 г. 9:00, 12.10.2026
+_DATETIME_RE = re.compile(
+    r"(\d{1,2})\.(\d{1,2})\.(\d{4})(?:\s*г\.?)?(?:\s*(\d{1,2}):(\d{2}))?"
+)
+
+
+@dataclass(slots=True, frozen=True)
+class OutageRecord:
+    """One outage listed on an upstream page."""
+
+    outage_id: str
+    outage_type: str
+    area: str
+    start: datetime | None = None
+    end: datetime | None = None
+
+    @classmethod
+    def from_cells(cls, outage_type: str, cells: list[str]) -> OutageRecord:
+        """Build a record from the cells of one table row.
+
+        Cells holding dates become the start and end of the outage; all
+        other non-empty cells make up the affected area.
+        """
+        times: list[datetime] = []
+        area: list[str] = []
+        for cell in cells:
+            matches = _DATETIME_RE.findall(cell)
+            if not matches:
+                if cell:
+                    area.append(cell)
+                continue
+            for day, month, year, hour, minute in matches:
+                try:
+                    times.append(
+                        datetime(
+                            int(year),
+                            int(month),
+                            int(day),
+                            int(hour or 0),
+                            int(minute or 0),
+                            tzinfo=_TZ,
+                        )
+                    )
+                except ValueError:
+                    continue
+
+        start = times[0] if times else None
+        end = times[1] if len(times) > 1 else None
+        area_text = ", ".join(area)
+        return cls(
+            outage_id=_outage_id(outage_type, area_text, start),
+            outage_type=outage_type,
+            area=area_text,
+            start=start,
+            end=end,
+        )
+
+    @property
+    def summary(self) -> str:
+        """Return a one-line description for entity attributes."""
+        text = f"{self.outage_type}: {self.area}"
+        if self.start is not None:
+            text += f" ({self.start:%d.%m %H:%M}"
+            if self.end is not None:
+                text += f" - {self.end:%d.%m %H:%M}"
+            text += ")"
+        return text
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable representation."""
+        return {
+            "outage_id": self.outage_id,
+            "outage_type": self.outage_type,
+            "area": self.area,
+            "start": self.start.isoformat() if self.start else None,
+            "end": self.end.isoformat() if self.end else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> OutageRecord:
+        """Restore a record from ``as_dict`` output.
+
+        The id is recomputed, so records cached by older versions get the
+        same id as freshly parsed ones.
+        """
+        start = datetime.fromisoformat(data["start"]) if data["start"] else None
+        outage_type = intern_outage_type(data["outage_type"])
+        return cls(
+            outage_id=_outage_id(outage_type, data["area"], start),
+            outage_type=outage_type,
+            area=data["area"],
+            start=start,
+            end=datetime.fromisoformat(data["end"]) if data["end"] else None,
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class OutageSnapshot:
+    """Published state of one identifier, frozen once per refresh.
+
+    Entities and dashboards read from the snapshot instead of deriving
+    values from the result dict on every access. ``attributes`` is built
+    once and shared by every entity of the identifier. It leaves out the
+    check-time fields, which change on every poll: only the last check
+    sensor publishes those.
+    """
+
+    identifier: str | None
+    has_outage: bool
+    outage_type: str
+    outages: tuple[OutageRecord, ...]
+    last_check: str | None
+    timestamp: str | None
+    stale: bool
+    data_age: int | None
+    attributes: dict[str, Any]
+
+    @classmethod
+    def from_result(
+        cls, data: dict[str, Any], stale: bool, data_age: int | None
+    ) -> OutageSnapshot:
+        """Freeze a coordinator result."""
+        outages = tuple(data.get("outages", ()))
+        identifier = data.get("identifier")
+        has_outage = data.get("has_outage", False)
+        outage_type = intern_outage_type(data.get("outage_type", OUTAGE_TYPE_NONE))
+        last_check = data.get("last_check")
+        timestamp = data.get("timestamp")
+        starts = [outage.start for outage in outages if outage.start is not None]
+        return cls(
+            identifier,
+            has_outage,
+            outage_type,
+            outages,
+            last_check,
+            timestamp,
+            stale,
+            data_age,
+            {
+                ATTR_IDENTIFIER: identifier,
+                ATTR_HAS_OUTAGE: has_outage,
+                ATTR_OUTAGE_TYPE: outage_type,
+                ATTR_OUTAGE_COUNT: len(outages),
+                ATTR_NEXT_OUTAGE_START: min(starts).isoformat() if starts else None,
+                # Capped, so a large incident does not bloat every state object
+                ATTR_DETAILS: data.get("details", [])[:MAX_DETAILS_ATTRIBUTE],
+                ATTR_STALE: stale,
+            },
+        )
+
+
+def intern_outage_type(outage_type: str) -> str:
+    """Return the shared constant for a known outage type."""
+    return _OUTAGE_TYPES.get(outage_type, outage_type)
+
+
+def _outage_id(
+    outage_type: str, area: str, start: datetime | None, ordinal: int = 0
+) -> str:
+    """Return an id that stays the same while the outage is listed.
+
+    The end time is left out: upstream often extends an outage, which
+    updates the record but must not make it a different outage. Rows that
+    still share type, area and start are told apart by ``ordinal`` (see
+    ``number_outages``).
+    """
+    key = f"{outage_type}|{area}|{start}"
+    if ordinal:
+        key = f"{key}|{ordinal}"
+    return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+
+
+def _end_order(outage: OutageRecord) -> tuple[bool, float]:
+    """Sort key putting outages without an end first, then by end."""
+    return (outage.end is not None, outage.end.timestamp() if outage.end else 0.0)
+
+
+def number_outages(outages: list[OutageRecord]) -> list[OutageRecord]:
+    """Return the outages of one page with unique ids.
+
+    Rows that differ only in their end time get the same id from
+    ``_outage_id``. Within such a group the rows are numbered by end time,
+    not by their position on the page, so a reordered page keeps the ids.
+    The first row keeps the plain id.
+    """
+    groups: dict[str, list[int]] = {}
+    for position, outage in enumerate(outages):
+        groups.setdefault(outage.outage_id, []).append(position)
+    if len(groups) == len(outages):
+        return outages
+
+    numbered = list(outages)
+    for positions in groups.values():
+        positions.sort(key=lambda position: _end_order(outages[position]))
+        for ordinal, position in enumerate(positions[1:], 1):
+            outage = outages[position]
+            numbered[position] = replace(
+                outage,
+                outage_id=_outage_id(
+                    outage.outage_type, outage.area, outage.start, ordinal
+                ),
+            )
+    return numbered
+
+
+def encode_result(data: dict[str, Any]) -> dict[str, Any]:
+    """Return a coordinator result with records converted to dicts."""
+    return {**data, "outages": [record.as_dict() for record in data.get("outages", [])]}
+
+
+def decode_result(data: dict[str, Any]) -> dict[str, Any]:
+    """Restore a coordinator result stored with ``encode_result``."""
+    return {
+        **data,
+        "outage_type": intern_outage_type(data.get("outage_type", OUTAGE_TYPE_NONE)),
+        "outages": number_outages(
+            [OutageRecord.from_dict(item) for item in data.get("outages", [])]
+        ),
+    }
@@ -0,0 +1,333 @@
+"""HTML parsers for ERM West outage pages.
+
+Two engines produce the same result dict:
+
+* ``lxml`` (default) streams the page through an lxml parser target in a
+  single pass. No document tree is built, and every text node is lowercased
+  once.
+* ``soup`` is the original BeautifulSoup implementation, kept as a
+  reference and fallback.
+
+``OutagePageFeed`` runs the ``lxml`` engine incrementally on a page that
+arrives in chunks.
+
+``lxml`` and ``bs4`` are imported by the engines themselves, so loading the
+integration does not pay for them. The first parse imports the engine on
+the parse executor, off the event loop.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+from typing import Any
+
+from .const import (
+    OUTAGE_TYPE_BOTH,
+    OUTAGE_TYPE_NONE,
+    OUTAGE_TYPE_PLANNED,
+    OUTAGE_TYPE_UNPLANNED,
+    PARSER_ENGINE_LXML,
+    PARSER_ENGINE_SOUP,
+)
+from .models import OutageRecord, number_outages
+
+_LOGGER = logging.getLogger(__name__)
+
+NO_OUTAGE_MARKERS = (
+    "няма регистрирано",
+    "няма планирано",
+    "няма непланирано",
+    "не са регистрирани",
+)
+UNPLANNED_MARKER = "непланиран"
+PLANNED_MARKER = "планиран"
+
+# Rows shorter than this are layout noise, not outage details
+MIN_DETAIL_LENGTH = 6
+
+
+# A table row: section outage type, cell texts
+Row = tuple[str, list[str]]
+
+
+class _OpenRow:
+    """A ``<tr>`` whose end tag has not been seen yet."""
+
+    __slots__ = ("cells", "has_td", "slots")
+
+    def __init__(self, slots: list[list[Any]]) -> None:
+        """Initialize the row."""
+        self.cells: list[list[str]] = []
+        self.has_td = False
+        # One [section, cells] slot per enclosing table, reserved in
+        # document order and filled when the row ends
+        self.slots = slots
+
+
+class OutagePageTarget:
+    """lxml parser target that classifies markers and collects table rows.
+
+    Rows and cells are collected the way the BeautifulSoup engine finds
+    them with recursive ``find_all``: a row belongs to every table that
+    encloses it, and a cell to every row that encloses it. Nested tables
+    therefore give the same rows from both engines.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the target."""
+        self.no_outage = False
+        self.planned = False
+        self.unplanned = False
+        self._section = OUTAGE_TYPE_UNPLANNED
+        self._text: list[str] = []
+        self._tables: list[list[list[Any]]] = []
+        self._open_tables: list[tuple[str, list[list[Any]]]] = []
+        self._open_rows: list[_OpenRow] = []
+        self._open_cells: list[list[str]] = []
+
+    def start(self, tag: str, attrib: dict[str, str]) -> None:  # noqa: ARG002
+        """Handle an opening tag."""
+        self._flush_text()
+        if tag == "table":
+            slots: list[list[Any]] = []
+            self._tables.append(slots)
+            self._open_tables.append((self._section, slots))
+        elif tag == "tr" and self._open_tables:
+            row_slots = []
+            for section, table_slots in self._open_tables:
+                slot = [section, None]
+                table_slots.append(slot)
+                row_slots.append(slot)
+            self._open_rows.append(_OpenRow(row_slots))
+        elif tag in ("td", "th") and self._open_rows:
+            cell: list[str] = []
+            for row in self._open_rows:
+                row.cells.append(cell)
+                row.has_td = row.has_td or tag == "td"
+            self._open_cells.append(cell)
+
+    def end(self, tag: str) -> None:
+        """Handle a closing tag."""
+        self._flush_text()
+        if tag == "table":
+            if self._open_tables:
+                self._open_tables.pop()
+        elif tag == "tr" and self._open_rows:
+            row = self._open_rows.pop()
+            if row.has_td:
+                cells = ["".join(cell) for cell in row.cells]
+                for slot in row.slots:
+                    slot[1] = cells
+        elif tag in ("td", "th") and self._open_cells:
+            self._open_cells.pop()
+
+    def data(self, data: str) -> None:
+        """Buffer text; lxml may deliver one text node in several pieces."""
+        self._text.append(data)
+
+    def comment(self, text: str) -> None:
+        """Classify comments like text nodes, as BeautifulSoup does."""
+        self._flush_text()
+        self._classify(text)
+
+    def close(self) -> OutagePageTarget:
+        """Finish parsing and return the target itself."""
+        self._flush_text()
+        return self
+
+    @property
+    def rows(self) -> list[Row]:
+        """Return the collected data rows in table order."""
+        return [
+            (section, cells)
+            for slots in self._tables
+            for section, cells in slots
+            if cells is not None
+        ]
+
+    def _flush_text(self) -> None:
+        """Process the buffered text node."""
+        if not self._text:
+            return
+        text = "".join(self._text)
+        self._text.clear()
+        self._classify(text)
+        if self._open_cells and (stripped := text.strip()):
+            for cell in self._open_cells:
+                cell.append(stripped)
+
+    def _classify(self, text: str) -> None:
+        """Check one text node against the outage markers."""
+        lowered = text.lower()
+        if any(marker in lowered for marker in NO_OUTAGE_MARKERS):
+            self.no_outage = True
+        if UNPLANNED_MARKER in lowered:
+            self.unplanned = True
+            self._section = OUTAGE_TYPE_UNPLANNED
+        elif PLANNED_MARKER in lowered:
+            self.planned = True
+            self._section = OUTAGE_TYPE_PLANNED
+
+
+def _classify_lxml(html: str) -> tuple[bool, bool, bool, list[Row]]:
+    """Classify a page in a single streaming pass."""
+    from lxml import etree  # pylint: disable=import-outside-toplevel
+
+    target = OutagePageTarget()
+    parser = etree.HTMLParser(target=target)
+    parser.feed(html)
+    parser.close()
+    return target.no_outage, target.planned, target.unplanned, target.rows
+
+
+class OutagePageFeed:
+    """Incremental ``lxml`` parse of a page delivered in chunks."""
+
+    def __init__(self, identifier: str, encoding: str | None = None) -> None:
+        """Initialize the feed.
+
+        Without an ``encoding`` lxml looks for a meta tag in the page.
+        """
+        from lxml import etree  # pylint: disable=import-outside-toplevel
+
+        self.identifier = identifier
+        self._target = OutagePageTarget()
+        self._parser = etree.HTMLParser(target=self._target, encoding=encoding)
+        self._fed = False
+
+    def feed(self, chunk: bytes) -> bool:
+        """Parse the next chunk.
+
+        Returns True once a no-outage marker was seen: such a page reports
+        no outage whatever follows, so the rest need not be parsed.
+        """
+        if chunk:
+            self._parser.feed(chunk)
+            self._fed = True
+        return self._target.no_outage
+
+    def close(self) -> dict[str, Any]:
+        """Finish parsing and return the result dict."""
+        if self._fed:
+            # lxml refuses to close a parser that was never fed
+            self._parser.close()
+        target = self._target
+        return _build_result(
+            self.identifier,
+            PARSER_ENGINE_LXML,
+            target.no_outage,
+            target.planned,
+            target.unplanned,
+            target.rows,
+        )
+
+
+def _section_of(table: Any) -> str:
+    """Return the outage type announced by the last marker before a table."""
+    for text in table.find_all_previous(string=True):
+        lowered = text.lower()
+        if UNPLANNED_MARKER in lowered:
+            return OUTAGE_TYPE_UNPLANNED
+        if PLANNED_MARKER in lowered:
+            return OUTAGE_TYPE_PLANNED
+    return OUTAGE_TYPE_UNPLANNED
+
+
+def _classify_soup(html: str) -> tuple[bool, bool, bool, list[Row]]:
+    """Classify a page with BeautifulSoup."""
+    from bs4 import BeautifulSoup  # pylint: disable=import-outside-toplevel
+
+    soup = BeautifulSoup(html, "lxml")
+    no_outage = planned = unplanned = False
+    for text in soup.find_all(string=True):
+        lowered = text.lower()
+        if any(marker in lowered for marker in NO_OUTAGE_MARKERS):
+            no_outage = True
+        if UNPLANNED_MARKER in lowered:
+            unplanned = True
+        elif PLANNED_MARKER in lowered:
+            planned = True
+
+    rows: list[Row] = []
+    for table in soup.find_all("table"):
+        section = _section_of(table)
+        for row in table.find_all("tr"):
+            if row.find("td") is None:
+                continue
+            cells = row.find_all(["td", "th"])
+            rows.append((section, [cell.get_text(strip=True) for cell in cells]))
+
+    return no_outage, planned, unplanned, rows
+
+
+ENGINES = {
+    PARSER_ENGINE_LXML: _classify_lxml,
+    PARSER_ENGINE_SOUP: _classify_soup,
+}
+
+
+def check_time_fields() -> dict[str, str]:
+    """Return the check-time bookkeeping fields of a result."""
+    now = datetime.now()
+    return {
+        "timestamp": now.isoformat(),
+        "last_check": now.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def parse_outage_html(
+    html: str, identifier: str, engine: str = PARSER_ENGINE_LXML
+) -> dict[str, Any]:
+    """Parse an ERM West page into the coordinator result dict."""
+    return _build_result(identifier, engine, *ENGINES[engine](html))
+
+
+def _build_result(
+    identifier: str,
+    engine: str,
+    no_outage: bool,
+    planned: bool,
+    unplanned: bool,
+    rows: list[Row],
+) -> dict[str, Any]:
+    """Build the coordinator result dict from a classified page."""
+    # По подразбиране предполагаме, че има проблем
+    result: dict[str, Any] = {
+        "identifier": identifier,
+        "has_outage": True,
+        "outage_type": OUTAGE_TYPE_UNPLANNED,
+        "outages": [],
+        "details": [],
+        **check_time_fields(),
+    }
+
+    if no_outage:
+        # Ако има съобщение "няма регистрирано", значи всичко е ОК
+        result["has_outage"] = False
+        result["outage_type"] = OUTAGE_TYPE_NONE
+    else:
+        if unplanned and planned:
+            result["outage_type"] = OUTAGE_TYPE_BOTH
+        elif planned:
+            result["outage_type"] = OUTAGE_TYPE_PLANNED
+        else:
+            result["outage_type"] = OUTAGE_TYPE_UNPLANNED
+        outages = number_outages(
+            [
+                OutageRecord.from_cells(section, cells)
+                for section, cells in rows
+                if len(" ".join(cells)) >= MIN_DETAIL_LENGTH
+            ]
+        )
+        result["outages"] = outages
+        result["details"] = [outage.summary for outage in outages]
+
+    _LOGGER.debug(
+        "Parsed page for %s with %s engine: has_outage=%s, type=%s",
+        identifier,
+        engine,
+        result["has_outage"],
+        result["outage_type"],
+    )
+
+    return result
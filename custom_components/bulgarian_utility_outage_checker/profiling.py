@@ -0,0 +1,176 @@
+"""On-demand profiling of the refresh pipeline."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import cProfile
+from datetime import timedelta
+import logging
+import pstats
+import time
+from typing import TYPE_CHECKING, Any, TypeVar
+
+import async_timeout
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.util.dt as dt_util
+
+from .const import DATA_PROFILER, DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import BulgarianUtilityOutageCoordinator
+    from .slices import IdentifierSlice
+
+_T = TypeVar("_T")
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RefreshProfiler:
+    """cProfile session covering a few refresh cycles.
+
+    The event loop thread is profiled while the cycles run: fetching,
+    waiting for the parse executor and everything else Home Assistant
+    runs on the loop meanwhile. Parse jobs get their own profile in the
+    worker thread that runs them (see ``wrap``), merged into the result.
+    Nothing is hooked while no session is running.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the session."""
+        self._loop_profile = cProfile.Profile()
+        self._job_profiles: list[cProfile.Profile] = []
+
+    def enable(self) -> None:
+        """Start profiling the calling thread."""
+        try:
+            self._loop_profile.enable()
+        except ValueError as err:
+            # Another profiler (e.g. the profiler integration) is running
+            raise HomeAssistantError(f"Cannot start profiling: {err}") from err
+
+    def disable(self) -> None:
+        """Stop profiling the calling thread."""
+        self._loop_profile.disable()
+
+    def wrap(self, func: Callable[..., _T]) -> Callable[..., _T]:
+        """Return ``func`` profiled in the thread that runs it."""
+
+        def _profiled(*args: Any) -> _T:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Python 3.12+ allows one profiler per interpreter, and the
+                # loop profile already covers every thread
+                return func(*args)
+            try:
+                return func(*args)
+            finally:
+                profile.disable()
+                self._job_profiles.append(profile)
+
+        return _profiled
+
+    def write(self, path: str, top: int) -> list[dict[str, Any]]:
+        """Dump the merged stats to ``path`` and return the top functions.
+
+        Blocking; run in an executor.
+        """
+        stats = pstats.Stats(self._loop_profile)
+        for profile in self._job_profiles:
+            stats.add(profile)
+        stats.dump_stats(path)
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+        return [
+            {
+                "function": pstats.func_std_string(func),
+                "calls": calls,
+                "own_time": round(own_time, 6),
+                "cumulative_time": round(cumulative_time, 6),
+            }
+            for func, (_, calls, own_time, cumulative_time, _) in rows[:top]
+        ]
+
+
+async def async_profile_refresh(
+    hass: HomeAssistant,
+    slices: list[IdentifierSlice],
+    cycles: int,
+    top: int,
+    timeout: timedelta,
+) -> dict[str, Any]:
+    """Profile the next ``cycles`` scheduled refreshes of identifiers.
+
+    Nothing is refreshed early: every identifier keeps its own schedule and
+    the scheduler's rate limits, so the profile shows normal operation.
+    The session ends once each identifier was refreshed ``cycles`` times,
+    or after ``timeout``. The stats are written under the config directory
+    and the ``top`` functions by cumulative time are returned.
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if domain_data.get(DATA_PROFILER) is not None:
+        raise HomeAssistantError("A profiling run is already in progress")
+    if not slices:
+        raise HomeAssistantError("No identifiers selected for profiling")
+
+    # A coordinator notifies its listeners once every identifier it
+    # refreshed has finished, so refreshes are counted per coordinator
+    seen = {slice_: slice_.version for slice_ in slices}
+    refreshes = dict.fromkeys(slices, 0)
+    done = asyncio.Event()
+
+    def _count_refreshes(
+        coordinator: BulgarianUtilityOutageCoordinator,
+    ) -> CALLBACK_TYPE:
+        @callback
+        def _async_count() -> None:
+            for slice_, version in seen.items():
+                if slice_.coordinator is coordinator and slice_.version != version:
+                    refreshes[slice_] += slice_.version - version
+                    seen[slice_] = slice_.version
+            if min(refreshes.values()) >= cycles:
+                done.set()
+
+        return _async_count
+
+    # All coordinators share the domain scheduler and its parse executor
+    executor = slices[0].coordinator.scheduler.parse_executor
+    profiler = domain_data[DATA_PROFILER] = RefreshProfiler()
+    executor.profiler = profiler
+    unsubscribers = [
+        coordinator.async_add_listener(_count_refreshes(coordinator))
+        for coordinator in {slice_.coordinator for slice_ in slices}
+    ]
+    _LOGGER.info(
+        "Profiling the next %d refresh cycles of %d identifiers", cycles, len(slices)
+    )
+    started = time.monotonic()
+    try:
+        profiler.enable()
+        try:
+            async with async_timeout.timeout(timeout.total_seconds()):
+                await done.wait()
+        except asyncio.TimeoutError:
+            _LOGGER.info("Profiling stopped after %s", timeout)
+        finally:
+            profiler.disable()
+    finally:
+        for unsubscribe in unsubscribers:
+            unsubscribe()
+        executor.profiler = None
+        domain_data.pop(DATA_PROFILER)
+    duration = time.monotonic() - started
+
+    path = hass.config.path(
+        f"{DOMAIN}_profile_{dt_util.utcnow():%Y%m%d_%H%M%S}.prof"
+    )
+    functions = await hass.async_add_executor_job(profiler.write, path, top)
+    _LOGGER.info("Wrote refresh profile to %s", path)
+    return {
+        "file": path,
+        "cycles": {slice_.identifier: count for slice_, count in refreshes.items()},
+        "duration": round(duration, 3),
+        "functions": functions,
+    }
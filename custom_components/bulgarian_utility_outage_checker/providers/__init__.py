@@ -0,0 +1,113 @@
+"""Upstream providers for Bulgarian Utility Outage Checker.
+
+Each provider describes how to query one utility's outage page and how to
+parse it into the coordinator result dict. The shared client, scheduler
+and coordinator pipeline stay provider-agnostic: adding a utility means
+adding a module here that registers an ``OutageProvider`` subclass.
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from ..const import STREAM_CHUNK_SIZE
+
+
+class FeedParser(Protocol):
+    """Incremental page parser fed the raw body chunk by chunk."""
+
+    def feed(self, chunk: bytes) -> bool:
+        """Parse a chunk; return True if the rest of the page is irrelevant."""
+
+    def close(self) -> dict[str, Any]:
+        """Finish parsing and return the coordinator result dict."""
+
+
+@dataclass(frozen=True, slots=True)
+class ProviderCapabilities:
+    """What an upstream supports and how hard it may be queried."""
+
+    # The upstream honours If-None-Match / If-Modified-Since
+    supports_conditional_get: bool = False
+    # ``create_feed_parser`` can parse the page chunk by chunk
+    supports_streaming_parse: bool = False
+    max_concurrency: int = 4
+    requests_per_second: float = 2.0
+
+
+class _BufferedFeedParser:
+    """Feed parser that collects the chunks and parses the page at the end."""
+
+    def __init__(
+        self, provider: OutageProvider, identifier: str, encoding: str | None
+    ) -> None:
+        """Initialize the parser."""
+        self._provider = provider
+        self._identifier = identifier
+        self._encoding = encoding
+        self._chunks: list[bytes] = []
+
+    def feed(self, chunk: bytes) -> bool:
+        """Collect a chunk; the whole page is needed."""
+        self._chunks.append(chunk)
+        return False
+
+    def close(self) -> dict[str, Any]:
+        """Decode the collected page like a buffered fetch and parse it."""
+        # pylint: disable-next=import-outside-toplevel
+        from ..client import _body_encoding
+
+        page = b"".join(self._chunks)
+        body = page.decode(_body_encoding(self._encoding, page[:STREAM_CHUNK_SIZE]), errors="replace")
+        return self._provider.parse(body, self._identifier)
+
+
+class OutageProvider(ABC):
+    """Base class for upstream outage providers."""
+
+    key: str
+    name: str
+    url: str
+    capabilities = ProviderCapabilities()
+
+    @abstractmethod
+    def request_params(self, identifier: str) -> dict[str, str]:
+        """Return the query parameters for an identifier."""
+
+    @abstractmethod
+    def parse(self, body: str, identifier: str) -> dict[str, Any]:
+        """Parse a page into the coordinator result dict.
+
+        Runs in an executor, so it must be blocking-safe and must not touch
+        Home Assistant state.
+        """
+
+    def create_feed_parser(
+        self, identifier: str, encoding: str | None
+    ) -> FeedParser:
+        """Return an incremental parser for a page in ``encoding``.
+
+        Only called if ``supports_streaming_parse`` is set. Like ``parse``
+        it runs in an executor. The default collects the page and hands it
+        to ``parse`` once complete.
+        """
+        return _BufferedFeedParser(self, identifier, encoding)
+
+
+PROVIDER_REGISTRY: dict[str, OutageProvider] = {}
+
+
+def register_provider(cls: type[OutageProvider]) -> type[OutageProvider]:
+    """Class decorator adding a provider to the registry."""
+    PROVIDER_REGISTRY[cls.key] = cls()
+    return cls
+
+
+def get_provider(key: str) -> OutageProvider:
+    """Return the registered provider for a config entry's provider key."""
+    return PROVIDER_REGISTRY[key]
+
+
+# Import provider modules so they register themselves
+from . import erm_west  # noqa: E402, F401
@@ -0,0 +1,46 @@
+"""ERM West (Енергохолд) electricity outage provider."""
+from __future__ import annotations
+
+from typing import Any
+
+from ..const import (
+    ERM_WEST_URL,
+    PARSER_ENGINE,
+    PARSER_ENGINE_LXML,
+    PROVIDER_ENERGOHOLD,
+    PROVIDERS,
+)
+from ..parser import OutagePageFeed, parse_outage_html
+from . import OutageProvider, ProviderCapabilities, register_provider
+
+
+@register_provider
+class ErmWestProvider(OutageProvider):
+    """Provider for info.ermzapad.bg."""
+
+    key = PROVIDER_ENERGOHOLD
+    name = PROVIDERS[PROVIDER_ENERGOHOLD]
+    url = ERM_WEST_URL
+    capabilities = ProviderCapabilities(
+        supports_conditional_get=True,
+        supports_streaming_parse=PARSER_ENGINE == PARSER_ENGINE_LXML,
+        max_concurrency=4,
+        requests_per_second=2.0,
+    )
+
+    def request_params(self, identifier: str) -> dict[str, str]:
+        """Return the search form parameters."""
+        return {
+            "submit": "Търсене",
+            "key": identifier,
+        }
+
+    def parse(self, body: str, identifier: str) -> dict[str, Any]:
+        """Parse an avplan.php result page."""
+        return parse_outage_html(body, identifier, PARSER_ENGINE)
+
+    def create_feed_parser(
+        self, identifier: str, encoding: str | None
+    ) -> OutagePageFeed:
+        """Return an incremental lxml parser for an avplan.php page."""
+        return OutagePageFeed(identifier, encoding)
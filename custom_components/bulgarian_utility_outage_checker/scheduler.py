@@ -0,0 +1,352 @@
+"""Domain-level fetch scheduler for Bulgarian Utility Outage Checker."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+import logging
+import time
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+import aiohttp
+import async_timeout
+from yarl import URL
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+import homeassistant.util.dt as dt_util
+
+from .breaker import CircuitBreaker
+from .client import (
+    BodyTooLargeError,
+    FetchResult,
+    OutageHttpClient,
+    async_get_client,
+    async_release_client,
+)
+from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_MAX_RESET_TIMEOUT,
+    BREAKER_RESET_TIMEOUT,
+    CHECK_NOW_MIN_GAP,
+    DATA_SCHEDULER,
+    DOMAIN,
+    FETCH_TIMEOUT,
+    PARSE_MAX_QUEUE,
+    PARSE_STREAMING,
+    PARSE_USE_PROCESSES,
+    PARSE_WORKERS,
+    SCHEDULER_TICK,
+)
+
+from .executor import ParseExecutor, StreamingParse
+from .providers import OutageProvider
+from .stats import STAGE_SLOT_WAIT
+
+if TYPE_CHECKING:
+    from .coordinator import BulgarianUtilityOutageCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Spread requests evenly so that at most ``rate`` start per second."""
+
+    def __init__(self, rate: float) -> None:
+        """Initialize the limiter."""
+        self._interval = 1 / rate
+        self._next_slot = 0.0
+
+    async def acquire(self) -> None:
+        """Wait for the next free request slot."""
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self._interval
+        if (delay := slot - now) > 0:
+            await asyncio.sleep(delay)
+
+
+class OutageFetchScheduler:
+    """Drive all coordinators from one timer with shared request budgets.
+
+    Coordinators do not run their own update timers. Every tick the
+    scheduler refreshes the coordinators that are due. Requests to each
+    provider share one concurrency limit and one rate limiter, sized from
+    that provider's declared capabilities. Each upstream host has a
+    circuit breaker, so an outage of the site costs a handful of timed-out
+    requests instead of one per identifier. The scheduler also owns the
+    parse executor that all coordinators share.
+    """
+
+    def __init__(self, hass: HomeAssistant, client: OutageHttpClient) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.client = client
+        self.users = 0
+        self._coordinators: set[BulgarianUtilityOutageCoordinator] = set()
+        self._budgets: dict[str, tuple[asyncio.Semaphore, RateLimiter]] = {}
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self.parse_executor = ParseExecutor(
+            PARSE_WORKERS, PARSE_MAX_QUEUE, PARSE_USE_PROCESSES
+        )
+        self._cycle_task: asyncio.Task | None = None
+        self._inflight: dict[tuple[str, str], asyncio.Task[FetchResult]] = {}
+        self._manual_refreshes: dict[tuple[str, str], asyncio.Task[None]] = {}
+        self._last_fetch: dict[tuple[str, str], float] = {}
+        self._unsub_tick: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_add_coordinator(
+        self, coordinator: BulgarianUtilityOutageCoordinator
+    ) -> None:
+        """Start scheduling refreshes for a coordinator."""
+        self._coordinators.add(coordinator)
+        if self._unsub_tick is None:
+            self._unsub_tick = async_track_time_interval(
+                self.hass, self._async_tick, SCHEDULER_TICK
+            )
+
+    @callback
+    def async_remove_coordinator(
+        self, coordinator: BulgarianUtilityOutageCoordinator
+    ) -> None:
+        """Stop scheduling refreshes for a coordinator."""
+        self._coordinators.discard(coordinator)
+
+    def _budget(self, provider: OutageProvider) -> tuple[asyncio.Semaphore, RateLimiter]:
+        """Return the concurrency limit and rate limiter of a provider."""
+        if (budget := self._budgets.get(provider.key)) is None:
+            budget = self._budgets[provider.key] = (
+                asyncio.Semaphore(provider.capabilities.max_concurrency),
+                RateLimiter(provider.capabilities.requests_per_second),
+            )
+        return budget
+
+    def _breaker(self, provider: OutageProvider) -> CircuitBreaker:
+        """Return the circuit breaker of the host a provider is fetched from."""
+        host = URL(self.client.base_url or provider.url).host or provider.key
+        if (breaker := self.breakers.get(host)) is None:
+            breaker = self.breakers[host] = CircuitBreaker(
+                host,
+                BREAKER_FAILURE_THRESHOLD,
+                BREAKER_RESET_TIMEOUT,
+                BREAKER_MAX_RESET_TIMEOUT,
+            )
+        return breaker
+
+    def streams(self, provider: OutageProvider) -> bool:
+        """Return True if pages of a provider can be parsed while downloading."""
+        return (
+            PARSE_STREAMING
+            and provider.capabilities.supports_streaming_parse
+            and not self.parse_executor.use_processes
+        )
+
+    async def async_fetch(
+        self,
+        provider: OutageProvider,
+        identifier: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        timings: SimpleNamespace | None = None,
+        stream: bool = False,
+    ) -> FetchResult:
+        """Fetch a page within the provider's concurrency and rate budget.
+
+        Concurrent fetches of the same identifier share one upstream request.
+        With ``stream``, pages of providers that support it are parsed
+        during the download (see ``streams``) and the result carries parsed
+        data instead of a body. Callers that may skip the parse of an
+        unchanged page should not stream.
+        """
+        key = (provider.key, identifier)
+        if (task := self._inflight.get(key)) is None:
+            task = self.hass.async_create_task(
+                self._async_fetch(
+                    provider, identifier, etag, last_modified, timings, stream
+                )
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _async_fetch(
+        self,
+        provider: OutageProvider,
+        identifier: str,
+        etag: str | None,
+        last_modified: str | None,
+        timings: SimpleNamespace | None,
+        stream: bool,
+    ) -> FetchResult:
+        """Download a page, parsing it on the way if requested.
+
+        The parse runs next to the download but is awaited only after it:
+        waiting for the parse executor never counts against the fetch
+        timeout or holds a concurrency slot.
+        """
+        if not (stream and self.streams(provider)):
+            return await self._async_download(
+                provider, identifier, etag, last_modified, timings, None
+            )
+
+        parse = StreamingParse(self.parse_executor, provider, identifier)
+        parsing = self.hass.async_create_task(parse.async_parse())
+        try:
+            result = await self._async_download(
+                provider, identifier, etag, last_modified, timings, parse
+            )
+        except BaseException:
+            parsing.cancel()
+            raise
+        # A 304 has no page to parse
+        parse.abort()
+        result.data = await parsing
+        result.queue_wait = parse.queue_wait
+        result.parse_time = parse.parse_time
+        return result
+
+    async def _async_download(
+        self,
+        provider: OutageProvider,
+        identifier: str,
+        etag: str | None,
+        last_modified: str | None,
+        timings: SimpleNamespace | None,
+        stream: StreamingParse | None,
+    ) -> FetchResult:
+        """Perform one upstream request once a slot is free.
+
+        Raises ``CircuitOpenError`` without a request while the host's
+        circuit is open.
+        """
+        semaphore, rate_limiter = self._budget(provider)
+        breaker = self._breaker(provider)
+        queued = time.monotonic()
+        async with semaphore:
+            breaker.before_request()
+            # None: the outcome says nothing about the host
+            reachable: bool | None = None
+            try:
+                await rate_limiter.acquire()
+                if timings is not None:
+                    setattr(timings, STAGE_SLOT_WAIT, time.monotonic() - queued)
+                async with async_timeout.timeout(FETCH_TIMEOUT):
+                    result = await self.client.async_fetch(
+                        provider, identifier, etag, last_modified, timings, stream
+                    )
+                reachable = True
+                return result
+            except aiohttp.ClientResponseError as err:
+                # The host answered; only server errors count as down
+                reachable = err.status < 500
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                reachable = False
+                raise
+            except BodyTooLargeError:
+                reachable = True
+                raise
+            finally:
+                if reachable is None:
+                    breaker.cancel_probe()
+                elif reachable:
+                    breaker.record_success()
+                else:
+                    breaker.record_failure()
+                self._last_fetch[(provider.key, identifier)] = (
+                    asyncio.get_running_loop().time()
+                )
+
+    async def async_request_refresh(
+        self, coordinator: BulgarianUtilityOutageCoordinator, identifier: str
+    ) -> None:
+        """Refresh an identifier on demand, coalescing repeated requests.
+
+        Requests for an identifier that is already being refreshed wait for
+        that refresh. Requests within ``CHECK_NOW_MIN_GAP`` seconds of the
+        last upstream fetch are dropped.
+        """
+        key = (coordinator.provider.key, identifier)
+        if (task := self._manual_refreshes.get(key)) is not None:
+            await asyncio.shield(task)
+            return
+
+        last_fetch = self._last_fetch.get(key)
+        now = asyncio.get_running_loop().time()
+        if last_fetch is not None and now - last_fetch < CHECK_NOW_MIN_GAP:
+            _LOGGER.debug(
+                "Skipping check_now for %s, fetched %.0f seconds ago",
+                identifier,
+                now - last_fetch,
+            )
+            return
+
+        task = self.hass.async_create_task(
+            coordinator.async_refresh_identifier(identifier)
+        )
+        self._manual_refreshes[key] = task
+        try:
+            await asyncio.shield(task)
+        finally:
+            self._manual_refreshes.pop(key, None)
+
+    @callback
+    def _async_tick(self, now: datetime) -> None:
+        """Start a fetch cycle unless the previous one is still running."""
+        if self._cycle_task is not None and not self._cycle_task.done():
+            _LOGGER.debug("Previous fetch cycle still running, skipping tick")
+            return
+        self._cycle_task = self.hass.async_create_background_task(
+            self._async_run_cycle(), f"{DOMAIN} fetch cycle"
+        )
+
+    async def _async_run_cycle(self) -> None:
+        """Refresh every coordinator that is due."""
+        now = dt_util.utcnow()
+        due = [
+            coordinator
+            for coordinator in self._coordinators
+            if coordinator.is_due(now)
+        ]
+        if not due:
+            return
+
+        _LOGGER.debug("Fetch cycle started for %d identifiers", len(due))
+        await asyncio.gather(*(coordinator.async_refresh() for coordinator in due))
+
+    async def async_shutdown(self) -> None:
+        """Cancel the timer and any running cycle."""
+        if self._unsub_tick is not None:
+            self._unsub_tick()
+            self._unsub_tick = None
+        if self._cycle_task is not None and not self._cycle_task.done():
+            self._cycle_task.cancel()
+        self._coordinators.clear()
+        self.parse_executor.shutdown()
+
+
+def async_get_scheduler(hass: HomeAssistant) -> OutageFetchScheduler:
+    """Return the shared scheduler, creating it for the first user."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    scheduler: OutageFetchScheduler | None = domain_data.get(DATA_SCHEDULER)
+    if scheduler is None:
+        scheduler = domain_data[DATA_SCHEDULER] = OutageFetchScheduler(
+            hass, async_get_client(hass)
+        )
+    scheduler.users += 1
+    return scheduler
+
+
+async def async_release_scheduler(hass: HomeAssistant) -> None:
+    """Release one reference and shut down when the last user leaves."""
+    domain_data = hass.data.get(DOMAIN, {})
+    scheduler: OutageFetchScheduler | None = domain_data.get(DATA_SCHEDULER)
+    if scheduler is None:
+        return
+
+    scheduler.users -= 1
+    if scheduler.users <= 0:
+        domain_data.pop(DATA_SCHEDULER)
+        await scheduler.async_shutdown()
+        await async_release_client(hass)
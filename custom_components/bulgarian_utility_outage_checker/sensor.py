@@ -6,23 +6,20 @@ from typing import Any
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
-    ATTR_DETAILS,
-    ATTR_HAS_OUTAGE,
-    ATTR_IDENTIFIER,
-    ATTR_LAST_CHECK,
-    ATTR_OUTAGE_TYPE,
+    ATTR_DATA_AGE,
     ATTR_TIMESTAMP,
-    CONF_IDENTIFIER,
     DOMAIN,
-    OUTAGE_TYPE_NONE,
+    LAST_CHECK_UNRECORDED_ATTRIBUTES,
+    NEXT_CHECK_UNRECORDED_ATTRIBUTES,
+    OUTAGE_TYPE_UNKNOWN,
+    STATUS_UNRECORDED_ATTRIBUTES,
 )
 from .coordinator import BulgarianUtilityOutageCoordinator
+from .entity import OutageEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,171 +32,119 @@ async def async_setup_entry(
     """Set up the sensor platform."""
     coordinator: BulgarianUtilityOutageCoordinator = hass.data[DOMAIN][entry.entry_id]
 
+    # Data is already loaded (restored or first refresh) before platforms
+    # are set up, so entities are added without an extra refresh
     async_add_entities(
-        [
-            UtilityOutageStatusSensor(coordinator, entry),
-            LastCheckSensor(coordinator, entry),
-            NextCheckSensor(coordinator, entry),
-        ],
-        True,
+        entity
+        for identifier in coordinator.identifiers
+        for entity in (
+            UtilityOutageStatusSensor(coordinator, identifier),
+            LastCheckSensor(coordinator, identifier),
+            NextCheckSensor(coordinator, identifier),
+        )
     )
 
 
-class UtilityOutageStatusSensor(
-    CoordinatorEntity[BulgarianUtilityOutageCoordinator], SensorEntity
-):
+class OutageSensorEntity(OutageEntity, SensorEntity):
+    """Sensor bound to one identifier."""
+
+    def _state_value(self) -> Any:
+        """Return the native value."""
+        return self.native_value
+
+
+class UtilityOutageStatusSensor(OutageSensorEntity):
     """Sensor for utility outage status."""
 
-    _attr_has_entity_name = True
     _attr_icon = "mdi:transmission-tower"
+    _unrecorded_attributes = STATUS_UNRECORDED_ATTRIBUTES
 
     def __init__(
         self,
         coordinator: BulgarianUtilityOutageCoordinator,
-        entry: ConfigEntry,
+        identifier: str,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._identifier = entry.data[CONF_IDENTIFIER]
-        self._attr_unique_id = f"{entry.entry_id}_status"
+        super().__init__(coordinator, identifier, "status")
         self._attr_name = "Status"
-        
-        # Device info for grouping entities
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, entry.entry_id)},
-            name=f"Bulgarian Utility Outage Checker - {self._identifier}",
-            manufacturer="ERM West",
-            model="Outage Checker",
-        )
 
-    @property
-    def native_value(self) -> str:
-        """Return the state of the sensor."""
-        if self.coordinator.data:
-            if self.coordinator.data.get("has_outage"):
-                return self.coordinator.data.get("outage_type", "Unknown")
-            return "Няма аварии"
-        return "Unknown"
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return the state attributes."""
-        if not self.coordinator.data:
-            return {}
-
-        return {
-            ATTR_IDENTIFIER: self.coordinator.data.get("identifier"),
-            ATTR_HAS_OUTAGE: self.coordinator.data.get("has_outage", False),
-            ATTR_OUTAGE_TYPE: self.coordinator.data.get("outage_type", OUTAGE_TYPE_NONE),
-            ATTR_DETAILS: self.coordinator.data.get("details", []),
-            ATTR_LAST_CHECK: self.coordinator.data.get("last_check"),
-            ATTR_TIMESTAMP: self.coordinator.data.get("timestamp"),
-        }
+    @callback
+    def _update_attrs(self) -> None:
+        """Recompute the state and attributes from the slice's snapshot."""
+        super()._update_attrs()
+        if (snapshot := self.slice.snapshot) is None:
+            self._attr_native_value = OUTAGE_TYPE_UNKNOWN
+        elif snapshot.has_outage:
+            self._attr_native_value = snapshot.outage_type
+        else:
+            self._attr_native_value = "Няма аварии"
+        self._attr_extra_state_attributes = self.slice.outage_attributes
 
-    @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        return self.coordinator.last_update_success
 
+class LastCheckSensor(OutageSensorEntity):
+    """Sensor for last check timestamp.
 
-class LastCheckSensor(
-    CoordinatorEntity[BulgarianUtilityOutageCoordinator], SensorEntity
-):
-    """Sensor for last check timestamp."""
+    The only entity that publishes the check-time fields, so a poll that
+    finds nothing new writes state on this entity alone.
+    """
 
-    _attr_has_entity_name = True
     _attr_icon = "mdi:clock-check"
+    _unrecorded_attributes = LAST_CHECK_UNRECORDED_ATTRIBUTES
 
     def __init__(
         self,
         coordinator: BulgarianUtilityOutageCoordinator,
-        entry: ConfigEntry,
+        identifier: str,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._identifier = entry.data[CONF_IDENTIFIER]
-        self._attr_unique_id = f"{entry.entry_id}_last_check"
+        super().__init__(coordinator, identifier, "last_check")
         self._attr_name = "Последна проверка"
-        
-        # Device info for grouping entities
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, entry.entry_id)},
-            name=f"Bulgarian Utility Outage Checker - {self._identifier}",
-            manufacturer="ERM West",
-            model="Outage Checker",
-        )
-
-    @property
-    def native_value(self) -> str:
-        """Return the state of the sensor."""
-        if self.coordinator.data:
-            return self.coordinator.data.get("last_check", "Unknown")
-        return "Unknown"
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return the state attributes."""
-        if not self.coordinator.data:
-            return {}
 
-        return {
+    @callback
+    def _update_attrs(self) -> None:
+        """Recompute the state and attributes from the slice's snapshot."""
+        super()._update_attrs()
+        if (snapshot := self.slice.snapshot) is None:
+            self._attr_native_value = "Unknown"
+            self._attr_extra_state_attributes = {}
+            return
+
+        self._attr_native_value = snapshot.last_check or "Unknown"
+        self._attr_extra_state_attributes = {
             "update_interval_minutes": self.coordinator.check_interval,
-            "timestamp": self.coordinator.data.get("timestamp"),
+            ATTR_TIMESTAMP: snapshot.timestamp,
+            ATTR_DATA_AGE: snapshot.data_age,
+            "fingerprint_hits": self.slice.fingerprint_hits,
+            "fingerprint_misses": self.slice.fingerprint_misses,
         }
 
-    @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        return self.coordinator.last_update_success
 
-
-class NextCheckSensor(
-    CoordinatorEntity[BulgarianUtilityOutageCoordinator], SensorEntity
-):
+class NextCheckSensor(OutageSensorEntity):
     """Sensor for next check timestamp."""
 
-    _attr_has_entity_name = True
     _attr_icon = "mdi:clock-alert"
     _attr_device_class = "timestamp"
+    _unrecorded_attributes = NEXT_CHECK_UNRECORDED_ATTRIBUTES
 
     def __init__(
         self,
         coordinator: BulgarianUtilityOutageCoordinator,
-        entry: ConfigEntry,
+        identifier: str,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._identifier = entry.data[CONF_IDENTIFIER]
-        self._attr_unique_id = f"{entry.entry_id}_next_check"
+        super().__init__(coordinator, identifier, "next_check")
         self._attr_name = "Следваща проверка"
-        
-        # Device info for grouping entities
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, entry.entry_id)},
-            name=f"Bulgarian Utility Outage Checker - {self._identifier}",
-            manufacturer="ERM West",
-            model="Outage Checker",
-        )
 
-    @property
-    def native_value(self) -> str | None:
-        """Return the state of the sensor."""
-        if self.coordinator.last_update_success_time:
-            from datetime import timedelta
-            next_update = self.coordinator.last_update_success_time + timedelta(
-                minutes=self.coordinator.check_interval
-            )
-            return next_update.isoformat()
-        return None
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return the state attributes."""
-        return {
+    @callback
+    def _update_attrs(self) -> None:
+        """Recompute the state and attributes from the slice."""
+        super()._update_attrs()
+        # Timestamp sensors take an aware datetime, not an ISO string
+        self._attr_native_value = self.slice.next_refresh
+        self._attr_extra_state_attributes = {
             "update_interval_minutes": self.coordinator.check_interval,
+            "current_interval_minutes": round(
+                self.slice.current_interval.total_seconds() / 60, 1
+            ),
+            "adaptive_polling": self.coordinator.adaptive,
         }
-
-    @property
-    def available(self) -> bool:
-        """Return True if entity is available."""
-        return self.coordinator.last_update_success
@@ -0,0 +1,245 @@
+"""Services for Bulgarian Utility Outage Checker."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import inspect
+import logging
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+from homeassistant.helpers.service import async_register_admin_service
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    DOMAIN,
+    HISTORY_PERIODS_LIMIT,
+    PROFILE_MAX_CYCLES,
+    PROFILE_MAX_TIMEOUT,
+    PROFILE_TIMEOUT,
+    PROFILE_TOP_FUNCTIONS,
+    SERVICE_CHECK_NOW,
+    SERVICE_FIND_OUTAGES,
+    SERVICE_GET_HISTORY,
+    SERVICE_GET_OUTAGES,
+    SERVICE_PROFILE,
+)
+from .coordinator import BulgarianUtilityOutageCoordinator
+from .history import async_get_history
+from .index import async_get_outage_index
+from .profiling import async_profile_refresh
+from .slices import IdentifierSlice
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_CHECK_NOW_SCHEMA = vol.Schema(
+    {
+        vol.Required("entity_id"): cv.entity_ids,
+    }
+)
+
+SERVICE_GET_OUTAGES_SCHEMA = SERVICE_CHECK_NOW_SCHEMA
+
+SERVICE_FIND_OUTAGES_SCHEMA = vol.Schema(
+    {
+        vol.Optional("identifier"): cv.string,
+        vol.Optional("locality"): cv.string,
+        vol.Optional("start"): cv.datetime,
+        vol.Optional("end"): cv.datetime,
+    }
+)
+
+HISTORY_ROLLUP_PERIODS = "periods"
+HISTORY_ROLLUP_MONTHLY = "monthly"
+
+SERVICE_GET_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Optional("identifier"): cv.string,
+        vol.Optional("start"): cv.datetime,
+        vol.Optional("end"): cv.datetime,
+        vol.Optional("rollup", default=HISTORY_ROLLUP_PERIODS): vol.In(
+            [HISTORY_ROLLUP_PERIODS, HISTORY_ROLLUP_MONTHLY]
+        ),
+        vol.Optional("limit", default=HISTORY_PERIODS_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=10000)
+        ),
+    }
+)
+
+SERVICE_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required("entity_id"): cv.entity_ids,
+        vol.Optional("cycles", default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=PROFILE_MAX_CYCLES)
+        ),
+        vol.Optional("top", default=PROFILE_TOP_FUNCTIONS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=500)
+        ),
+        vol.Optional("timeout", default=PROFILE_TIMEOUT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=PROFILE_MAX_TIMEOUT)
+        ),
+    }
+)
+
+# Admin services can return a response only on newer Home Assistant
+_ADMIN_SERVICE_RESPONSE = (
+    "supports_response" in inspect.signature(async_register_admin_service).parameters
+)
+
+
+@callback
+def async_get_slices(
+    hass: HomeAssistant, entity_ids: list[str]
+) -> dict[str, IdentifierSlice]:
+    """Map entity ids to their identifier slices, keyed by identifier."""
+    ent_reg = er.async_get(hass)
+    domain_data = hass.data.get(DOMAIN, {})
+    slices: dict[str, IdentifierSlice] = {}
+
+    for entity_id in entity_ids:
+        entity_entry = ent_reg.async_get(entity_id)
+        if entity_entry is None or entity_entry.platform != DOMAIN:
+            _LOGGER.warning("%s is not a %s entity", entity_id, DOMAIN)
+            continue
+        coordinator: BulgarianUtilityOutageCoordinator | None = domain_data.get(
+            entity_entry.config_entry_id
+        )
+        if coordinator is None:
+            _LOGGER.warning("Config entry of %s is not loaded", entity_id)
+            continue
+        if (slice_ := coordinator.slice_for_unique_id(entity_entry.unique_id)) is None:
+            _LOGGER.warning("%s no longer belongs to a configured identifier", entity_id)
+            continue
+        slices[slice_.identifier] = slice_
+
+    return slices
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services once for the whole domain."""
+
+    async def async_check_now(call: ServiceCall) -> None:
+        """Refresh the identifiers behind the given entities."""
+        slices = async_get_slices(hass, call.data["entity_id"])
+        await asyncio.gather(
+            *(
+                slice_.coordinator.scheduler.async_request_refresh(
+                    slice_.coordinator, identifier
+                )
+                for identifier, slice_ in slices.items()
+            )
+        )
+
+    async def async_get_outages(call: ServiceCall) -> ServiceResponse:
+        """Return the full outage records behind the given entities."""
+        slices = async_get_slices(hass, call.data["entity_id"])
+        return {
+            identifier: [
+                outage.as_dict()
+                for outage in (slice_.data or {}).get("outages", [])
+            ]
+            for identifier, slice_ in slices.items()
+        }
+
+    async def async_find_outages(call: ServiceCall) -> ServiceResponse:
+        """Query the domain-wide outage index.
+
+        Without a time window only outages in progress right now match.
+        """
+        start = call.data.get("start")
+        end = call.data.get("end")
+        if start is None and end is None:
+            start = end = dt_util.now()
+        outages = async_get_outage_index(hass).query(
+            identifier=call.data.get("identifier"),
+            locality=call.data.get("locality"),
+            start=dt_util.as_local(start) if start else None,
+            end=dt_util.as_local(end) if end else None,
+        )
+        return {"outages": outages}
+
+    async def async_get_history_response(call: ServiceCall) -> ServiceResponse:
+        """Return outage periods or monthly rollups from the history log.
+
+        The window defaults to the last year.
+        """
+        end = dt_util.as_local(call.data.get("end") or dt_util.now())
+        start = dt_util.as_local(call.data.get("start") or end - timedelta(days=365))
+        history = async_get_history(hass)
+        identifier = call.data.get("identifier")
+        if call.data["rollup"] == HISTORY_ROLLUP_MONTHLY:
+            return {"months": await history.async_monthly_rollup(identifier, start, end)}
+        return {
+            "periods": await history.async_periods(
+                identifier, start, end, call.data["limit"]
+            )
+        }
+
+    async def async_profile(call: ServiceCall) -> ServiceResponse:
+        """Profile the next refreshes of the identifiers behind the given entities.
+
+        Admin only: the response and the stats file expose internals.
+        """
+        slices = async_get_slices(hass, call.data["entity_id"])
+        return await async_profile_refresh(
+            hass,
+            list(slices.values()),
+            call.data["cycles"],
+            call.data["top"],
+            timedelta(minutes=call.data["timeout"]),
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CHECK_NOW,
+        async_check_now,
+        schema=SERVICE_CHECK_NOW_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_OUTAGES,
+        async_get_outages,
+        schema=SERVICE_GET_OUTAGES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FIND_OUTAGES,
+        async_find_outages,
+        schema=SERVICE_FIND_OUTAGES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        async_get_history_response,
+        schema=SERVICE_GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    if _ADMIN_SERVICE_RESPONSE:
+        async_register_admin_service(
+            hass,
+            DOMAIN,
+            SERVICE_PROFILE,
+            async_profile,
+            schema=SERVICE_PROFILE_SCHEMA,
+            supports_response=SupportsResponse.ONLY,
+        )
+    else:
+        # The stats file is still written; its path is logged
+        async_register_admin_service(
+            hass,
+            DOMAIN,
+            SERVICE_PROFILE,
+            async_profile,
+            schema=SERVICE_PROFILE_SCHEMA,
+        )
@@ -0,0 +1,446 @@
+"""Per-identifier polling state of a coordinator."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+import logging
+import random
+import sqlite3
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceInfo
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    ADAPTIVE_BACKOFF_FACTOR,
+    ADAPTIVE_FAST_POLLS,
+    ADAPTIVE_JITTER,
+    ATTR_IDENTIFIER,
+    ATTR_STALE,
+    DOMAIN,
+    EVENT_OUTAGE_RESOLVED,
+    EVENT_OUTAGE_SCHEDULED,
+    EVENT_OUTAGE_STARTED,
+    EVENT_OUTAGE_UPDATED,
+    OUTAGE_TYPE_NONE,
+    STARTUP_REFRESH_JITTER,
+)
+from .breaker import CircuitOpenError
+from .models import OutageRecord, OutageSnapshot
+from .parser import check_time_fields
+from .stats import (
+    STAGE_EXECUTOR_QUEUE,
+    STAGE_TOTAL,
+    new_request_timings,
+    timed_call,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import BulgarianUtilityOutageCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Summary values of an identifier without any result yet
+_NO_DATA = OutageSnapshot.from_result({}, stale=False, data_age=None)
+
+
+def _in_progress_ids(data: dict, now: datetime) -> set[str]:
+    """Return the ids of outages in ``data`` that have already started."""
+    return {
+        outage.outage_id
+        for outage in data.get("outages", [])
+        if outage.start is None or outage.start <= now
+    }
+
+
+def _outages_by_id(data: dict) -> dict[str, OutageRecord]:
+    """Return the outages in ``data`` by id, keeping the first of repeats."""
+    outages: dict[str, OutageRecord] = {}
+    for outage in data.get("outages", []):
+        outages.setdefault(outage.outage_id, outage)
+    return outages
+
+
+class IdentifierSlice:
+    """Data and polling state of one identifier within a coordinator.
+
+    A coordinator holds one slice per identifier of its config entry. Each
+    slice keeps its own schedule, adaptive interval, validators and
+    fingerprint, and its own ``data``. ``version`` increases every time
+    the slice is refreshed or restored, so entities can tell whether a
+    coordinator update touched their identifier. After every refresh the
+    result is frozen into ``snapshot``, which entities publish from.
+    """
+
+    def __init__(
+        self, coordinator: BulgarianUtilityOutageCoordinator, identifier: str
+    ) -> None:
+        """Initialize the slice."""
+        self.coordinator = coordinator
+        self.identifier = identifier
+        self.data: dict[str, Any] | None = None
+        self.snapshot: OutageSnapshot | None = None
+        self.last_update_success = True
+        self.version = 0
+        # Shared by all entities of the identifier
+        self.device_info = DeviceInfo(
+            identifiers={(DOMAIN, coordinator.device_key(identifier))},
+            name=f"Bulgarian Utility Outage Checker - {identifier}",
+            manufacturer="ERM West",
+            model="Outage Checker",
+        )
+
+        self.next_refresh: datetime | None = None
+        self.current_interval = coordinator.update_period
+        self._quiet_polls = 0
+        self._fast_polls_left = 0
+        self._failures = 0
+
+        # Fingerprint of the last parsed page, used to skip re-parsing
+        self._fingerprint: str | None = None
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        self.fingerprint_hits = 0
+        self.fingerprint_misses = 0
+
+        # Outages already announced as started, so each fires only once
+        self._started_ids: set[str] = set()
+
+    def restore_cached_state(self) -> bool:
+        """Publish the persisted result, marked stale, without fetching.
+
+        Returns False if nothing is cached for this identifier. Otherwise the
+        real refresh is scheduled after a random delay, so that many
+        identifiers restored at startup do not all hit upstream at once.
+        """
+        cached = self.coordinator.state_store.get(self.identifier)
+        if cached is None:
+            return False
+
+        self.next_refresh = dt_util.utcnow() + timedelta(
+            seconds=random.uniform(0, STARTUP_REFRESH_JITTER)
+        )
+        self.coordinator.outage_index.async_update(
+            self.identifier, cached.get("outages", [])
+        )
+        self.data = {**cached, ATTR_STALE: True}
+        self._started_ids = _in_progress_ids(cached, dt_util.now())
+        self.version += 1
+        self._update_snapshot()
+        return True
+
+    @property
+    def stale(self) -> bool:
+        """Return True if the data is not from a successful latest check.
+
+        That is the case for results restored at startup and while
+        refreshes fail, e.g. when the upstream site is down.
+        """
+        return not self.last_update_success or bool(
+            self.data and self.data.get(ATTR_STALE)
+        )
+
+    @property
+    def data_age(self) -> int | None:
+        """Return the seconds since the data was fetched."""
+        if not self.data or not (timestamp := self.data.get("timestamp")):
+            return None
+        return max(0, int((datetime.now() - datetime.fromisoformat(timestamp)).total_seconds()))
+
+    @property
+    def outage_attributes(self) -> dict[str, Any]:
+        """Return the outage payload published as entity attributes.
+
+        This is the single source for outage attributes; entities expose it
+        or a subset of it instead of building their own copies.
+        """
+        if self.snapshot is None:
+            return {}
+        return self.snapshot.attributes
+
+    def _update_snapshot(self) -> None:
+        """Freeze the current result for entities and dashboards."""
+        if self.data is None:
+            self.snapshot = None
+            return
+        self.snapshot = OutageSnapshot.from_result(self.data, self.stale, self.data_age)
+
+    def is_due(self, now: datetime) -> bool:
+        """Return True if this identifier should be refreshed."""
+        return self.next_refresh is None or now >= self.next_refresh
+
+    def _clamp_interval(self, interval: timedelta) -> timedelta:
+        """Keep an adaptive interval within the configured bounds."""
+        coordinator = self.coordinator
+        return max(coordinator.min_interval, min(coordinator.max_interval, interval))
+
+    def _backoff(self, base: timedelta, steps: int) -> float:
+        """Return ``base`` grown ``steps`` times, in seconds.
+
+        Float seconds, so the caller can clamp it before building a
+        ``timedelta`` that could overflow.
+        """
+        return base.total_seconds() * ADAPTIVE_BACKOFF_FACTOR**steps
+
+    def _interval_after_success(self, data: dict) -> timedelta:
+        """Return the delay until the next poll after a successful update."""
+        self._failures = 0
+        coordinator = self.coordinator
+        if not coordinator.adaptive:
+            return coordinator.update_period
+
+        previous = self.data
+        if previous is not None and (
+            previous.get("has_outage") != data.get("has_outage")
+            or previous.get("outage_type") != data.get("outage_type")
+        ):
+            self._fast_polls_left = ADAPTIVE_FAST_POLLS
+
+        if data.get("has_outage") or self._fast_polls_left > 0:
+            self._fast_polls_left = max(0, self._fast_polls_left - 1)
+            self._quiet_polls = 0
+            return coordinator.min_interval
+
+        seconds = self._backoff(coordinator.update_period, self._quiet_polls)
+        max_seconds = coordinator.max_interval.total_seconds()
+        # Stop counting once the maximum is reached, so the exponent stays small
+        if seconds < max_seconds:
+            self._quiet_polls += 1
+        return self._clamp_interval(timedelta(seconds=min(seconds, max_seconds)))
+
+    def _interval_after_failure(self) -> timedelta:
+        """Return the delay until the next poll after a failed update.
+
+        Jitter is applied before clamping, so a backoff never exceeds the
+        maximum interval.
+        """
+        coordinator = self.coordinator
+        if not coordinator.adaptive:
+            return coordinator.update_period
+
+        seconds = self._backoff(coordinator.min_interval, self._failures)
+        max_seconds = coordinator.max_interval.total_seconds()
+        if seconds < max_seconds:
+            self._failures += 1
+        seconds *= random.uniform(1 - ADAPTIVE_JITTER, 1 + ADAPTIVE_JITTER)
+        return self._clamp_interval(timedelta(seconds=min(seconds, max_seconds)))
+
+    def _schedule_next(self, interval: timedelta) -> None:
+        """Set the time of the next scheduled poll."""
+        self.current_interval = interval
+        self.next_refresh = dt_util.utcnow() + interval
+
+    async def async_refresh(self) -> bool:
+        """Fetch and parse this identifier, returning whether it succeeded.
+
+        Failures are logged and leave the previous data in place.
+        """
+        coordinator = self.coordinator
+        provider = coordinator.provider
+        _LOGGER.debug(
+            "Starting data update for %s (interval: %d min)",
+            self.identifier,
+            coordinator.check_interval,
+        )
+        # Keep the scheduler from picking this identifier again mid-fetch
+        self.next_refresh = dt_util.utcnow() + self.current_interval
+        self.version += 1
+        started = time.monotonic()
+        try:
+            data = await self._fetch_outage_data()
+        except CircuitOpenError as err:
+            # Upstream is down: keep serving the last data, marked stale, and
+            # come back once the breaker lets a probe through
+            self._schedule_next(
+                timedelta(
+                    seconds=err.retry_in * random.uniform(1, 1 + ADAPTIVE_JITTER)
+                )
+            )
+            self.last_update_success = False
+            self._update_snapshot()
+            _LOGGER.debug("Skipping update for %s: %s", self.identifier, err)
+            return False
+        except asyncio.TimeoutError as err:
+            self._schedule_next(self._interval_after_failure())
+            self.last_update_success = False
+            self._update_snapshot()
+            _LOGGER.error("Timeout communicating with %s for %s: %s", provider.name, self.identifier, err)
+            return False
+        except Exception as err:
+            self._schedule_next(self._interval_after_failure())
+            self.last_update_success = False
+            self._update_snapshot()
+            _LOGGER.error("Error communicating with %s for %s: %s", provider.name, self.identifier, err)
+            return False
+
+        coordinator.stats.record(STAGE_TOTAL, time.monotonic() - started)
+        await self._async_record_history(data)
+        self._async_fire_events(data)
+        self._schedule_next(self._interval_after_success(data))
+        self.data = data
+        self.last_update_success = True
+        self._update_snapshot()
+        coordinator.state_store.async_set(self.identifier, data)
+        coordinator.outage_index.async_update(self.identifier, data["outages"])
+        _LOGGER.info(
+            "Successfully updated data for %s: has_outage=%s",
+            self.identifier,
+            data.get("has_outage", "unknown"),
+        )
+        return True
+
+    async def _async_record_history(self, data: dict) -> None:
+        """Send outage state transitions to the history log."""
+        previous = self.data
+        if (history := self.coordinator.history) is None:
+            return
+        if (
+            previous is not None
+            and not previous.get(ATTR_STALE)
+            and previous.get("has_outage") == data.get("has_outage")
+            and previous.get("outage_type") == data.get("outage_type")
+        ):
+            return
+        try:
+            await history.async_record_state(
+                self.identifier,
+                data.get("has_outage", False),
+                data.get("outage_type", OUTAGE_TYPE_NONE),
+                data.get("details", []),
+                dt_util.utcnow(),
+            )
+        except sqlite3.Error as err:
+            _LOGGER.warning("Could not record outage history for %s: %s", self.identifier, err)
+
+    @callback
+    def _async_fire_events(self, data: dict) -> None:
+        """Fire one bus event per outage transition since the last result.
+
+        Outages are matched by ``outage_id``. A new outage starting in the
+        future is ``scheduled`` and becomes ``started`` once its start time
+        has passed; changed details fire ``updated``; outages no longer
+        listed fire ``resolved``. Nothing fires for the very first result,
+        which has nothing to compare with.
+        """
+        now = dt_util.now()
+        if self.data is None:
+            self._started_ids = _in_progress_ids(data, now)
+            return
+
+        old = _outages_by_id(self.data)
+        new = _outages_by_id(data)
+        fire = self.coordinator.hass.bus.async_fire
+
+        for outage_id, outage in new.items():
+            if outage_id not in old:
+                if outage.start is not None and outage.start > now:
+                    fire(EVENT_OUTAGE_SCHEDULED, self._event_data(outage))
+            elif outage != old[outage_id]:
+                fire(EVENT_OUTAGE_UPDATED, self._event_data(outage))
+            if outage_id not in self._started_ids and (
+                outage.start is None or outage.start <= now
+            ):
+                self._started_ids.add(outage_id)
+                fire(EVENT_OUTAGE_STARTED, self._event_data(outage))
+
+        for outage_id in old.keys() - new.keys():
+            fire(EVENT_OUTAGE_RESOLVED, self._event_data(old[outage_id]))
+        self._started_ids &= new.keys()
+
+    def _event_data(self, outage: OutageRecord) -> dict[str, Any]:
+        """Return the payload of an outage event."""
+        return {ATTR_IDENTIFIER: self.identifier, **outage.as_dict()}
+
+    async def _fetch_outage_data(self) -> dict:
+        """Fetch and parse outage data."""
+        coordinator = self.coordinator
+        provider = coordinator.provider
+        scheduler = coordinator.scheduler
+        stats = coordinator.stats
+
+        timings = new_request_timings()
+        # Parse while downloading only if there is no earlier page this one
+        # could match; otherwise an unchanged page would be parsed anyway
+        response = await scheduler.async_fetch(
+            provider,
+            self.identifier,
+            self._etag,
+            self._last_modified,
+            timings,
+            stream=not self.data or self._fingerprint is None,
+        )
+        stats.record_timings(timings)
+        stats.record_fetch(response.size)
+        self._etag = response.etag
+        self._last_modified = response.last_modified
+
+        if (
+            self.data
+            and response.data is None
+            and (response.not_modified or response.fingerprint == self._fingerprint)
+        ):
+            # Page unchanged: keep the parsed outage payload, only the
+            # check-time bookkeeping moves forward
+            self.fingerprint_hits += 1
+            _LOGGER.debug("Page for %s unchanged, skipping parse", self.identifier)
+            data = {**self.data, **check_time_fields()}
+            data.pop(ATTR_STALE, None)
+            return data
+
+        if response.not_modified:
+            # 304 without a cached payload: drop the validators and retry
+            self._etag = self._last_modified = None
+            response = await scheduler.async_fetch(
+                provider, self.identifier, stream=True
+            )
+            stats.record_fetch(response.size)
+            self._etag = response.etag
+            self._last_modified = response.last_modified
+
+        self.fingerprint_misses += 1
+        if (data := response.data) is not None:
+            # Parsed while downloading
+            queue_wait, parse_time = response.queue_wait, response.parse_time
+        else:
+            data, queue_wait, parse_time = await scheduler.parse_executor.async_run(
+                timed_call,
+                provider.parse,
+                time.monotonic(),
+                response.body,
+                self.identifier,
+            )
+        stats.record(STAGE_EXECUTOR_QUEUE, queue_wait)
+        stats.record_parse(parse_time, response.size)
+        self._fingerprint = response.fingerprint
+        return data
+
+    def summary(self) -> dict[str, Any]:
+        """Return the compact payload sent to dashboards.
+
+        ``data_age`` is computed now; the snapshot's copy is from the last
+        refresh.
+        """
+        snapshot = self.snapshot or _NO_DATA
+        return {
+            "has_outage": snapshot.has_outage,
+            "outage_type": snapshot.outage_type,
+            "last_check": snapshot.last_check,
+            "next_check": self.next_refresh.isoformat() if self.next_refresh else None,
+            "stale": self.stale,
+            "data_age": self.data_age,
+            "available": self.last_update_success,
+            "outages": [outage.summary for outage in snapshot.outages],
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a diagnostics-friendly snapshot."""
+        return {
+            "last_update_success": self.last_update_success,
+            "next_refresh": self.next_refresh,
+            "current_interval_minutes": self.current_interval.total_seconds() / 60,
+            "fingerprint_hits": self.fingerprint_hits,
+            "fingerprint_misses": self.fingerprint_misses,
+            "outage_attributes": self.outage_attributes,
+        }
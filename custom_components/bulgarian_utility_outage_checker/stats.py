@@ -0,0 +1,181 @@
+"""Performance instrumentation for the fetch and parse pipeline."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+import time
+from types import SimpleNamespace
+from typing import Any, TypeVar
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_STATS, DOMAIN, STATS_WINDOW
+
+_T = TypeVar("_T")
+
+# Pipeline stages, in the order they happen
+STAGE_SLOT_WAIT = "slot_wait"
+STAGE_DNS = "dns"
+STAGE_CONNECT = "connect"
+STAGE_FIRST_BYTE = "first_byte"
+STAGE_DOWNLOAD = "download"
+STAGE_EXECUTOR_QUEUE = "executor_queue"
+STAGE_PARSE = "parse"
+STAGE_TOTAL = "total"
+STAGES = (
+    STAGE_SLOT_WAIT,
+    STAGE_DNS,
+    STAGE_CONNECT,
+    STAGE_FIRST_BYTE,
+    STAGE_DOWNLOAD,
+    STAGE_EXECUTOR_QUEUE,
+    STAGE_PARSE,
+    STAGE_TOTAL,
+)
+
+
+class RollingHistogram:
+    """Keep the last ``STATS_WINDOW`` samples and report percentiles."""
+
+    __slots__ = ("_samples",)
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self._samples: deque[float] = deque(maxlen=STATS_WINDOW)
+
+    def add(self, value: float) -> None:
+        """Add a sample."""
+        self._samples.append(value)
+
+    def as_dict(self) -> dict[str, float | int]:
+        """Return the sample count and p50/p95/p99/max."""
+        if not self._samples:
+            return {"count": 0}
+        ordered = sorted(self._samples)
+        last = len(ordered) - 1
+        return {
+            "count": len(ordered),
+            "p50": round(ordered[round(last * 0.50)], 4),
+            "p95": round(ordered[round(last * 0.95)], 4),
+            "p99": round(ordered[round(last * 0.99)], 4),
+            "max": round(ordered[last], 4),
+        }
+
+
+class PipelineStats:
+    """Rolling per-stage timings (seconds) and byte counters.
+
+    Coordinator stats forward every sample to the domain-wide stats they
+    were created with, so both levels stay in sync.
+    """
+
+    def __init__(self, parent: PipelineStats | None = None) -> None:
+        """Initialize the stats."""
+        self._parent = parent
+        self.stages = {stage: RollingHistogram() for stage in STAGES}
+        self.parse_ms_per_kb = RollingHistogram()
+        self.fetches = 0
+        self.bytes_fetched = 0
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Record the duration of one stage."""
+        self.stages[stage].add(seconds)
+        if self._parent is not None:
+            self._parent.record(stage, seconds)
+
+    def record_fetch(self, size: int) -> None:
+        """Record one completed upstream fetch of ``size`` bytes."""
+        self.fetches += 1
+        self.bytes_fetched += size
+        if self._parent is not None:
+            self._parent.record_fetch(size)
+
+    def record_parse(self, seconds: float, size: int) -> None:
+        """Record one parse of a ``size`` byte page."""
+        self.stages[STAGE_PARSE].add(seconds)
+        if size:
+            self.parse_ms_per_kb.add(seconds * 1000 / (size / 1024))
+        if self._parent is not None:
+            self._parent.record_parse(seconds, size)
+
+    def record_timings(self, timings: SimpleNamespace) -> None:
+        """Record the stages captured for one request."""
+        for stage in STAGES:
+            if (value := getattr(timings, stage, None)) is not None:
+                self.record(stage, value)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a diagnostics-friendly snapshot."""
+        return {
+            "fetches": self.fetches,
+            "bytes_fetched": self.bytes_fetched,
+            "stages": {stage: hist.as_dict() for stage, hist in self.stages.items()},
+            "parse_ms_per_kb": self.parse_ms_per_kb.as_dict(),
+        }
+
+
+def new_request_timings() -> SimpleNamespace:
+    """Return a container the HTTP trace hooks fill in for one request."""
+    return SimpleNamespace(**dict.fromkeys(STAGES))
+
+
+def timed_call(
+    func: Callable[..., _T], submitted: float, *args: Any
+) -> tuple[_T, float, float]:
+    """Run ``func`` in an executor, timing the queue wait and the call.
+
+    Returns the result, the seconds spent waiting for a worker and the
+    seconds spent in ``func``.
+    """
+    started = time.monotonic()
+    result = func(*args)
+    return result, started - submitted, time.monotonic() - started
+
+
+def create_trace_config() -> aiohttp.TraceConfig:
+    """Return a trace config that fills ``trace_request_ctx`` timings."""
+
+    trace_config = aiohttp.TraceConfig()
+
+    def _mark(name: str) -> Callable[..., Any]:
+        async def _on_event(
+            session: aiohttp.ClientSession,  # noqa: ARG001
+            context: SimpleNamespace,
+            params: Any,  # noqa: ARG001
+        ) -> None:
+            timings = context.trace_request_ctx
+            if timings is not None:
+                setattr(timings, f"_{name}", time.monotonic())
+
+        return _on_event
+
+    def _span(name: str, stage: str) -> Callable[..., Any]:
+        async def _on_event(
+            session: aiohttp.ClientSession,  # noqa: ARG001
+            context: SimpleNamespace,
+            params: Any,  # noqa: ARG001
+        ) -> None:
+            timings = context.trace_request_ctx
+            if timings is not None and (start := getattr(timings, f"_{name}", None)):
+                setattr(timings, stage, time.monotonic() - start)
+
+        return _on_event
+
+    trace_config.on_request_start.append(_mark("request"))
+    trace_config.on_dns_resolvehost_start.append(_mark("dns"))
+    trace_config.on_dns_resolvehost_end.append(_span("dns", STAGE_DNS))
+    trace_config.on_connection_create_start.append(_mark("connect"))
+    trace_config.on_connection_create_end.append(_span("connect", STAGE_CONNECT))
+    trace_config.on_request_end.append(_span("request", STAGE_FIRST_BYTE))
+    return trace_config
+
+
+@callback
+def async_get_domain_stats(hass: HomeAssistant) -> PipelineStats:
+    """Return the domain-wide pipeline stats."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (stats := domain_data.get(DATA_STATS)) is None:
+        stats = domain_data[DATA_STATS] = PipelineStats()
+    return stats
@@ -0,0 +1,80 @@
+"""Persistent cache of the last known outage state."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DATA_STORE,
+    DOMAIN,
+    STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .models import decode_result, encode_result
+
+
+class OutageStateStore:
+    """Keep the last parsed result of every identifier in ``.storage``.
+
+    Writes are coalesced: any number of updates within
+    ``STORAGE_SAVE_DELAY`` seconds end up in a single write.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._data: dict[str, dict[str, Any]] = {}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+
+    async def async_load(self) -> None:
+        """Load the cached state once."""
+        async with self._load_lock:
+            if self._loaded:
+                return
+            if stored := await self._store.async_load():
+                self._data = {
+                    identifier: decode_result(data)
+                    for identifier, data in stored.get("identifiers", {}).items()
+                }
+            self._loaded = True
+
+    def get(self, identifier: str) -> dict[str, Any] | None:
+        """Return the cached result for an identifier."""
+        return self._data.get(identifier)
+
+    @callback
+    def async_set(self, identifier: str, data: dict[str, Any]) -> None:
+        """Cache a result and schedule a coalesced write."""
+        self._data[identifier] = data
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    @callback
+    def async_remove(self, identifier: str) -> None:
+        """Drop the cached result of a removed identifier."""
+        if self._data.pop(identifier, None) is not None:
+            self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to write."""
+        return {
+            "identifiers": {
+                identifier: encode_result(data)
+                for identifier, data in self._data.items()
+            }
+        }
+
+
+async def async_get_state_store(hass: HomeAssistant) -> OutageStateStore:
+    """Return the shared, loaded state store."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    store: OutageStateStore | None = domain_data.get(DATA_STORE)
+    if store is None:
+        store = domain_data[DATA_STORE] = OutageStateStore(hass)
+    await store.async_load()
+    return store
@@ -0,0 +1,176 @@
+"""Websocket API for Bulgarian Utility Outage Checker."""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from homeassistant.helpers import config_validation as cv
+import homeassistant.util.dt as dt_util
+
+from .const import DOMAIN
+from .coordinator import BulgarianUtilityOutageCoordinator
+from .index import async_get_outage_index
+from .services import async_get_slices
+from .slices import IdentifierSlice
+
+# Select identifiers by hub/config entry, identifier or one of their entities
+SUMMARY_FILTERS = {
+    vol.Optional("entry_id"): str,
+    vol.Optional("identifier"): str,
+    vol.Optional("entity_id"): cv.entity_id,
+}
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Register the websocket commands."""
+    websocket_api.async_register_command(hass, websocket_get_outages)
+    websocket_api.async_register_command(hass, websocket_find_outages)
+    websocket_api.async_register_command(hass, websocket_summary)
+    websocket_api.async_register_command(hass, websocket_subscribe_summary)
+
+
+@callback
+def _async_select_slices(
+    hass: HomeAssistant, msg: dict[str, Any]
+) -> list[IdentifierSlice]:
+    """Return the identifier slices matching the filters of a request."""
+    if (entity_id := msg.get("entity_id")) is not None:
+        return list(async_get_slices(hass, [entity_id]).values())
+    return [
+        slice_
+        for entry_id, coordinator in hass.data.get(DOMAIN, {}).items()
+        if isinstance(coordinator, BulgarianUtilityOutageCoordinator)
+        and msg.get("entry_id") in (None, entry_id)
+        for identifier, slice_ in coordinator.slices.items()
+        if msg.get("identifier") in (None, identifier)
+    ]
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/outages",
+        vol.Optional("identifier"): str,
+    }
+)
+@callback
+def websocket_get_outages(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return full outage records, optionally for a single identifier."""
+    identifier = msg.get("identifier")
+    result = {
+        slice_identifier: [
+            outage.as_dict() for outage in (slice_.data or {}).get("outages", [])
+        ]
+        for coordinator in hass.data.get(DOMAIN, {}).values()
+        if isinstance(coordinator, BulgarianUtilityOutageCoordinator)
+        for slice_identifier, slice_ in coordinator.slices.items()
+        if identifier in (None, slice_identifier)
+    }
+    connection.send_result(msg["id"], result)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/find_outages",
+        vol.Optional("identifier"): str,
+        vol.Optional("locality"): str,
+        vol.Optional("start"): cv.datetime,
+        vol.Optional("end"): cv.datetime,
+    }
+)
+@callback
+def websocket_find_outages(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Query the domain-wide outage index."""
+    start = msg.get("start")
+    end = msg.get("end")
+    outages = async_get_outage_index(hass).query(
+        identifier=msg.get("identifier"),
+        locality=msg.get("locality"),
+        start=dt_util.as_local(start) if start else None,
+        end=dt_util.as_local(end) if end else None,
+    )
+    connection.send_result(msg["id"], {"outages": outages})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/summary",
+        **SUMMARY_FILTERS,
+    }
+)
+@callback
+def websocket_summary(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return one compact summary per identifier."""
+    connection.send_result(
+        msg["id"],
+        {slice_.identifier: slice_.summary() for slice_ in _async_select_slices(hass, msg)},
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe_summary",
+        **SUMMARY_FILTERS,
+    }
+)
+@callback
+def websocket_subscribe_summary(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Send all summaries once, then only the ones that changed.
+
+    The first event is ``{"full": {...}}``; later events are
+    ``{"changed": {...}}`` with just the identifiers whose summary
+    differs from what was last sent. Clients resubscribe after the
+    config entry is reloaded.
+    """
+    slices = _async_select_slices(hass, msg)
+    sent = {slice_.identifier: slice_.summary() for slice_ in slices}
+    versions = {slice_.identifier: slice_.version for slice_ in slices}
+
+    @callback
+    def _async_send_changes() -> None:
+        changed: dict[str, dict[str, Any]] = {}
+        for slice_ in slices:
+            identifier = slice_.identifier
+            if versions[identifier] == slice_.version:
+                continue
+            versions[identifier] = slice_.version
+            if (summary := slice_.summary()) != sent[identifier]:
+                sent[identifier] = changed[identifier] = summary
+        if changed:
+            connection.send_message(
+                websocket_api.event_message(msg["id"], {"changed": changed})
+            )
+
+    unsubs: list[CALLBACK_TYPE] = [
+        coordinator.async_add_listener(_async_send_changes)
+        for coordinator in {slice_.coordinator for slice_ in slices}
+    ]
+
+    @callback
+    def _async_unsubscribe() -> None:
+        for unsub in unsubs:
+            unsub()
+
+    connection.subscriptions[msg["id"]] = _async_unsubscribe
+    connection.send_result(msg["id"])
+    connection.send_message(websocket_api.event_message(msg["id"], {"full": sent}))
@@ -9,14 +9,35 @@ class BulgarianUtilityOutageCard extends HTMLElement {
       throw new Error('Моля, задайте entity (binary_sensor)');
     }
     this.config = config;
+    this._states = null;
     this.render();
   }
 
   set hass(hass) {
     this._hass = hass;
+    // hass is replaced on every state change in HA; only re-render when
+    // one of this card's entities changed
+    const states = this.relatedEntityIds().map((entityId) => hass.states[entityId]);
+    if (this._states && states.every((state, i) => state === this._states[i])) {
+      return;
+    }
+    this._states = states;
     this.render();
   }
 
+  relatedEntityIds() {
+    if (!this.config) {
+      return [];
+    }
+    const base = this.config.entity.replace('binary_sensor.', '').replace('_outage', '');
+    return [
+      this.config.entity,
+      `sensor.${base}_status`,
+      `sensor.${base}_последна_проверка`,
+      `sensor.${base}_следваща_проверка`,
+    ];
+  }
+
   getCardSize() {
     return 3;
   }
@@ -54,7 +75,10 @@ class BulgarianUtilityOutageCard extends HTMLElement {
 
     const hasOutage = entity.state === 'on';
     const outageType = entity.attributes.outage_type || 'Unknown';
-    const details = entity.attributes.details || [];
+    // Outage details live on the status sensor; older versions put them on the binary sensor
+    const details = (statusEntity && statusEntity.attributes.details) || entity.attributes.details || [];
+    // The status sensor lists only the first outages; the rest come from get_outages
+    const moreDetails = Math.max(0, (entity.attributes.outage_count || 0) - details.length);
     const lastCheck = lastCheckEntity ? lastCheckEntity.state : 'N/A';
     const nextCheck = nextCheckEntity ? this.formatDateTime(nextCheckEntity.state) : 'N/A';
     
@@ -221,6 +245,7 @@ class BulgarianUtilityOutageCard extends HTMLElement {
             <div class="details-title">Детайли за аварията:</div>
             <div class="details-list">
               ${details.map(detail => `<div class="detail-item">${detail}</div>`).join('')}
+              ${moreDetails > 0 ? `<div class="detail-item">… и още ${moreDetails}</div>` : ''}
             </div>
           </div>
         ` : hasOutage ? `
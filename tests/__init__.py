@@ -0,0 +1 @@
+"""Tests for the Bulgarian Utility Outage Checker integration."""
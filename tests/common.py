@@ -0,0 +1,101 @@
+"""Helpers shared by the tests and benchmarks."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+import hashlib
+from pathlib import Path
+from typing import Any
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+# Check-time fields differ between any two parses of the same page
+VOLATILE_FIELDS = ("timestamp", "last_check")
+
+
+def fixture_names(provider: str) -> list[str]:
+    """Return the saved pages of ``provider``."""
+    return sorted(path.name for path in (FIXTURES / provider).glob("*.html"))
+
+
+def provider_pages(providers: Iterable[str]) -> list[tuple[str, str]]:
+    """Return ``(provider, page)`` for every saved page of ``providers``."""
+    return [
+        (provider, name) for provider in providers for name in fixture_names(provider)
+    ]
+
+
+def load_fixture_bytes(provider: str, name: str) -> bytes:
+    """Return a saved page as served."""
+    return (FIXTURES / provider / name).read_bytes()
+
+
+def load_fixture(provider: str, name: str) -> str:
+    """Return a saved page decoded."""
+    return load_fixture_bytes(provider, name).decode("utf-8")
+
+
+def stable(result: dict[str, Any]) -> dict[str, Any]:
+    """Return a parse result without its check-time fields."""
+    return {key: value for key, value in result.items() if key not in VOLATILE_FIELDS}
+
+
+class FakeUpstream:
+    """Answer the shared HTTP client's fetches with saved pages.
+
+    Replaces ``OutageHttpClient.async_fetch`` (see the ``upstream``
+    fixture), so no request leaves the test. Each identifier gets
+    ``pages[identifier]``, or ``page`` if it has none; while ``error`` is
+    set every fetch raises it instead. While ``gate`` is set, fetches wait
+    for it, so tests can hold requests open; ``max_active`` counts the
+    most requests open at once.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the upstream."""
+        self.page = "no_outage.html"
+        self.pages: dict[str, str] = {}
+        self.error: BaseException | None = None
+        self.gate: asyncio.Event | None = None
+        self.requests: list[str] = []
+        self.active = 0
+        self.max_active = 0
+
+    async def async_fetch(
+        self,
+        client: Any,
+        provider: Any,
+        identifier: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        timings: Any = None,
+        stream: Any = None,
+    ) -> Any:
+        """Return the page of an identifier like ``OutageHttpClient``."""
+        # pylint: disable-next=import-outside-toplevel
+        from custom_components.bulgarian_utility_outage_checker.client import (
+            FetchResult,
+        )
+
+        self.requests.append(identifier)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            if self.gate is not None:
+                await self.gate.wait()
+        finally:
+            self.active -= 1
+        if self.error is not None:
+            raise self.error
+        body = load_fixture_bytes(provider.key, self.pages.get(identifier, self.page))
+        result = FetchResult(
+            None,
+            size=len(body),
+            fingerprint=hashlib.blake2b(body, digest_size=16).hexdigest(),
+        )
+        if stream is None:
+            result.body = body.decode("utf-8")
+        else:
+            stream.feed(body, "utf-8")
+            stream.finish("utf-8")
+        return result
@@ -0,0 +1,88 @@
+"""Shared test setup for the Bulgarian Utility Outage Checker."""
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+import types
+
+ROOT = Path(__file__).parent.parent
+
+try:
+    import homeassistant  # noqa: F401
+except ImportError:
+    # Without Home Assistant only the pure-Python modules (const, models,
+    # parser, providers) can be tested. Register the packages so those
+    # import without running the integration's __init__.
+    for name in (
+        "custom_components",
+        "custom_components.bulgarian_utility_outage_checker",
+    ):
+        if name not in sys.modules:
+            package = types.ModuleType(name)
+            package.__path__ = [str(ROOT.joinpath(*name.split(".")))]
+            sys.modules[name] = package
+
+try:
+    import pytest_homeassistant_custom_component  # noqa: F401
+except ImportError:
+    pass
+else:
+    from collections.abc import AsyncGenerator, Generator
+    from dataclasses import replace
+    import threading
+    from unittest.mock import patch
+
+    from homeassistant.core import HomeAssistant
+    import pytest
+
+    from .common import FakeUpstream
+
+    @pytest.fixture
+    def upstream() -> Generator[FakeUpstream, None, None]:
+        """Serve saved pages instead of the provider website.
+
+        The site's request rate limit is lifted; the saved pages need no
+        politeness.
+        """
+        # pylint: disable-next=import-outside-toplevel
+        from custom_components.bulgarian_utility_outage_checker.client import (
+            OutageHttpClient,
+        )
+
+        # pylint: disable-next=import-outside-toplevel
+        from custom_components.bulgarian_utility_outage_checker.providers.erm_west import (
+            ErmWestProvider,
+        )
+
+        fake = FakeUpstream()
+        capabilities = replace(ErmWestProvider.capabilities, requests_per_second=1000)
+        with patch.object(
+            OutageHttpClient, "async_fetch", autospec=True, side_effect=fake.async_fetch
+        ), patch.object(ErmWestProvider, "capabilities", capabilities):
+            yield fake
+
+    @pytest.fixture
+    async def config_dir(
+        hass: HomeAssistant, tmp_path: Path
+    ) -> AsyncGenerator[Path, None]:
+        """Give the test instance a config directory with ``.storage``.
+
+        The history database lives in ``.storage``, which the default
+        test config directory lacks. The history thread is closed and
+        joined afterwards, so it does not outlive the test.
+        """
+        # pylint: disable-next=import-outside-toplevel
+        from custom_components.bulgarian_utility_outage_checker.const import (
+            DATA_HISTORY,
+            DOMAIN,
+        )
+
+        (tmp_path / ".storage").mkdir()
+        hass.config.config_dir = str(tmp_path)
+        yield tmp_path
+
+        if (history := hass.data.get(DOMAIN, {}).pop(DATA_HISTORY, None)) is not None:
+            history.close()
+        for thread in threading.enumerate():
+            if thread.name.startswith(f"{DOMAIN}_history"):
+                await hass.async_add_executor_job(thread.join)
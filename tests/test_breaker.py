@@ -0,0 +1,70 @@
+"""Tests for the per-host circuit breaker."""
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+# pylint: disable-next=wrong-import-position
+from custom_components.bulgarian_utility_outage_checker.breaker import (  # noqa: E402
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+def _open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker("host", 2, 0, 0)
+    for _ in range(2):
+        breaker.before_request()
+        breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    return breaker
+
+
+def test_opens_after_threshold() -> None:
+    """Consecutive failures open the circuit and reject requests."""
+    breaker = CircuitBreaker("host", 2, 60, 600)
+    breaker.record_failure()
+    assert breaker.state == STATE_CLOSED
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    assert breaker.rejected == 1
+
+
+def test_probe_success_closes() -> None:
+    """A successful probe closes the circuit."""
+    breaker = _open_breaker()
+    breaker.before_request()
+    assert breaker.state == STATE_HALF_OPEN
+
+    breaker.record_success()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.failures == 0
+
+
+def test_cancelled_probe_allows_next_probe() -> None:
+    """A probe without an outcome neither closes nor blocks the circuit."""
+    breaker = _open_breaker()
+    breaker.before_request()
+    breaker.cancel_probe()
+    assert breaker.state == STATE_OPEN
+    assert breaker.failures == 2
+
+    breaker.before_request()
+    assert breaker.state == STATE_HALF_OPEN
+
+
+def test_cancel_probe_when_closed() -> None:
+    """Without a probe in flight nothing changes."""
+    breaker = CircuitBreaker("host", 2, 60, 600)
+    breaker.record_failure()
+    breaker.cancel_probe()
+
+    assert breaker.state == STATE_CLOSED
+    assert breaker.failures == 1
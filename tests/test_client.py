@@ -0,0 +1,46 @@
+"""Tests for the shared HTTP client."""
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+# pylint: disable-next=wrong-import-position
+from custom_components.bulgarian_utility_outage_checker.client import (  # noqa: E402
+    _body_encoding,
+    _feed_encoding,
+)
+
+META_1251 = b'<html><head><meta charset="windows-1251"></head>'
+HTTP_EQUIV_1251 = (
+    b'<meta http-equiv="Content-Type" content="text/html; charset=windows-1251">'
+)
+
+
+@pytest.mark.parametrize(
+    ("charset", "head", "expected"),
+    [
+        ("cp1251", META_1251, "cp1251"),
+        (None, META_1251, "cp1251"),
+        (None, HTTP_EQUIV_1251, "cp1251"),
+        (None, b'<meta charset="no-such-codec">', "utf-8"),
+        (None, b"<html><body>", "utf-8"),
+    ],
+)
+def test_body_encoding(charset: str | None, head: bytes, expected: str) -> None:
+    """The header charset wins, then the meta tag, then UTF-8."""
+    assert _body_encoding(charset, head) == expected
+
+
+@pytest.mark.parametrize(
+    ("charset", "head", "expected"),
+    [
+        ("cp1251", META_1251, "cp1251"),
+        (None, META_1251, None),
+        (None, HTTP_EQUIV_1251, None),
+        (None, b"<html><body>", "utf-8"),
+    ],
+)
+def test_feed_encoding(charset: str | None, head: bytes, expected: str | None) -> None:
+    """A page that declares its charset is left to lxml to decode."""
+    assert _feed_encoding(charset, head) == expected
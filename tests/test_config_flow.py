@@ -0,0 +1,216 @@
+"""Tests for the config and options flows."""
+from __future__ import annotations
+
+from collections.abc import Generator
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+# pylint: disable=wrong-import-position
+from pytest_homeassistant_custom_component.common import MockConfigEntry  # noqa: E402
+
+from homeassistant import config_entries  # noqa: E402
+from homeassistant.const import CONF_NAME  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.data_entry_flow import FlowResultType  # noqa: E402
+
+from custom_components.bulgarian_utility_outage_checker.config_flow import (  # noqa: E402
+    parse_identifiers,
+)
+from custom_components.bulgarian_utility_outage_checker.const import (  # noqa: E402
+    CONF_ADAPTIVE_POLLING,
+    CONF_CHECK_INTERVAL,
+    CONF_IDENTIFIER,
+    CONF_IDENTIFIERS,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_PROVIDER,
+    DOMAIN,
+    PROVIDER_ENERGOHOLD,
+)
+
+IDENTIFIER = "300012345678"
+
+
+@pytest.fixture(autouse=True)
+def mock_setup_entry() -> Generator[None, None, None]:
+    """Keep created entries from polling."""
+    with patch(
+        "custom_components.bulgarian_utility_outage_checker.async_setup_entry",
+        return_value=True,
+    ):
+        yield
+
+
+async def _start_flow(hass: HomeAssistant, mode: str) -> str:
+    """Pick the provider and a mode; return the flow id."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "user"
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_PROVIDER: PROVIDER_ENERGOHOLD}
+    )
+    assert result["type"] == FlowResultType.MENU
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": mode}
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == mode
+    return result["flow_id"]
+
+
+async def test_single_identifier(
+    hass: HomeAssistant, enable_custom_integrations: None
+) -> None:
+    """The identifier step creates a single entry."""
+    flow_id = await _start_flow(hass, "identifier")
+    result = await hass.config_entries.flow.async_configure(
+        flow_id, {CONF_IDENTIFIER: IDENTIFIER, CONF_CHECK_INTERVAL: 30}
+    )
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"] == {
+        CONF_PROVIDER: PROVIDER_ENERGOHOLD,
+        CONF_IDENTIFIER: IDENTIFIER,
+        CONF_CHECK_INTERVAL: 30,
+    }
+    assert (
+        result["result"].unique_id
+        == f"bulgarian_outage_{PROVIDER_ENERGOHOLD}_{IDENTIFIER}"
+    )
+
+
+async def test_duplicate_identifier_aborts(
+    hass: HomeAssistant, enable_custom_integrations: None
+) -> None:
+    """An identifier is configured only once per provider."""
+    MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=f"bulgarian_outage_{PROVIDER_ENERGOHOLD}_{IDENTIFIER}",
+        data={CONF_PROVIDER: PROVIDER_ENERGOHOLD, CONF_IDENTIFIER: IDENTIFIER},
+    ).add_to_hass(hass)
+
+    flow_id = await _start_flow(hass, "identifier")
+    result = await hass.config_entries.flow.async_configure(
+        flow_id, {CONF_IDENTIFIER: IDENTIFIER}
+    )
+
+    assert result["type"] == FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+
+
+async def test_hub(hass: HomeAssistant, enable_custom_integrations: None) -> None:
+    """The hub step parses the pasted list."""
+    flow_id = await _start_flow(hass, "hub")
+    result = await hass.config_entries.flow.async_configure(
+        flow_id, {CONF_NAME: "Home", CONF_IDENTIFIERS: "# export\n1;a\n2\n1\n\n"}
+    )
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"][CONF_IDENTIFIERS] == ["1", "2"]
+    assert result["result"].unique_id == f"bulgarian_outage_{PROVIDER_ENERGOHOLD}_hub_Home"
+
+
+async def test_hub_needs_identifiers(
+    hass: HomeAssistant, enable_custom_integrations: None
+) -> None:
+    """A hub without identifiers is rejected."""
+    flow_id = await _start_flow(hass, "hub")
+    result = await hass.config_entries.flow.async_configure(
+        flow_id, {CONF_NAME: "Home", CONF_IDENTIFIERS: "# nothing here\n"}
+    )
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {CONF_IDENTIFIERS: "no_identifiers"}
+
+
+def test_parse_identifiers() -> None:
+    """CSV exports keep their first column; commas stay."""
+    assert parse_identifiers('"1"\t"Sofia, 1"\n2;x\n# comment\n 3 \n2') == [
+        "1",
+        "2",
+        "3",
+    ]
+
+
+async def test_options(hass: HomeAssistant, enable_custom_integrations: None) -> None:
+    """The options flow stores the polling settings."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_PROVIDER: PROVIDER_ENERGOHOLD,
+            CONF_IDENTIFIER: IDENTIFIER,
+            CONF_CHECK_INTERVAL: 60,
+        },
+    )
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] == FlowResultType.FORM
+    assert CONF_IDENTIFIERS not in result["data_schema"].schema
+
+    options = {
+        CONF_CHECK_INTERVAL: 30,
+        CONF_ADAPTIVE_POLLING: True,
+        CONF_MIN_INTERVAL: 10,
+        CONF_MAX_INTERVAL: 120,
+    }
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], options
+    )
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert entry.options == options
+
+
+async def test_options_reject_min_above_max(
+    hass: HomeAssistant, enable_custom_integrations: None
+) -> None:
+    """The minimum interval may not exceed the maximum."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_PROVIDER: PROVIDER_ENERGOHOLD, CONF_IDENTIFIER: IDENTIFIER},
+    )
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_MIN_INTERVAL: 120, CONF_MAX_INTERVAL: 60}
+    )
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"base": "min_above_max"}
+
+
+async def test_hub_options_replace_identifiers(
+    hass: HomeAssistant, enable_custom_integrations: None
+) -> None:
+    """Hub options take a new list, which may not be empty."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_PROVIDER: PROVIDER_ENERGOHOLD,
+            CONF_NAME: "Home",
+            CONF_IDENTIFIERS: ["1", "2"],
+        },
+    )
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_IDENTIFIERS: "\n"}
+    )
+    assert result["errors"] == {CONF_IDENTIFIERS: "no_identifiers"}
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_IDENTIFIERS: "2\n3"}
+    )
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert entry.options[CONF_IDENTIFIERS] == ["2", "3"]
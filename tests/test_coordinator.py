@@ -0,0 +1,259 @@
+"""Tests for refreshing config entries through the coordinator."""
+from __future__ import annotations
+
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+# pylint: disable=wrong-import-position
+import aiohttp  # noqa: E402
+from freezegun.api import FrozenDateTimeFactory  # noqa: E402
+from pytest_homeassistant_custom_component.common import (  # noqa: E402
+    MockConfigEntry,
+    async_capture_events,
+)
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers import entity_registry as er  # noqa: E402
+
+from custom_components.bulgarian_utility_outage_checker.const import (  # noqa: E402
+    ADAPTIVE_FAST_POLLS,
+    CONF_ADAPTIVE_POLLING,
+    CONF_CHECK_INTERVAL,
+    CONF_IDENTIFIER,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_PROVIDER,
+    DOMAIN,
+    EVENT_OUTAGE_RESOLVED,
+    EVENT_OUTAGE_SCHEDULED,
+    EVENT_OUTAGE_STARTED,
+    EVENT_OUTAGE_UPDATED,
+    PROVIDER_ENERGOHOLD,
+)
+
+from .common import FakeUpstream  # noqa: E402
+
+IDENTIFIER = "300012345678"
+
+
+async def _setup_entry(
+    hass: HomeAssistant, options: dict[str, Any] | None = None
+) -> MockConfigEntry:
+    """Set up a single-identifier entry polled every 60 minutes."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=IDENTIFIER,
+        unique_id=f"bulgarian_outage_{PROVIDER_ENERGOHOLD}_{IDENTIFIER}",
+        data={
+            CONF_PROVIDER: PROVIDER_ENERGOHOLD,
+            CONF_IDENTIFIER: IDENTIFIER,
+            CONF_CHECK_INTERVAL: 60,
+        },
+        options=options or {},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+def _entity_id(hass: HomeAssistant, entry: MockConfigEntry, platform: str, key: str) -> str:
+    """Return the entity id of one of the entry's entities."""
+    entity_id = er.async_get(hass).async_get_entity_id(
+        platform, DOMAIN, f"{entry.entry_id}_{key}"
+    )
+    assert entity_id is not None
+    return entity_id
+
+
+async def test_failed_refreshes_keep_data_age_moving(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    config_dir: Path,
+    upstream: FakeUpstream,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Every failed refresh publishes the stale flag and the data age."""
+    entry = await _setup_entry(hass)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    status = _entity_id(hass, entry, "sensor", "status")
+    last_check = _entity_id(hass, entry, "sensor", "last_check")
+    assert hass.states.get(status).attributes["stale"] is False
+
+    upstream.error = aiohttp.ClientConnectionError("connection refused")
+    ages = []
+    for _ in range(3):
+        freezer.tick(timedelta(minutes=10))
+        await coordinator.async_refresh_identifier(IDENTIFIER)
+        await hass.async_block_till_done()
+        ages.append(hass.states.get(last_check).attributes["data_age"])
+
+    assert hass.states.get(status).attributes["stale"] is True
+    assert ages == sorted(ages)
+    assert ages[0] < ages[-1]
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_refresh_after_stop_skips_the_closed_history(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    config_dir: Path,
+    upstream: FakeUpstream,
+    freezer: FrozenDateTimeFactory,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """A refresh finishing after the stop event does not touch the history."""
+    entry = await _setup_entry(hass)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    history = coordinator.history
+    assert history is not None
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_block_till_done()
+    assert history.closed
+    assert coordinator.history is None
+
+    upstream.page = "unplanned.html"
+    freezer.tick(timedelta(minutes=10))
+    await coordinator.async_refresh_identifier(IDENTIFIER)
+    await hass.async_block_till_done()
+
+    assert coordinator.data[IDENTIFIER]["has_outage"] is True
+    assert "Could not record outage history" not in caplog.text
+    await history.async_record_state(IDENTIFIER, True, "unplanned", [], freezer())
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_adaptive_polling_follows_outages(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    config_dir: Path,
+    upstream: FakeUpstream,
+) -> None:
+    """Outages poll at the minimum interval; quiet pages back off."""
+    entry = await _setup_entry(
+        hass,
+        {CONF_ADAPTIVE_POLLING: True, CONF_MIN_INTERVAL: 5, CONF_MAX_INTERVAL: 240},
+    )
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    slice_ = coordinator.slices[IDENTIFIER]
+
+    async def _interval_after(page: str) -> timedelta:
+        upstream.page = page
+        await coordinator.async_refresh_identifier(IDENTIFIER)
+        return slice_.current_interval
+
+    assert await _interval_after("unplanned.html") == timedelta(minutes=5)
+    assert await _interval_after("unplanned.html") == timedelta(minutes=5)
+    # Right after an outage ends a few polls stay fast
+    for _ in range(ADAPTIVE_FAST_POLLS):
+        assert await _interval_after("no_outage.html") == timedelta(minutes=5)
+    quiet = [await _interval_after("no_outage.html") for _ in range(4)]
+
+    assert quiet == [timedelta(minutes=minutes) for minutes in (60, 120, 240, 240)]
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_failure_keeps_the_last_result(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    config_dir: Path,
+    upstream: FakeUpstream,
+) -> None:
+    """A failed refresh keeps serving the last result, marked stale."""
+    upstream.page = "unplanned.html"
+    entry = await _setup_entry(hass)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    slice_ = coordinator.slices[IDENTIFIER]
+    outage = _entity_id(hass, entry, "binary_sensor", "outage")
+    before = hass.states.get(outage).state
+
+    upstream.error = aiohttp.ClientConnectionError("connection refused")
+    await coordinator.async_refresh_identifier(IDENTIFIER)
+    await hass.async_block_till_done()
+
+    assert not slice_.last_update_success
+    assert slice_.data["has_outage"] is True
+    # Without adaptive polling a failure waits for the regular interval
+    assert slice_.current_interval == timedelta(minutes=60)
+    state = hass.states.get(outage)
+    assert state.state == before
+    assert state.attributes["stale"] is True
+
+    upstream.error = None
+    await coordinator.async_refresh_identifier(IDENTIFIER)
+    await hass.async_block_till_done()
+
+    assert slice_.last_update_success
+    assert hass.states.get(outage).attributes["stale"] is False
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_outage_events(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    config_dir: Path,
+    upstream: FakeUpstream,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Each outage fires scheduled, started and resolved once."""
+    # Between the unplanned outage of 12 October and the planned ones
+    freezer.move_to("2026-10-13T12:00:00+03:00")
+    entry = await _setup_entry(hass)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    events = {
+        event_type: async_capture_events(hass, event_type)
+        for event_type in (
+            EVENT_OUTAGE_SCHEDULED,
+            EVENT_OUTAGE_STARTED,
+            EVENT_OUTAGE_UPDATED,
+            EVENT_OUTAGE_RESOLVED,
+        )
+    }
+
+    async def _refresh(page: str) -> dict[str, int]:
+        # The loop clock is frozen too; step past the rate limiter's slot
+        freezer.tick(timedelta(minutes=1))
+        upstream.page = page
+        await coordinator.async_refresh_identifier(IDENTIFIER)
+        await hass.async_block_till_done()
+        counts = {event_type: len(fired) for event_type, fired in events.items()}
+        for fired in events.values():
+            fired.clear()
+        return counts
+
+    assert await _refresh("both.html") == {
+        EVENT_OUTAGE_SCHEDULED: 2,
+        EVENT_OUTAGE_STARTED: 1,
+        EVENT_OUTAGE_UPDATED: 0,
+        EVENT_OUTAGE_RESOLVED: 0,
+    }
+    # Nothing changed, nothing fires again
+    assert not any((await _refresh("both.html")).values())
+
+    freezer.move_to("2026-10-14T10:00:00+03:00")
+    assert await _refresh("both.html") == {
+        EVENT_OUTAGE_SCHEDULED: 0,
+        EVENT_OUTAGE_STARTED: 1,
+        EVENT_OUTAGE_UPDATED: 0,
+        EVENT_OUTAGE_RESOLVED: 0,
+    }
+
+    assert await _refresh("no_outage.html") == {
+        EVENT_OUTAGE_SCHEDULED: 0,
+        EVENT_OUTAGE_STARTED: 0,
+        EVENT_OUTAGE_UPDATED: 0,
+        EVENT_OUTAGE_RESOLVED: 3,
+    }
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
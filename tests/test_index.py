@@ -0,0 +1,167 @@
+"""Tests for the domain-wide outage index."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from custom_components.bulgarian_utility_outage_checker.const import (
+    OUTAGE_TYPE_PLANNED,
+    OUTAGE_TYPE_UNPLANNED,
+)
+from custom_components.bulgarian_utility_outage_checker.models import OutageRecord
+
+pytest.importorskip("homeassistant")
+
+# pylint: disable-next=wrong-import-position
+from custom_components.bulgarian_utility_outage_checker.index import (  # noqa: E402
+    OutageIndex,
+)
+
+NOW = datetime(2026, 10, 14, 12, 0, tzinfo=timezone.utc)
+
+
+def _record(
+    outage_id: str, start_hours: float, hours: float | None, area: str = "Перник"
+) -> OutageRecord:
+    start = NOW + timedelta(hours=start_hours)
+    return OutageRecord(
+        outage_id=outage_id,
+        outage_type=OUTAGE_TYPE_PLANNED,
+        area=area,
+        start=start,
+        end=None if hours is None else start + timedelta(hours=hours),
+    )
+
+
+def _ids(index: OutageIndex, start: datetime, end: datetime) -> list[str]:
+    return [outage["outage_id"] for outage in index.query(start=start, end=end)]
+
+
+def test_duplicate_outage_in_one_update() -> None:
+    """An outage listed twice on one page is indexed once."""
+    index = OutageIndex()
+    outage = _record("a", 0, 2)
+
+    index.async_update("1", [outage, outage])
+    assert len(index) == 1
+    assert _ids(index, NOW, NOW + timedelta(hours=1)) == ["a"]
+
+    index.async_update("1", [])
+    assert len(index) == 0
+    assert _ids(index, NOW, NOW + timedelta(hours=1)) == []
+
+
+def test_shared_outage_owners() -> None:
+    """An outage stays indexed while any identifier lists it."""
+    index = OutageIndex()
+    outage = _record("a", 0, 2)
+
+    index.async_update("1", [outage])
+    index.async_update("2", [outage])
+    assert index.query()[0]["identifiers"] == ["1", "2"]
+
+    index.async_remove_identifier("1")
+    assert index.query()[0]["identifiers"] == ["2"]
+    assert index.affected_identifiers(NOW + timedelta(hours=1)) == {"2"}
+
+
+def test_max_duration_shrinks_on_removal() -> None:
+    """Removing the longest outage narrows the scanned start range."""
+    index = OutageIndex()
+    index.async_update("1", [_record("long", -48, 50)])
+    index.async_update("2", [_record("short", 0, 1)])
+    assert index._max_duration == timedelta(hours=50)
+
+    index.async_remove_identifier("1")
+    assert index._max_duration == timedelta(hours=1)
+    assert _ids(index, NOW, NOW) == ["short"]
+
+
+def test_extended_outage_is_reindexed() -> None:
+    """A new end time for a listed outage updates the time index."""
+    index = OutageIndex()
+    index.async_update("1", [_record("a", 0, 1)])
+    assert _ids(index, NOW + timedelta(hours=3), NOW + timedelta(hours=4)) == []
+
+    index.async_update("1", [_record("a", 0, 5)])
+    assert _ids(index, NOW + timedelta(hours=3), NOW + timedelta(hours=4)) == ["a"]
+    assert index._max_duration == timedelta(hours=5)
+
+
+def test_open_ended_outages() -> None:
+    """Outages without an end overlap every window after their start."""
+    index = OutageIndex()
+    index.async_update("1", [_record("ongoing", -100, None)])
+    index.async_update("2", [_record("later", 10, None)])
+    index.async_update("3", [_record("closed", -5, 1)])
+
+    assert _ids(index, NOW, NOW) == ["ongoing"]
+    assert _ids(index, NOW, NOW + timedelta(hours=24)) == ["ongoing", "later"]
+    assert index.affected_identifiers(NOW - timedelta(hours=4)) == {"1", "3"}
+
+    index.async_remove_identifier("1")
+    assert _ids(index, NOW, NOW + timedelta(hours=24)) == ["later"]
+
+
+def test_locality_filter() -> None:
+    """Localities match case-insensitively on the first part of the area."""
+    index = OutageIndex()
+    index.async_update(
+        "1",
+        [_record("a", 0, 1, "Перник, кв. Изток"), _record("b", 0, 1, "Радомир")],
+    )
+
+    assert [outage["outage_id"] for outage in index.query(locality="перник")] == [
+        "a"
+    ]
+
+
+def test_half_open_queries() -> None:
+    """A query with one bound is open on the other side."""
+    index = OutageIndex()
+    index.async_update(
+        "1",
+        [
+            _record("past", -10, 2),
+            _record("current", -1, 2),
+            _record("future", 24, 2),
+            _record("ongoing", -100, None),
+        ],
+    )
+
+    after = [outage["outage_id"] for outage in index.query(start=NOW)]
+    before = [outage["outage_id"] for outage in index.query(end=NOW)]
+
+    assert after == ["ongoing", "current", "future"]
+    assert before == ["ongoing", "past", "current"]
+
+
+def test_outages_without_start_count_as_started() -> None:
+    """Outages without a start time are in progress until they end."""
+    index = OutageIndex()
+    unstarted = OutageRecord(
+        outage_id="unstarted",
+        outage_type=OUTAGE_TYPE_UNPLANNED,
+        area="Перник",
+        start=None,
+        end=NOW + timedelta(hours=2),
+    )
+    open_ended = OutageRecord(
+        outage_id="open",
+        outage_type=OUTAGE_TYPE_UNPLANNED,
+        area="Радомир",
+        start=None,
+        end=None,
+    )
+    index.async_update("1", [unstarted])
+    index.async_update("2", [open_ended])
+
+    assert index.affected_identifiers(NOW) == {"1", "2"}
+    assert index.affected_identifiers(NOW + timedelta(hours=3)) == {"2"}
+    assert _ids(index, NOW - timedelta(days=1), NOW) == ["open", "unstarted"]
+
+    index.async_remove_identifier("1")
+    index.async_remove_identifier("2")
+    assert index.affected_identifiers(NOW) == set()
+    assert len(index) == 0
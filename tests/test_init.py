@@ -0,0 +1,67 @@
+"""Tests for setting up and reloading config entries."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+# pylint: disable=wrong-import-position
+from pytest_homeassistant_custom_component.common import MockConfigEntry  # noqa: E402
+
+from homeassistant.const import CONF_NAME  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.bulgarian_utility_outage_checker.const import (  # noqa: E402
+    CONF_CHECK_INTERVAL,
+    CONF_IDENTIFIERS,
+    CONF_PROVIDER,
+    DATA_STORE,
+    DOMAIN,
+    PROVIDER_ENERGOHOLD,
+)
+
+from .common import FakeUpstream  # noqa: E402
+
+KEPT = "300012345678"
+REMOVED = "300087654321"
+
+
+async def test_reload_prunes_removed_identifiers(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    config_dir: Path,
+    upstream: FakeUpstream,
+) -> None:
+    """Identifiers removed from a hub lose their cached state."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="ERM West - Home",
+        unique_id=f"bulgarian_outage_{PROVIDER_ENERGOHOLD}_hub_Home",
+        data={
+            CONF_PROVIDER: PROVIDER_ENERGOHOLD,
+            CONF_NAME: "Home",
+            CONF_IDENTIFIERS: [KEPT, REMOVED],
+            CONF_CHECK_INTERVAL: 60,
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    for identifier in (KEPT, REMOVED):
+        await coordinator.async_refresh_identifier(identifier)
+    store = hass.data[DOMAIN][DATA_STORE]
+    assert store.get(KEPT) is not None
+    assert store.get(REMOVED) is not None
+
+    hass.config_entries.async_update_entry(entry, options={CONF_IDENTIFIERS: [KEPT]})
+    await hass.async_block_till_done()
+
+    assert hass.data[DOMAIN][entry.entry_id].identifiers == [KEPT]
+    assert store.get(KEPT) is not None
+    assert store.get(REMOVED) is None
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    assert store.get(KEPT) is not None
@@ -0,0 +1,53 @@
+"""Tests for the outage data models."""
+from __future__ import annotations
+
+from custom_components.bulgarian_utility_outage_checker.const import (
+    OUTAGE_TYPE_PLANNED,
+)
+from custom_components.bulgarian_utility_outage_checker.models import (
+    OutageRecord,
+    decode_result,
+    encode_result,
+    number_outages,
+)
+
+START = "14.10.2026 09:00"
+
+
+def _row(end: str, area: str = "Перник, ул. Струма 1-25") -> OutageRecord:
+    return OutageRecord.from_cells(OUTAGE_TYPE_PLANNED, [area, START, end])
+
+
+def test_id_ignores_end_time() -> None:
+    """An extended outage keeps its id."""
+    assert _row("14.10.2026 16:00").outage_id == _row("14.10.2026 18:00").outage_id
+
+
+def test_rows_differing_in_end_get_unique_ids() -> None:
+    """Rows that share type, area and start are numbered by end time."""
+    early, late = _row("14.10.2026 12:00"), _row("14.10.2026 16:00")
+
+    forward = number_outages([early, late])
+    backward = number_outages([late, early])
+
+    assert len({outage.outage_id for outage in forward}) == 2
+    assert forward[0].outage_id == early.outage_id
+    # Ids follow the rows, not their position on the page
+    assert {outage.outage_id: outage for outage in forward} == {
+        outage.outage_id: outage for outage in backward
+    }
+
+
+def test_unique_rows_are_unchanged() -> None:
+    """Pages without colliding rows are returned as is."""
+    outages = [_row("14.10.2026 16:00"), _row("14.10.2026 16:00", "Радомир")]
+
+    assert number_outages(outages) is outages
+
+
+def test_stored_result_keeps_ids() -> None:
+    """A result restored from storage has the ids it was stored with."""
+    outages = number_outages([_row("14.10.2026 16:00"), _row("14.10.2026 12:00")])
+    data = {"outage_type": OUTAGE_TYPE_PLANNED, "outages": outages}
+
+    assert decode_result(encode_result(data))["outages"] == outages
@@ -0,0 +1,139 @@
+"""Tests for the ERM West page parsers."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.bulgarian_utility_outage_checker.const import (
+    OUTAGE_TYPE_BOTH,
+    OUTAGE_TYPE_NONE,
+    OUTAGE_TYPE_PLANNED,
+    OUTAGE_TYPE_UNPLANNED,
+    PARSER_ENGINE_LXML,
+    PARSER_ENGINE_SOUP,
+    PROVIDER_ENERGOHOLD,
+)
+from custom_components.bulgarian_utility_outage_checker.parser import (
+    OutagePageFeed,
+    parse_outage_html,
+)
+
+from .common import fixture_names, load_fixture, load_fixture_bytes, stable
+
+pytest.importorskip("lxml")
+pytest.importorskip("bs4")
+
+IDENTIFIER = "300012345678"
+PAGES = fixture_names(PROVIDER_ENERGOHOLD)
+
+
+def _assert_engines_agree(html: str) -> None:
+    """Assert both engines return the same result for ``html``."""
+    lxml_result = parse_outage_html(html, IDENTIFIER, PARSER_ENGINE_LXML)
+    soup_result = parse_outage_html(html, IDENTIFIER, PARSER_ENGINE_SOUP)
+    assert stable(lxml_result) == stable(soup_result)
+
+
+@pytest.mark.parametrize(
+    ("name", "has_outage", "outage_type", "count"),
+    [
+        ("no_outage.html", False, OUTAGE_TYPE_NONE, 0),
+        ("planned.html", True, OUTAGE_TYPE_PLANNED, 2),
+        ("unplanned.html", True, OUTAGE_TYPE_UNPLANNED, 1),
+        ("both.html", True, OUTAGE_TYPE_BOTH, 3),
+    ],
+)
+@pytest.mark.parametrize("engine", [PARSER_ENGINE_LXML, PARSER_ENGINE_SOUP])
+def test_classification(
+    engine: str, name: str, has_outage: bool, outage_type: str, count: int
+) -> None:
+    """Each page is classified the same way by both engines."""
+    result = parse_outage_html(
+        load_fixture(PROVIDER_ENERGOHOLD, name), IDENTIFIER, engine
+    )
+
+    assert result["identifier"] == IDENTIFIER
+    assert result["has_outage"] is has_outage
+    assert result["outage_type"] == outage_type
+    assert len(result["outages"]) == count
+    assert result["details"] == [outage.summary for outage in result["outages"]]
+
+
+def test_outage_sections() -> None:
+    """Rows take the outage type of the heading before their table."""
+    html = load_fixture(PROVIDER_ENERGOHOLD, "both.html")
+    result = parse_outage_html(html, IDENTIFIER)
+
+    assert [outage.outage_type for outage in result["outages"]] == [
+        OUTAGE_TYPE_UNPLANNED,
+        OUTAGE_TYPE_PLANNED,
+        OUTAGE_TYPE_PLANNED,
+    ]
+
+
+@pytest.mark.parametrize("name", PAGES)
+def test_engine_parity(name: str) -> None:
+    """The lxml engine returns exactly what the soup engine returns."""
+    _assert_engines_agree(load_fixture(PROVIDER_ENERGOHOLD, name))
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        # Unclosed cells and rows
+        "<table><tr><td>aaa bbb<td>ccc<tr><td>дддд ееее</table>",
+        # A table nested in a cell of a row that continues after it
+        "<h3>Планирани прекъсвания</h3><table><tr><td>Перник, кв. Изток"
+        "<table><tr><td>ул. Струма 1-25</td><td>14.10.2026 09:00</td></tr>"
+        "<tr><th>Край</th><td>14.10.2026 16:00</td></tr></table>"
+        "</td><td>Пояснения към графика</td></tr></table>",
+        # Nested tables that are never closed
+        "<table><tr><td>външна клетка<table><tr><td>вътрешна клетка"
+        "<table><tr><td>най-вътрешна клетка",
+    ],
+)
+def test_engine_parity_nested(html: str) -> None:
+    """Rows of nested and broken tables match the soup engine."""
+    _assert_engines_agree(html)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1024, 64 * 1024])
+@pytest.mark.parametrize("name", PAGES)
+def test_feed_parity(name: str, chunk_size: int) -> None:
+    """Feeding a page in chunks gives the same result as parsing it whole."""
+    body = load_fixture_bytes(PROVIDER_ENERGOHOLD, name)
+    feed = OutagePageFeed(IDENTIFIER)
+    for offset in range(0, len(body), chunk_size):
+        feed.feed(body[offset : offset + chunk_size])
+
+    assert stable(feed.close()) == stable(
+        parse_outage_html(body.decode("utf-8"), IDENTIFIER)
+    )
+
+
+def test_feed_stops_at_no_outage_marker() -> None:
+    """The feed reports a no-outage page as soon as the marker is parsed."""
+    body = load_fixture_bytes(PROVIDER_ENERGOHOLD, "no_outage.html")
+    marker = body.index("Няма регистрирано".encode()) + 200
+    feed = OutagePageFeed(IDENTIFIER)
+
+    assert feed.feed(body[:marker]) is True
+    assert feed.close()["has_outage"] is False
+
+
+def test_feed_without_chunks() -> None:
+    """An empty body closes to the default result."""
+    result = OutagePageFeed(IDENTIFIER).close()
+
+    assert result["has_outage"] is True
+    assert result["outages"] == []
+
+
+def test_feed_reads_meta_charset() -> None:
+    """Without an encoding the feed decodes as the page's meta tag says."""
+    html = load_fixture(PROVIDER_ENERGOHOLD, "no_outage.html").replace(
+        "charset=utf-8", "charset=windows-1251"
+    )
+    feed = OutagePageFeed(IDENTIFIER, None)
+    feed.feed(html.encode("cp1251"))
+
+    assert feed.close()["has_outage"] is False
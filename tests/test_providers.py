@@ -0,0 +1,65 @@
+"""Tests run against every registered provider and its saved pages."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.bulgarian_utility_outage_checker.providers import (
+    PROVIDER_REGISTRY,
+    OutageProvider,
+)
+
+from .common import (
+    fixture_names,
+    load_fixture,
+    load_fixture_bytes,
+    provider_pages,
+    stable,
+)
+
+pytest.importorskip("lxml")
+pytest.importorskip("bs4")
+
+IDENTIFIER = "300012345678"
+
+
+@pytest.mark.parametrize("key", sorted(PROVIDER_REGISTRY))
+def test_provider_has_fixtures(key: str) -> None:
+    """Every provider ships saved pages to test and benchmark against."""
+    assert fixture_names(key)
+
+
+@pytest.mark.parametrize(("key", "name"), provider_pages(PROVIDER_REGISTRY))
+def test_provider_feed_parity(key: str, name: str) -> None:
+    """A streaming provider's feed parser agrees with its ``parse``."""
+    provider = PROVIDER_REGISTRY[key]
+    if not provider.capabilities.supports_streaming_parse:
+        pytest.skip(f"{key} does not parse streams")
+
+    feed = provider.create_feed_parser(IDENTIFIER, "utf-8")
+    feed.feed(load_fixture_bytes(key, name))
+
+    assert stable(feed.close()) == stable(
+        provider.parse(load_fixture(key, name), IDENTIFIER)
+    )
+
+
+@pytest.mark.parametrize(("key", "name"), provider_pages(PROVIDER_REGISTRY))
+def test_default_feed_parser_parity(key: str, name: str) -> None:
+    """The base class feed parser buffers the page and agrees with ``parse``."""
+    pytest.importorskip("homeassistant")
+    provider = PROVIDER_REGISTRY[key]
+    body = load_fixture_bytes(key, name)
+
+    feed = OutageProvider.create_feed_parser(provider, IDENTIFIER, None)
+    for start in range(0, len(body), 4096):
+        assert not feed.feed(body[start : start + 4096])
+
+    assert stable(feed.close()) == stable(
+        provider.parse(load_fixture(key, name), IDENTIFIER)
+    )
+
+
+def test_provider_hooks_are_abstract() -> None:
+    """A provider must implement the request and parse hooks."""
+    with pytest.raises(TypeError):
+        OutageProvider()  # type: ignore[abstract]
@@ -0,0 +1,172 @@
+"""Tests for the domain-level fetch scheduler."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator
+from unittest.mock import Mock
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+# pylint: disable=wrong-import-position
+import aiohttp  # noqa: E402
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.bulgarian_utility_outage_checker.breaker import (  # noqa: E402
+    STATE_OPEN,
+    CircuitOpenError,
+)
+from custom_components.bulgarian_utility_outage_checker.client import (  # noqa: E402
+    BodyTooLargeError,
+    OutageHttpClient,
+)
+from custom_components.bulgarian_utility_outage_checker.const import (  # noqa: E402
+    BREAKER_FAILURE_THRESHOLD,
+)
+from custom_components.bulgarian_utility_outage_checker.providers import (  # noqa: E402
+    ProviderCapabilities,
+)
+from custom_components.bulgarian_utility_outage_checker.providers.erm_west import (  # noqa: E402
+    ErmWestProvider,
+)
+from custom_components.bulgarian_utility_outage_checker.scheduler import (  # noqa: E402
+    OutageFetchScheduler,
+)
+
+from .common import FakeUpstream  # noqa: E402
+
+IDENTIFIER = "300012345678"
+
+
+class FastProvider(ErmWestProvider):
+    """ERM West with two request slots and no meaningful rate limit."""
+
+    capabilities = ProviderCapabilities(max_concurrency=2, requests_per_second=1000)
+
+
+@pytest.fixture
+async def scheduler(
+    hass: HomeAssistant, upstream: FakeUpstream
+) -> AsyncGenerator[OutageFetchScheduler, None]:
+    """Return a scheduler fetching from the fake upstream."""
+    scheduler = OutageFetchScheduler(hass, OutageHttpClient())
+    yield scheduler
+    await scheduler.async_shutdown()
+
+
+def _response_error(status: int) -> aiohttp.ClientResponseError:
+    """Return the error aiohttp raises for an HTTP error status."""
+    return aiohttp.ClientResponseError(Mock(), (), status=status)
+
+
+async def test_concurrent_fetches_share_one_request(
+    scheduler: OutageFetchScheduler, upstream: FakeUpstream
+) -> None:
+    """Fetches of an identifier that is already being fetched join it."""
+    provider = FastProvider()
+    upstream.gate = asyncio.Event()
+    fetches = [
+        asyncio.ensure_future(scheduler.async_fetch(provider, IDENTIFIER))
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0.01)
+    upstream.gate.set()
+    results = await asyncio.gather(*fetches)
+
+    assert upstream.requests == [IDENTIFIER]
+    assert results[0] is results[1] is results[2]
+
+
+async def test_cancelled_caller_does_not_cancel_the_shared_fetch(
+    scheduler: OutageFetchScheduler, upstream: FakeUpstream
+) -> None:
+    """A caller giving up leaves the request running for the others."""
+    provider = FastProvider()
+    upstream.gate = asyncio.Event()
+    first = asyncio.ensure_future(scheduler.async_fetch(provider, IDENTIFIER))
+    second = asyncio.ensure_future(scheduler.async_fetch(provider, IDENTIFIER))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    upstream.gate.set()
+
+    assert (await second).body
+    assert upstream.requests == [IDENTIFIER]
+
+
+async def test_requests_stay_within_the_concurrency_limit(
+    scheduler: OutageFetchScheduler, upstream: FakeUpstream
+) -> None:
+    """No more requests than the provider's slots are open at once."""
+    provider = FastProvider()
+    upstream.gate = asyncio.Event()
+    fetches = [
+        asyncio.ensure_future(scheduler.async_fetch(provider, f"3000000000{i:02}"))
+        for i in range(6)
+    ]
+    await asyncio.sleep(0.05)
+    assert upstream.active == 2
+    upstream.gate.set()
+    await asyncio.gather(*fetches)
+
+    assert len(upstream.requests) == 6
+    assert upstream.max_active == 2
+
+
+@pytest.mark.parametrize(
+    ("error", "failures"),
+    [
+        (None, 0),
+        (_response_error(404), 0),
+        (BodyTooLargeError("too large"), 0),
+        (_response_error(503), 2),
+        (aiohttp.ClientConnectionError(), 2),
+        (asyncio.TimeoutError(), 2),
+        (ValueError("our side"), 1),
+    ],
+)
+async def test_breaker_classifies_outcomes(
+    scheduler: OutageFetchScheduler,
+    upstream: FakeUpstream,
+    error: BaseException | None,
+    failures: int,
+) -> None:
+    """Only outcomes that show the host is down count as failures.
+
+    The host already failed once: an answer from the host resets the
+    count, a failure adds to it and anything else leaves it alone.
+    """
+    provider = FastProvider()
+    upstream.error = aiohttp.ClientConnectionError()
+    with pytest.raises(aiohttp.ClientConnectionError):
+        await scheduler.async_fetch(provider, IDENTIFIER)
+
+    upstream.error = error
+    if error is None:
+        await scheduler.async_fetch(provider, IDENTIFIER)
+    else:
+        with pytest.raises(type(error)):
+            await scheduler.async_fetch(provider, IDENTIFIER)
+
+    (breaker,) = scheduler.breakers.values()
+    assert breaker.failures == failures
+
+
+async def test_open_circuit_rejects_without_a_request(
+    scheduler: OutageFetchScheduler, upstream: FakeUpstream
+) -> None:
+    """Once the host failed often enough, fetches fail fast."""
+    provider = FastProvider()
+    upstream.error = aiohttp.ClientConnectionError()
+    for _ in range(BREAKER_FAILURE_THRESHOLD):
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await scheduler.async_fetch(provider, IDENTIFIER)
+    (breaker,) = scheduler.breakers.values()
+    assert breaker.state == STATE_OPEN
+
+    with pytest.raises(CircuitOpenError) as err:
+        await scheduler.async_fetch(provider, IDENTIFIER)
+
+    assert err.value.retry_in > 0
+    assert len(upstream.requests) == BREAKER_FAILURE_THRESHOLD
@@ -0,0 +1,67 @@
+"""Tests for the size of the status attributes in state and recorder."""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import pytest
+
+from custom_components.bulgarian_utility_outage_checker.const import (
+    MAX_DETAILS_ATTRIBUTE,
+    PROVIDER_ENERGOHOLD,
+    STATUS_UNRECORDED_ATTRIBUTES,
+)
+from custom_components.bulgarian_utility_outage_checker.models import OutageSnapshot
+from custom_components.bulgarian_utility_outage_checker.parser import (
+    parse_outage_html,
+)
+
+from .common import fixture_names, load_fixture
+
+pytest.importorskip("lxml")
+
+# Whatever the page lists, a status state stays this small
+MAX_STATE_SIZE = 4096
+MAX_RECORDED_SIZE = 512
+
+
+def _serialized_size(attributes: dict[str, Any]) -> int:
+    """Return the size of attributes serialized the way the recorder does."""
+    return len(
+        json.dumps(attributes, ensure_ascii=False, separators=(",", ":")).encode()
+    )
+
+
+def _status_attributes(name: str) -> dict[str, Any]:
+    """Return the status sensor attributes for a saved page."""
+    data = parse_outage_html(load_fixture(PROVIDER_ENERGOHOLD, name), "300012345678")
+    return OutageSnapshot.from_result(data, stale=False, data_age=0).attributes
+
+
+def _recorded(attributes: dict[str, Any]) -> dict[str, Any]:
+    """Return the attributes the recorder keeps."""
+    return {
+        key: value
+        for key, value in attributes.items()
+        if key not in STATUS_UNRECORDED_ATTRIBUTES
+    }
+
+
+@pytest.mark.parametrize("name", fixture_names(PROVIDER_ENERGOHOLD))
+def test_recorded_status_size(name: str) -> None:
+    """The recorded status attributes do not grow with the outage list."""
+    assert _serialized_size(_recorded(_status_attributes(name))) <= MAX_RECORDED_SIZE
+
+
+@pytest.mark.parametrize("name", fixture_names(PROVIDER_ENERGOHOLD))
+def test_status_state_size(name: str) -> None:
+    """The status state does not grow with the outage list either."""
+    assert _serialized_size(_status_attributes(name)) <= MAX_STATE_SIZE
+
+
+def test_large_incident_details_capped() -> None:
+    """A large incident lists its first outages; the count has the total."""
+    attributes = _status_attributes("large_incident.html")
+
+    assert len(attributes["details"]) == MAX_DETAILS_ATTRIBUTE
+    assert attributes["outage_count"] == 700
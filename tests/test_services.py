@@ -0,0 +1,138 @@
+"""Tests for the integration services."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+# pylint: disable=wrong-import-position
+from freezegun.api import FrozenDateTimeFactory  # noqa: E402
+from pytest_homeassistant_custom_component.common import (  # noqa: E402
+    MockConfigEntry,
+    MockUser,
+    async_fire_time_changed,
+)
+
+from homeassistant.core import Context, HomeAssistant  # noqa: E402
+from homeassistant.exceptions import Unauthorized  # noqa: E402
+import homeassistant.util.dt as dt_util  # noqa: E402
+
+from custom_components.bulgarian_utility_outage_checker.const import (  # noqa: E402
+    CONF_CHECK_INTERVAL,
+    CONF_IDENTIFIER,
+    CONF_PROVIDER,
+    DATA_PROFILER,
+    DOMAIN,
+    PROVIDER_ENERGOHOLD,
+    SERVICE_PROFILE,
+)
+
+from .common import FakeUpstream  # noqa: E402
+
+IDENTIFIER = "300012345678"
+STATUS_ENTITY = f"binary_sensor.bulgarian_utility_outage_checker_{IDENTIFIER}_status"
+
+
+async def _setup_entry(hass: HomeAssistant) -> MockConfigEntry:
+    """Set up a single-identifier entry polled every 60 minutes."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=IDENTIFIER,
+        unique_id=f"bulgarian_outage_{PROVIDER_ENERGOHOLD}_{IDENTIFIER}",
+        data={
+            CONF_PROVIDER: PROVIDER_ENERGOHOLD,
+            CONF_IDENTIFIER: IDENTIFIER,
+            CONF_CHECK_INTERVAL: 60,
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def _async_wait_for_profiler(hass: HomeAssistant) -> None:
+    """Yield to the loop until a profiling run has started."""
+    while hass.data[DOMAIN].get(DATA_PROFILER) is None:
+        await asyncio.sleep(0)
+
+
+async def test_profile_waits_for_scheduled_refreshes(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    config_dir: Path,
+    upstream: FakeUpstream,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Profiling does not refresh early and ends after the next refresh."""
+    entry = await _setup_entry(hass)
+    requests = len(upstream.requests)
+
+    call = hass.async_create_task(
+        hass.services.async_call(
+            DOMAIN, SERVICE_PROFILE, {"entity_id": STATUS_ENTITY}, blocking=True
+        )
+    )
+    await _async_wait_for_profiler(hass)
+    assert len(upstream.requests) == requests
+
+    freezer.tick(timedelta(minutes=61))
+    async_fire_time_changed(hass)
+    await call
+
+    assert len(upstream.requests) == requests + 1
+    assert len(list(config_dir.glob(f"{DOMAIN}_profile_*.prof"))) == 1
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_profile_times_out(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    config_dir: Path,
+    upstream: FakeUpstream,
+) -> None:
+    """Profiling stops after the timeout when no refresh is due."""
+    entry = await _setup_entry(hass)
+
+    call = hass.async_create_task(
+        hass.services.async_call(
+            DOMAIN,
+            SERVICE_PROFILE,
+            {"entity_id": STATUS_ENTITY, "timeout": 1},
+            blocking=True,
+        )
+    )
+    await _async_wait_for_profiler(hass)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=2))
+    await call
+
+    assert len(list(config_dir.glob(f"{DOMAIN}_profile_*.prof"))) == 1
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_profile_requires_admin(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    config_dir: Path,
+    upstream: FakeUpstream,
+    hass_read_only_user: MockUser,
+) -> None:
+    """Non-admin users cannot profile."""
+    entry = await _setup_entry(hass)
+
+    with pytest.raises(Unauthorized):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_PROFILE,
+            {"entity_id": STATUS_ENTITY},
+            blocking=True,
+            context=Context(user_id=hass_read_only_user.id),
+        )
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
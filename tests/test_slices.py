@@ -0,0 +1,91 @@
+"""Tests for the per-identifier polling state."""
+from __future__ import annotations
+
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+# pylint: disable=wrong-import-position
+import homeassistant.util.dt as dt_util  # noqa: E402
+
+from custom_components.bulgarian_utility_outage_checker.breaker import (  # noqa: E402
+    CircuitOpenError,
+)
+from custom_components.bulgarian_utility_outage_checker.slices import (  # noqa: E402
+    IdentifierSlice,
+)
+
+IDENTIFIER = "300012345678"
+QUIET = {"has_outage": False, "outage_type": "none"}
+
+
+def _slice(
+    adaptive: bool = True,
+    update_period: timedelta = timedelta(minutes=60),
+    min_interval: timedelta = timedelta(minutes=5),
+    max_interval: timedelta = timedelta(hours=6),
+) -> IdentifierSlice:
+    coordinator = SimpleNamespace(
+        adaptive=adaptive,
+        check_interval=int(update_period.total_seconds() // 60),
+        update_period=update_period,
+        min_interval=min_interval,
+        max_interval=max_interval,
+        device_key=lambda identifier: identifier,
+        provider=SimpleNamespace(name="ERM West"),
+    )
+    slice_ = IdentifierSlice(coordinator, IDENTIFIER)
+    slice_.data = QUIET
+    return slice_
+
+
+def test_quiet_polls_back_off_to_the_maximum() -> None:
+    """Quiet polls double the interval up to the maximum, for ever."""
+    slice_ = _slice()
+    intervals = [slice_._interval_after_success(QUIET) for _ in range(1000)]
+
+    assert intervals[:4] == [timedelta(hours=hours) for hours in (1, 2, 4, 6)]
+    assert set(intervals[3:]) == {timedelta(hours=6)}
+
+
+def test_failures_back_off_to_the_maximum() -> None:
+    """Failure backoff stays within the bounds however long upstream is down."""
+    slice_ = _slice()
+    intervals = [slice_._interval_after_failure() for _ in range(1000)]
+
+    assert all(
+        timedelta(minutes=5) <= interval <= timedelta(hours=6) for interval in intervals
+    )
+    # Jitter may pull a capped backoff below the maximum, never above it
+    assert max(intervals[-100:]) <= timedelta(hours=6)
+    assert min(intervals[-100:]) >= timedelta(hours=6) * 0.8
+
+
+def test_success_resets_failure_backoff() -> None:
+    """The first success after failures polls at the regular backoff again."""
+    slice_ = _slice()
+    for _ in range(100):
+        slice_._interval_after_failure()
+    slice_._interval_after_success(QUIET)
+
+    assert slice_._interval_after_failure() <= timedelta(minutes=5) * 1.2
+
+
+@pytest.mark.parametrize("adaptive", [False, True])
+async def test_open_circuit_retries_when_probe_is_allowed(adaptive: bool) -> None:
+    """A slice turned away by the breaker comes back when a probe may go."""
+    slice_ = _slice(adaptive=adaptive)
+    with patch.object(
+        slice_,
+        "_fetch_outage_data",
+        side_effect=CircuitOpenError("info.ermzapad.bg", 120),
+    ):
+        assert not await slice_.async_refresh()
+
+    delay = slice_.next_refresh - dt_util.utcnow()
+    assert timedelta(seconds=110) < delay <= timedelta(seconds=144)
+    assert slice_.stale
@@ -0,0 +1,153 @@
+"""Tests for the persistent outage state store."""
+from __future__ import annotations
+
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+# pylint: disable=wrong-import-position
+from freezegun.api import FrozenDateTimeFactory  # noqa: E402
+from pytest_homeassistant_custom_component.common import (  # noqa: E402
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+import homeassistant.util.dt as dt_util  # noqa: E402
+
+from custom_components.bulgarian_utility_outage_checker.const import (  # noqa: E402
+    CONF_CHECK_INTERVAL,
+    CONF_IDENTIFIER,
+    CONF_PROVIDER,
+    DOMAIN,
+    PROVIDER_ENERGOHOLD,
+    STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from custom_components.bulgarian_utility_outage_checker.models import (  # noqa: E402
+    OutageRecord,
+    encode_result,
+)
+from custom_components.bulgarian_utility_outage_checker.providers import (  # noqa: E402
+    get_provider,
+)
+from custom_components.bulgarian_utility_outage_checker.store import (  # noqa: E402
+    OutageStateStore,
+    async_get_state_store,
+)
+
+from .common import FakeUpstream, load_fixture  # noqa: E402
+
+IDENTIFIER = "300012345678"
+
+
+def _result(page: str) -> dict[str, Any]:
+    """Return the parsed result of a saved page."""
+    return get_provider(PROVIDER_ENERGOHOLD).parse(
+        load_fixture(PROVIDER_ENERGOHOLD, page), IDENTIFIER
+    )
+
+
+async def test_writes_are_coalesced(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Updates within the save delay end up in one write."""
+    store = await async_get_state_store(hass)
+    store.async_set(IDENTIFIER, _result("no_outage.html"))
+    store.async_set(IDENTIFIER, _result("unplanned.html"))
+    store.async_set("300087654321", _result("no_outage.html"))
+    assert STORAGE_KEY not in hass_storage
+
+    freezer.tick(timedelta(seconds=STORAGE_SAVE_DELAY + 1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    stored = hass_storage[STORAGE_KEY]["data"]["identifiers"]
+    assert set(stored) == {IDENTIFIER, "300087654321"}
+    assert stored[IDENTIFIER]["has_outage"] is True
+    assert isinstance(stored[IDENTIFIER]["outages"][0], dict)
+
+
+async def test_round_trip(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+) -> None:
+    """Stored results load back with their outage records."""
+    result = _result("both.html")
+    hass_storage[STORAGE_KEY] = {
+        "version": STORAGE_VERSION,
+        "key": STORAGE_KEY,
+        "data": {"identifiers": {IDENTIFIER: encode_result(result)}},
+    }
+
+    store = OutageStateStore(hass)
+    await store.async_load()
+    cached = store.get(IDENTIFIER)
+
+    assert cached is not None
+    assert all(isinstance(outage, OutageRecord) for outage in cached["outages"])
+    assert cached["outages"] == result["outages"]
+    assert cached["outage_type"] == result["outage_type"]
+    assert store.get("300087654321") is None
+
+
+async def test_remove(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Removed identifiers are dropped from the file."""
+    store = await async_get_state_store(hass)
+    store.async_set(IDENTIFIER, _result("no_outage.html"))
+    store.async_remove(IDENTIFIER)
+    store.async_remove("300087654321")
+
+    freezer.tick(timedelta(seconds=STORAGE_SAVE_DELAY + 1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert store.get(IDENTIFIER) is None
+    assert hass_storage[STORAGE_KEY]["data"]["identifiers"] == {}
+
+
+async def test_setup_restores_without_fetching(
+    hass: HomeAssistant,
+    enable_custom_integrations: None,
+    hass_storage: dict[str, Any],
+    config_dir: Path,
+    upstream: FakeUpstream,
+) -> None:
+    """An entry with cached state starts from it and refreshes later."""
+    hass_storage[STORAGE_KEY] = {
+        "version": STORAGE_VERSION,
+        "key": STORAGE_KEY,
+        "data": {"identifiers": {IDENTIFIER: encode_result(_result("unplanned.html"))}},
+    }
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=IDENTIFIER,
+        unique_id=f"bulgarian_outage_{PROVIDER_ENERGOHOLD}_{IDENTIFIER}",
+        data={
+            CONF_PROVIDER: PROVIDER_ENERGOHOLD,
+            CONF_IDENTIFIER: IDENTIFIER,
+            CONF_CHECK_INTERVAL: 60,
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    slice_ = hass.data[DOMAIN][entry.entry_id].slices[IDENTIFIER]
+    assert upstream.requests == []
+    assert slice_.stale
+    assert slice_.data["has_outage"] is True
+    assert slice_.next_refresh > dt_util.utcnow()
+
+    assert await hass.config_entries.async_unload(entry.entry_id)